@@ -0,0 +1,3 @@
+# /benchmarks/__init__.py
+
+# Torna benchmarks um pacote Python
\ No newline at end of file
@@ -0,0 +1,158 @@
+# /benchmarks/api_falsa.py
+
+"""
+API de busca falsa do X, servida localmente, para medir a coleta sem
+gastar cota da API real.
+
+Responde em /2/tweets/search/recent às duas consultas feitas por
+src/coleta.py (tweets do clube e respostas por conversation_id), com
+paginação por next_token, latência simulada e cabeçalhos de rate limit.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+ID_PERFIL_FALSO = "1000"
+
+
+class ApiFalsa:
+    """
+    Servidor HTTP local que imita o endpoint de busca recente.
+
+    Args:
+        conversas (int): Quantidade de tweets do clube (conversation_ids)
+        respostas_por_conversa (int): Respostas em cada conversa
+        latencia (float): Atraso (s) aplicado a cada requisição
+        textos (list): Textos usados nas respostas (repetidos ciclicamente)
+        inicio (datetime): Início (UTC) fixo da linha do tempo das respostas. Se None,
+                           as respostas começam no start_time de cada requisição
+        corpus (CorpusPartida): Partida sintética (benchmarks/corpus_sintetico.py). Se
+                                informado, substitui as respostas geradas aqui
+    """
+
+    def __init__(self, conversas=40, respostas_por_conversa=300, latencia=0.1, textos=None, inicio=None, corpus=None):
+        self.conversas = conversas
+        self.corpus = corpus
+        self.inicio = inicio
+        self.respostas_por_conversa = respostas_por_conversa
+        self.latencia = latencia
+        self.textos = textos or ["vamos tricolor", "que jogo ruim 😡", "@spfc gol!!! 🎉", "#spfc hoje tem"]
+        self.requisicoes = 0
+        self.trava = threading.Lock()
+        self.servidor = None
+
+    # ==================================================
+    # DADOS SINTÉTICOS
+    # ==================================================
+    def _tweets_clube(self):
+        return [
+            {"id": str(9000 + c), "conversation_id": str(9000 + c), "created_at": "2024-01-01T00:00:00.000Z"}
+            for c in range(self.conversas)
+        ]
+
+    def _respostas(self, conversation_id, inicio):
+        c = int(conversation_id) - 9000
+        span = 5 * 3600
+        respostas = []
+
+        for r in range(self.respostas_por_conversa):
+            n = c * self.respostas_por_conversa + r
+            segundos = (n * 37) % span
+            criado = inicio + timedelta(seconds=segundos)
+
+            # IDs crescem com o horário de criação, como os snowflake IDs do X
+            id_tweet = 10**12 + segundos * 10**6 + n
+            respostas.append({
+                # Algumas respostas repetem o id anterior (testa a deduplicação)
+                "id": str(respostas[-1]["id"] if r % 97 == 1 else id_tweet),
+                "text": self.textos[n % len(self.textos)],
+                "created_at": criado.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "public_metrics": {"retweet_count": n % 3, "like_count": n % 11},
+                # Parte das respostas não é direta ao perfil do clube
+                "in_reply_to_user_id": ID_PERFIL_FALSO if r % 10 else "42"
+            })
+
+        return respostas
+
+    def responder(self, params):
+        """
+        Monta o corpo JSON para os parâmetros de uma requisição de busca.
+        """
+        if self.corpus is not None:
+            return self.corpus.responder(params)
+
+        query = params["query"]
+        max_results = int(params.get("max_results", 100))
+        offset = int(params.get("next_token", 0))
+        inicio = self.inicio or datetime.strptime(params.get("start_time", "2024-01-01T00:00:00Z"), "%Y-%m-%dT%H:%M:%SZ")
+
+        if query.startswith("from:"):
+            itens = self._tweets_clube()
+        else:
+            conversation_id = query.split()[0].split(":")[1]
+            itens = self._respostas(conversation_id, inicio)
+
+        # end_time: apenas tweets criados antes do instante informado
+        if "end_time" in params:
+            fim = params["end_time"][:19].replace("T", " ")
+            itens = [t for t in itens if t["created_at"][:19].replace("T", " ") < fim]
+
+        # since_id: apenas tweets mais novos que o informado
+        if "since_id" in params:
+            itens = [t for t in itens if int(t["id"]) > int(params["since_id"])]
+
+        pagina = itens[offset:offset + max_results]
+        meta = {"result_count": len(pagina)}
+        if offset + max_results < len(itens):
+            meta["next_token"] = str(offset + max_results)
+
+        return {"data": pagina, "meta": meta} if pagina else {"meta": meta}
+
+    # ==================================================
+    # SERVIDOR
+    # ==================================================
+    def iniciar(self):
+        """
+        Sobe o servidor em uma porta livre e retorna a URL do endpoint.
+        """
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 mantém a conexão aberta (keep-alive) entre requisições
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with api.trava:
+                    api.requisicoes += 1
+
+                time.sleep(api.latencia)
+
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                corpo = json.dumps(api.responder(params)).encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(corpo)))
+                self.send_header("x-rate-limit-remaining", "1000000")
+                self.send_header("x-rate-limit-reset", str(int(time.time()) + 900))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+        host, porta = self.servidor.server_address
+        return f"http://{host}:{porta}/2/tweets/search/recent"
+
+    def parar(self):
+        if self.servidor:
+            self.servidor.shutdown()
+            self.servidor.server_close()
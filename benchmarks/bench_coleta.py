@@ -0,0 +1,80 @@
+# /benchmarks/bench_coleta.py
+
+"""
+Benchmark da coleta de respostas contra uma API falsa local.
+Compara a coleta com 1 thread (sequencial) e com várias threads
+(conversation_ids em paralelo com limitador compartilhado) e confere
+se os tweets coletados são os mesmos.
+
+Uso:
+    python -m benchmarks.bench_coleta --conversas 40 --respostas 300 --latencia 0.1 --threads 8
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+# A API falsa não valida o token, mas coletar_tweets exige um configurado
+os.environ.setdefault("X_API_TOKEN", "token_falso")
+
+from src.coleta import coletar_tweets
+from src.cliente_api import ClienteAPI, LimitadorTaxa
+from benchmarks.api_falsa import ApiFalsa, ID_PERFIL_FALSO
+
+
+def medir_coleta(base_url, janela, threads, taxa, rajada):
+    cliente = ClienteAPI(limitador=LimitadorTaxa(taxa=taxa, capacidade=rajada))
+
+    inicio = time.perf_counter()
+    tweets = coletar_tweets(
+        janela=janela,
+        perfil="SaoPauloFC",
+        id_perfil=ID_PERFIL_FALSO,
+        max_threads=threads,
+        base_url=base_url,
+        cliente=cliente
+    )
+    tempo = time.perf_counter() - inicio
+
+    cliente.imprimir_metricas()
+    cliente.fechar()
+    return tweets, tempo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da coleta concorrente")
+    parser.add_argument("--conversas", type=int, default=40)
+    parser.add_argument("--respostas", type=int, default=300)
+    parser.add_argument("--latencia", type=float, default=0.1, help="Latência simulada por requisição (s)")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--taxa", type=float, default=100.0, help="Requisições/s do limitador")
+    parser.add_argument("--rajada", type=int, default=10)
+    args = parser.parse_args()
+
+    api = ApiFalsa(args.conversas, args.respostas, args.latencia)
+    base_url = api.iniciar()
+
+    inicio_jogo = datetime(2024, 5, 1, 16, 0, tzinfo=ZoneInfo("America/Sao_Paulo"))
+    janela = (inicio_jogo - timedelta(hours=1), inicio_jogo + timedelta(hours=4))
+
+    try:
+        seq, tempo_seq = medir_coleta(base_url, janela, 1, args.taxa, args.rajada)
+        requisicoes = api.requisicoes
+        conc, tempo_conc = medir_coleta(base_url, janela, args.threads, args.taxa, args.rajada)
+    finally:
+        api.parar()
+
+    iguais = [t["id_tweet"] for t in seq] == [t["id_tweet"] for t in conc]
+
+    print("\n=== Coleta: sequencial x concorrente (API falsa) ===")
+    print(f"Requisições por coleta: {requisicoes} | latência simulada: {args.latencia * 1000:.0f} ms")
+    print(f"1 thread:  {tempo_seq:.2f}s | {len(seq)} tweets")
+    print(f"{args.threads} threads: {tempo_conc:.2f}s | {len(conc)} tweets")
+    print(f"Redução do tempo: {(1 - tempo_conc / tempo_seq) * 100:.1f}% (speedup {tempo_seq / tempo_conc:.1f}x)")
+    print(f"Mesmos tweets e mesma ordem: {'sim' if iguais else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# /benchmarks/bench_fine_tuning.py
+
+"""
+Benchmark do fine-tuning: tokenização a cada __getitem__ com padding até
+MAX_LEN (versão anterior do TweetsDataset, reproduzida abaixo) x corpus
+tokenizado uma vez (cache em disco) com padding dinâmico e batches
+agrupados por comprimento (src/fine_tuning.py).
+
+Os dois modos treinam o mesmo modelo inicial, com os mesmos dados e
+hiperparâmetros, e são avaliados no mesmo conjunto de teste (F1 macro).
+
+Uso:
+    python -m benchmarks.bench_fine_tuning --csv data/texto_bruto.csv --epocas 5
+    python -m benchmarks.bench_fine_tuning --csv data/texto_bruto.csv --modelo modelo_torcedor_spfc/final
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+from transformers import (
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    DataCollatorWithPadding,
+    Trainer,
+    TrainingArguments
+)
+
+from src.config import BATCH_SIZE, EMOCAO_TO_ID, EMOCOES, EPOCHS, ID_TO_EMOCAO, LEARNING_RATE, MAX_LEN, MODELO_NOME, RANDOM_SEED
+from src.fine_tuning import (
+    TweetsDataset,
+    argumentos_agrupamento,
+    argumentos_avaliacao,
+    argumentos_tokenizer,
+    compute_metrics,
+    dividir_dados,
+    preparar_dados,
+    tokenizar_textos
+)
+
+
+class DatasetPaddingFixo(Dataset):
+    """
+    TweetsDataset anterior: tokeniza o texto a cada acesso, com padding até max_len.
+    """
+
+    def __init__(self, textos, labels, tokenizer, max_len):
+        self.textos = textos
+        self.labels = labels
+        self.tokenizer = tokenizer
+        self.max_len = max_len
+
+    def __len__(self):
+        return len(self.textos)
+
+    def __getitem__(self, idx):
+        encoding = self.tokenizer(
+            str(self.textos[idx]),
+            truncation=True,
+            padding="max_length",
+            max_length=self.max_len,
+            return_tensors="pt"
+        )
+
+        return {
+            "input_ids": encoding["input_ids"].flatten(),
+            "attention_mask": encoding["attention_mask"].flatten(),
+            "labels": torch.tensor(self.labels[idx], dtype=torch.long)
+        }
+
+
+def treinar(modo, modelo, dados, epocas, batch_size, pasta_cache):
+    X_train, X_test, y_train, y_test = dados
+    tokenizer = AutoTokenizer.from_pretrained(modelo)
+
+    torch.manual_seed(RANDOM_SEED)
+    model = AutoModelForSequenceClassification.from_pretrained(
+        modelo,
+        num_labels=len(EMOCOES),
+        id2label=ID_TO_EMOCAO,
+        label2id=EMOCAO_TO_ID,
+        ignore_mismatched_sizes=True
+    )
+
+    extras = {}
+    if modo == "fixo":
+        train_dataset = DatasetPaddingFixo(X_train, y_train, tokenizer, MAX_LEN)
+        test_dataset = DatasetPaddingFixo(X_test, y_test, tokenizer, MAX_LEN)
+    else:
+        train_dataset = TweetsDataset(X_train, y_train, tokenizer, MAX_LEN, pasta_cache)
+        test_dataset = TweetsDataset(X_test, y_test, tokenizer, MAX_LEN, pasta_cache)
+        extras = argumentos_agrupamento()
+
+    with tempfile.TemporaryDirectory() as pasta_saida:
+        args = TrainingArguments(
+            output_dir=pasta_saida,
+            num_train_epochs=epocas,
+            per_device_train_batch_size=batch_size,
+            per_device_eval_batch_size=batch_size,
+            learning_rate=LEARNING_RATE,
+            save_strategy="no",
+            logging_strategy="no",
+            remove_unused_columns=False,
+            seed=RANDOM_SEED,
+            report_to="none",
+            disable_tqdm=True,
+            **extras,
+            **argumentos_avaliacao("no")
+        )
+
+        trainer = Trainer(
+            model=model,
+            args=args,
+            train_dataset=train_dataset,
+            data_collator=DataCollatorWithPadding(tokenizer) if modo == "dinamico" else None,
+            compute_metrics=compute_metrics,
+            **argumentos_tokenizer(tokenizer)
+        )
+
+        inicio = time.perf_counter()
+        trainer.train()
+        tempo = time.perf_counter() - inicio
+
+        f1 = trainer.evaluate(test_dataset)["eval_f1_macro"]
+
+    return tempo, f1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do fine-tuning (padding fixo x dinâmico)")
+    parser.add_argument("--csv", default="data/texto_bruto.csv", help="CSV rotulado (texto_bruto, label)")
+    parser.add_argument("--modelo", default=MODELO_NOME, help="Modelo base (nome no Hub ou pasta local)")
+    parser.add_argument("--epocas", type=int, default=EPOCHS)
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    textos, labels = preparar_dados(args.csv)
+    X_train, _, X_test, y_train, _, y_test = dividir_dados(textos, labels)
+    dados = (X_train, X_test, y_train, y_test)
+
+    with tempfile.TemporaryDirectory() as pasta_cache:
+        # Tokenização do corpus: primeira vez (grava o cache) x leitura do cache
+        tokenizer = AutoTokenizer.from_pretrained(args.modelo)
+        inicio = time.perf_counter()
+        ids = tokenizar_textos(textos, tokenizer, MAX_LEN, pasta_cache)
+        tempo_frio = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        tokenizar_textos(textos, tokenizer, MAX_LEN, pasta_cache)
+        tempo_cache = time.perf_counter() - inicio
+
+        comprimentos = np.array([len(s) for s in ids])
+        print(f"\n[INFO] Comprimento médio: {comprimentos.mean():.1f} tokens (padding fixo: {MAX_LEN})")
+        print(f"[INFO] Tokenização do corpus: {tempo_frio * 1000:.0f} ms | do cache: {tempo_cache * 1000:.0f} ms")
+
+        resultados = {
+            modo: treinar(modo, args.modelo, dados, args.epocas, args.batch, pasta_cache)
+            for modo in ("fixo", "dinamico")
+        }
+
+    tempo_fixo = resultados["fixo"][0]
+    print(f"\n=== Fine-tuning: {len(X_train)} exemplos, {args.epocas} épocas ===")
+    print(f"{'modo':<12}{'treino (s)':>12}{'F1 macro':>10}{'speedup':>10}")
+    for modo, (tempo, f1) in resultados.items():
+        print(f"{modo:<12}{tempo:>12.1f}{f1:>10.3f}{tempo_fixo / tempo:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
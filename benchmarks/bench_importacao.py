@@ -0,0 +1,67 @@
+# /benchmarks/bench_importacao.py
+
+"""
+Benchmark do tempo de importação dos módulos do projeto.
+Cada módulo é importado em um processo Python novo, sem X_API_TOKEN
+no ambiente, para mostrar que importar o pacote não carrega o modelo
+nem exige credenciais.
+
+Uso:
+    python -m benchmarks.bench_importacao --repeticoes 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+MODULOS = [
+    "src.config",
+    "src.janelas",
+    "src.agregacao",
+    "src.utils",
+    "src.coleta",
+    "src.analise_emocoes",
+    "src.visualizacao",
+    "main"
+]
+
+CODIGO_MEDICAO = (
+    "import time; inicio = time.perf_counter(); import {modulo}; "
+    "print(time.perf_counter() - inicio)"
+)
+
+
+def medir_importacao(modulo, repeticoes):
+    """
+    Retorna o menor tempo de importação (s) entre as repetições.
+    """
+    ambiente = {k: v for k, v in os.environ.items() if k != "X_API_TOKEN"}
+    tempos = []
+
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", CODIGO_MEDICAO.format(modulo=modulo)],
+            capture_output=True,
+            text=True,
+            env=ambiente,
+            check=True
+        )
+        tempos.append(float(saida.stdout.strip().splitlines()[-1]))
+
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de importação")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print("\n=== Tempo de importação (processo novo, sem X_API_TOKEN) ===")
+    for modulo in MODULOS:
+        tempo = medir_importacao(modulo, args.repeticoes)
+        print(f"{modulo:<22} {tempo * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
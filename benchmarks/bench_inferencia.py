@@ -0,0 +1,73 @@
+# /benchmarks/bench_inferencia.py
+
+"""
+Benchmark da classificação de emoções.
+Compara o laço tweet a tweet (classificar_emocao) com a inferência
+em lote com padding dinâmico (classificar_emocoes).
+
+Uso:
+    python -m benchmarks.bench_inferencia --csv data/texto_bruto.csv --n 1000
+"""
+
+import argparse
+import time
+import pandas as pd
+from src.coleta import limpar_texto
+from src.analise_emocoes import classificar_emocao, classificar_emocoes
+from src.config import INFERENCIA_BATCH_SIZE, INFERENCIA_MAX_TOKENS
+
+
+def carregar_textos(csv_path, coluna, n):
+    """
+    Lê os textos do CSV, aplica limpar_texto e repete o corpus até n textos.
+    """
+    df = pd.read_csv(csv_path)
+    textos = [limpar_texto(str(t)) for t in df[coluna].dropna()]
+
+    if not textos:
+        raise ValueError(f"Nenhum texto encontrado na coluna '{coluna}' de {csv_path}")
+
+    repeticoes = n // len(textos) + 1
+    return (textos * repeticoes)[:n]
+
+
+def medir(funcao, textos):
+    inicio = time.perf_counter()
+    resultados = funcao(textos)
+    return resultados, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da inferência de emoções")
+    parser.add_argument("--csv", default="data/texto_bruto.csv")
+    parser.add_argument("--coluna", default="texto_bruto")
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=INFERENCIA_BATCH_SIZE)
+    parser.add_argument("--max-tokens", type=int, default=INFERENCIA_MAX_TOKENS)
+    args = parser.parse_args()
+
+    textos = carregar_textos(args.csv, args.coluna, args.n)
+    print(f"[INFO] {len(textos)} textos carregados de {args.csv}")
+
+    # Aquecimento (alocações e threads do torch)
+    classificar_emocoes(textos[:32], args.batch_size, args.max_tokens)
+
+    res_laco, tempo_laco = medir(lambda ts: [classificar_emocao(t) for t in ts], textos)
+    res_lote, tempo_lote = medir(
+        lambda ts: classificar_emocoes(ts, args.batch_size, args.max_tokens),
+        textos
+    )
+
+    iguais = sum(1 for a, b in zip(res_laco, res_lote) if a[0] == b[0])
+    dif_confianca = max(abs(a[1] - b[1]) for a, b in zip(res_laco, res_lote))
+
+    print("\n=== Inferência: tweet a tweet x lote ===")
+    print(f"Laço (classificar_emocao): {tempo_laco:.2f}s | {len(textos) / tempo_laco:.1f} tweets/s")
+    print(f"Lote (classificar_emocoes): {tempo_lote:.2f}s | {len(textos) / tempo_lote:.1f} tweets/s "
+          f"(batch_size={args.batch_size}, max_tokens={args.max_tokens})")
+    print(f"Speedup: {tempo_laco / tempo_lote:.1f}x")
+    print(f"Rótulos iguais: {iguais}/{len(textos)} | maior diferença de confiança: {dif_confianca:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# /benchmarks/bench_memoria.py
+
+"""
+Benchmark do pico de memória (RSS) do pipeline da partida contra a API
+falsa local: fluxo antigo em listas (coletar_tweets -> analisar_tweets ->
+agrupar_por_janela -> salvar_tweets_csv) x pipeline em fluxo
+(src/pipeline.py). Cada modo roda em um processo novo para que o pico
+medido seja só dele; o cache de classificações é desligado nos dois.
+
+Uso:
+    python -m benchmarks.bench_memoria --csv data/texto_bruto.csv --conversas 40 --respostas 2500
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+# A API falsa não valida o token, mas a coleta exige um configurado
+os.environ.setdefault("X_API_TOKEN", "token_falso")
+
+INICIO_JOGO = datetime(2024, 5, 1, 16, 0, tzinfo=ZoneInfo("America/Sao_Paulo"))
+
+
+def pico_rss_mb():
+    # ru_maxrss é informado em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def executar_modo(modo, base_url, pasta):
+    """
+    Executa um modo do pipeline no processo atual e imprime o pico de RSS.
+    """
+    from src import cache
+    from src.analise_emocoes import obter_modelo
+    from src.cliente_api import ClienteAPI, LimitadorTaxa
+    from src.janelas import calcular_janelas
+    from benchmarks.api_falsa import ID_PERFIL_FALSO
+
+    # Os dois modos classificam todos os textos (sem acertos de cache)
+    cache.CACHE_ATIVO = False
+
+    obter_modelo()
+    base = pico_rss_mb()
+
+    janelas = calcular_janelas(INICIO_JOGO)
+    cliente = ClienteAPI(limitador=LimitadorTaxa(taxa=1000, capacidade=100))
+
+    if modo == "lista":
+        from src.agregacao import percentual_emocoes
+        from src.analise_emocoes import analisar_tweets
+        from src.coleta import coletar_tweets
+        from src.janelas import agrupar_por_janela
+        from src.utils import salvar_tweets_csv
+
+        tweets = coletar_tweets(
+            (INICIO_JOGO - timedelta(hours=1), INICIO_JOGO + timedelta(hours=4)),
+            "SaoPauloFC", ID_PERFIL_FALSO, base_url=base_url, cliente=cliente
+        )
+        tweets = analisar_tweets(tweets)
+
+        tweets_etapa = {etapa: [] for etapa in janelas}
+        for etapa, lista_grupos in agrupar_por_janela(tweets, janelas).items():
+            for intervalo, tweets_j in lista_grupos:
+                salvar_tweets_csv(tweets_j, pasta, etapa, intervalo[0])
+                tweets_etapa[etapa] += tweets_j
+
+        todos = tweets_etapa["pre_jogo"] + tweets_etapa["durante_jogo"] + tweets_etapa["pos_jogo"]
+        percentual_emocoes(todos)
+        total = len(todos)
+    else:
+        from src.pipeline import executar_pipeline
+
+        matriz = executar_pipeline(
+            janelas, "SaoPauloFC", ID_PERFIL_FALSO, cliente, pasta,
+            pasta_checkpoint=os.path.join(pasta, "checkpoint"), base_url=base_url
+        )
+        total = matriz.total()
+
+    print(f"RESULTADO {total} {base:.1f} {pico_rss_mb():.1f}")
+
+
+def medir(modo, base_url):
+    with tempfile.TemporaryDirectory() as pasta:
+        saida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_memoria", "--modo", modo,
+             "--base-url", base_url, "--pasta", pasta],
+            capture_output=True, text=True, check=True
+        ).stdout
+
+    linha = [l for l in saida.splitlines() if l.startswith("RESULTADO")][-1]
+    total, base, pico = linha.split()[1:]
+    return int(total), float(base), float(pico)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória do pipeline")
+    parser.add_argument("--csv", help="CSV com textos reais para as respostas (coluna texto_bruto)")
+    parser.add_argument("--conversas", type=int, default=40)
+    parser.add_argument("--respostas", type=int, default=2500)
+    parser.add_argument("--modo", choices=["lista", "fluxo"], help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--pasta", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Processo filho: executa um único modo
+    if args.modo:
+        executar_modo(args.modo, args.base_url, args.pasta)
+        return
+
+    from benchmarks.api_falsa import ApiFalsa
+
+    textos = None
+    if args.csv:
+        import pandas as pd
+
+        textos = [str(t) for t in pd.read_csv(args.csv)["texto_bruto"].dropna()]
+
+    api = ApiFalsa(args.conversas, args.respostas, latencia=0.0, textos=textos)
+    base_url = api.iniciar()
+
+    try:
+        resultados = {modo: medir(modo, base_url) for modo in ("lista", "fluxo")}
+    finally:
+        api.parar()
+
+    print("\n=== Pico de memória (RSS): listas x fluxo ===")
+    print(f"{'modo':<8}{'tweets':>10}{'base (MB)':>12}{'pico (MB)':>12}{'pico - base':>14}")
+    for modo, (total, base, pico) in resultados.items():
+        print(f"{modo:<8}{total:>10}{base:>12.1f}{pico:>12.1f}{pico - base:>14.1f}")
+
+    lista, fluxo = resultados["lista"], resultados["fluxo"]
+    print(f"Mesmo total de tweets: {'sim' if lista[0] == fluxo[0] else 'NÃO'}")
+    print(f"Redução do pico acima da base: {(1 - (fluxo[2] - fluxo[1]) / (lista[2] - lista[1])) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# /benchmarks/bench_normalizacao.py
+
+"""
+Benchmark e conferência da normalização de textos (src/normalizacao.py)
+contra as versões anteriores de limpar_texto (coleta.py) e
+remover_acentos (analise_emocoes.py). As versões de referência e os casos
+de borda ficam em tests/test_normalizacao.py (python -m pytest tests).
+
+Confere se as saídas são idênticas no corpus (um CSV real, se indicado,
+mais o corpus dos testes) e mede textos/s de cada versão no caminho da
+coleta (limpar_texto) e da classificação (remover_acentos(lower)).
+Termina com código 1 se alguma saída divergir.
+
+Uso:
+    python -m benchmarks.bench_normalizacao --csv data/texto_bruto.csv --n 50000
+"""
+
+import argparse
+import sys
+import time
+
+from src.normalizacao import (
+    limpar_texto,
+    limpar_textos,
+    normalizar_texto,
+    normalizar_textos
+)
+from tests.test_normalizacao import (
+    CORPUS,
+    TEXTOS_PADRAO,
+    limpar_texto_anterior,
+    remover_acentos_anterior
+)
+
+
+def conferir(textos):
+    """
+    Returns:
+        list: Textos em que alguma das saídas difere da versão anterior
+    """
+    divergentes = []
+    for texto in textos:
+        limpo = limpar_texto_anterior(texto)
+        if limpar_texto(texto) != limpo:
+            divergentes.append(("limpar_texto", texto))
+        if normalizar_texto(limpo) != remover_acentos_anterior(limpo.lower()):
+            divergentes.append(("normalizar_texto", texto))
+        if normalizar_texto(texto) != remover_acentos_anterior(texto.lower()):
+            divergentes.append(("normalizar_texto (bruto)", texto))
+    return divergentes
+
+
+def medir(funcao, textos):
+    inicio = time.perf_counter()
+    funcao(textos)
+    return len(textos) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da normalização de textos")
+    parser.add_argument("--csv", help="CSV com textos reais (coluna texto_bruto)")
+    parser.add_argument("--n", type=int, default=50_000, help="Textos medidos (corpus repetido)")
+    args = parser.parse_args()
+
+    corpus = TEXTOS_PADRAO
+    if args.csv:
+        import pandas as pd
+
+        corpus = [str(t) for t in pd.read_csv(args.csv)["texto_bruto"].dropna()]
+
+    conferidos = corpus + CORPUS
+    divergentes = conferir(conferidos)
+    print(f"\n=== Conferência: {len(conferidos)} textos ===")
+    print(f"Saídas idênticas às versões anteriores: {'sim' if not divergentes else 'NÃO'}")
+    for funcao, texto in divergentes[:10]:
+        print(f"  {funcao}: {texto!r}")
+    if divergentes:
+        sys.exit(1)
+
+    # Cópias das strings para que nada seja reaproveitado entre repetições por identidade
+    textos = [(corpus[i % len(corpus)] + " ")[:-1] for i in range(args.n)]
+    limpos = [limpar_texto_anterior(t) for t in textos]
+
+    # Aquece a árvore do emoji e as tabelas antes de medir
+    limpar_texto_anterior("🎉 é")
+    limpar_textos(corpus)
+    normalizar_textos(corpus)
+
+    resultados = [
+        ("limpar_texto", [
+            ("anterior", lambda ts: [limpar_texto_anterior(t) for t in ts], textos),
+            ("por texto", lambda ts: [limpar_texto(t) for t in ts], textos),
+            ("em lote", limpar_textos, textos),
+        ]),
+        ("remover_acentos(lower)", [
+            ("anterior", lambda ts: [remover_acentos_anterior(t.lower()) for t in ts], limpos),
+            ("por texto", lambda ts: [normalizar_texto(t) for t in ts], limpos),
+            ("em lote", normalizar_textos, limpos),
+        ]),
+    ]
+
+    print(f"\n=== Textos/s ({args.n} textos) ===")
+    print(f"{'etapa':<26}{'versão':<12}{'textos/s':>14}{'speedup':>10}")
+    for etapa, versoes in resultados:
+        base = None
+        for nome, funcao, entrada in versoes:
+            taxa = medir(funcao, entrada)
+            base = base or taxa
+            print(f"{etapa:<26}{nome:<12}{taxa:>14,.0f}{taxa / base:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# /benchmarks/bench_processos.py
+
+"""
+Benchmark de escalabilidade do pool de processos de inferência.
+Mede tweets/s com 1, 2, 4 e 8 workers (classificar_emocoes_pool)
+e compara com a inferência em lote no processo principal.
+
+Uso:
+    python -m benchmarks.bench_processos --n 4000 --workers 1 2 4 8
+"""
+
+import argparse
+import time
+from src.analise_emocoes import (
+    classificar_emocoes,
+    classificar_emocoes_pool,
+    criar_pool_inferencia
+)
+from src.config import INFERENCIA_TAMANHO_SHARD
+from benchmarks.bench_inferencia import carregar_textos
+
+
+def medir_pool(textos, num_processos, threads_por_processo, tamanho_shard):
+    """
+    Retorna (tempo de inicialização, tempo de classificação) para um pool.
+    A inicialização inclui subir os workers e carregar o modelo em cada um.
+    """
+    inicio = time.perf_counter()
+    pool = criar_pool_inferencia(num_processos, threads_por_processo)
+
+    with pool:
+        # Aquecimento: um shard pequeno por worker força o carregamento do modelo
+        classificar_emocoes_pool(textos[:8 * num_processos], pool, tamanho_shard=8)
+        tempo_inicio = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        classificar_emocoes_pool(textos, pool, tamanho_shard)
+        tempo_classificacao = time.perf_counter() - inicio
+
+    return tempo_inicio, tempo_classificacao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do pool de processos de inferência")
+    parser.add_argument("--csv", default="data/texto_bruto.csv")
+    parser.add_argument("--coluna", default="texto_bruto")
+    parser.add_argument("--n", type=int, default=4000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--threads-por-processo", type=int, default=None)
+    parser.add_argument("--tamanho-shard", type=int, default=INFERENCIA_TAMANHO_SHARD)
+    args = parser.parse_args()
+
+    textos = carregar_textos(args.csv, args.coluna, args.n)
+    print(f"[INFO] {len(textos)} textos carregados de {args.csv}")
+
+    classificar_emocoes(textos[:32])
+    inicio = time.perf_counter()
+    classificar_emocoes(textos)
+    tempo_base = time.perf_counter() - inicio
+
+    print("\n=== Escalabilidade do pool de inferência ===")
+    print(f"Processo principal: {len(textos) / tempo_base:.1f} tweets/s")
+
+    for num_processos in args.workers:
+        tempo_inicio, tempo = medir_pool(
+            textos,
+            num_processos,
+            args.threads_por_processo,
+            args.tamanho_shard
+        )
+        print(f"{num_processos} worker(s): {len(textos) / tempo:.1f} tweets/s "
+              f"| speedup {tempo_base / tempo:.2f}x | inicialização {tempo_inicio:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+# /benchmarks/bench_suite.py
+
+"""
+Suíte de benchmark de ponta a ponta, reprodutível e sem rede: gera uma
+partida sintética (benchmarks/corpus_sintetico.py) em cada tamanho pedido,
+serve as respostas pela API falsa e executa o pipeline da partida
+(src/pipeline.py: coleta -> classificação -> janelas -> CSV) com o
+classificador substituto (benchmarks/classificador_local.py).
+
+Cada tamanho roda em um processo novo, com o cache de classificações
+desligado e as métricas ligadas, e informa:
+    - tempo total e vazão (tweets/s)
+    - tempo e vazão por etapa (spans de src/metricas.py)
+    - pico de memória (RSS) acima da base com o modelo já carregado
+
+Com --cascata LIMIAR, o primeiro estágio da cascata (src/cascata.py) é
+treinado nos rótulos de uma partida sintética separada: a suíte exibe a
+curva limiar x fração resolvida no primeiro estágio x tempo por tweet e a
+fração de respostas de cada tamanho que dispensou o modelo. A acurácia
+da curva aqui é contra os rótulos sintéticos com o classificador
+substituto (pesos aleatórios); a curva com o BERTimbau e o CSV rotulado
+é a de python -m src.cascata.
+
+O agrupamento de duplicatas (src/deduplicacao.py) segue DEDUP_ATIVA e
+DEDUP_QUASE_DUPLICATAS; a coluna "agrupados" é a fração de respostas que
+reaproveitou o rótulo de outra do mesmo grupo. Com --sem-dedup ele fica desligado em todos os tamanhos.
+
+Com --salvar-linha-base os resultados viram a linha de base; nas execuções
+seguintes cada número é comparado com ela e as regressões acima da
+tolerância são marcadas (código de saída 1), para uso em CI.
+
+Uso:
+    python -m benchmarks.bench_suite --tamanhos 1k,10k,100k --salvar-linha-base
+    python -m benchmarks.bench_suite --tamanhos 1k,10k,100k
+    python -m benchmarks.bench_suite --tamanhos 1m --linha-base /tmp/base_1m.json
+    python -m benchmarks.bench_suite --tamanhos 10k,100k --cascata 0.9 --linha-base /tmp/base_cascata.json
+    python -m benchmarks.bench_suite --tamanhos 10k,100k --sem-dedup --linha-base /tmp/base_sem_dedup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# A API falsa não valida o token, mas a coleta exige um configurado
+os.environ.setdefault("X_API_TOKEN", "token_falso")
+
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINHA_BASE_PADRAO = os.path.join(RAIZ_REPO, "benchmarks", "linha_base.json")
+
+# Etapa do relatório -> span de src/metricas.py
+ETAPAS = {
+    "coleta": "coleta.passada",
+    "normalizacao": "inferencia.normalizacao",
+    "deduplicacao": "inferencia.deduplicacao",
+    "cascata": "inferencia.cascata",
+    "tokenizacao": "inferencia.tokenizacao",
+    "forward": "inferencia.forward",
+    "classificacao": "inferencia.classificacao",
+    "janelas": "janelas.atribuir",
+    "csv": "saida.csv"
+}
+
+# Diferenças abaixo destes valores são ruído, qualquer que seja o percentual
+PISO_SEGUNDOS = 0.05
+PISO_MB = 10.0
+
+
+def pico_rss_mb():
+    # ru_maxrss é informado em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def ler_tamanho(texto):
+    """
+    "1k" -> 1000, "1m" -> 1000000, "2500" -> 2500
+    """
+    texto = texto.strip().lower()
+    multiplicador = {"k": 1_000, "m": 1_000_000}.get(texto[-1], 1)
+    return int(float(texto.rstrip("km")) * multiplicador)
+
+
+def rotulo_tamanho(n):
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}m"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+def ambiente():
+    import numpy
+    import torch
+    import transformers
+    from src.config import INFERENCIA_BACKEND, INFERENCIA_PROCESSOS
+
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "inferencia_backend": INFERENCIA_BACKEND,
+        "inferencia_processos": INFERENCIA_PROCESSOS
+    }
+
+
+# ==================================================
+# PROCESSO FILHO: UM TAMANHO
+# ==================================================
+def executar_tamanho(base_url, pasta, limiar_cascata=None, sem_dedup=False):
+    """
+    Executa o pipeline da partida no processo atual (cwd = pasta de
+    trabalho com o modelo substituto) e imprime o resultado em JSON.
+    """
+    from src import cache, cascata, deduplicacao, metricas
+    from src.analise_emocoes import obter_modelo
+    from src.cliente_api import ClienteAPI, LimitadorTaxa
+    from src.janelas import calcular_janelas
+    from src.pipeline import executar_pipeline
+    from benchmarks.api_falsa import ID_PERFIL_FALSO
+    from benchmarks.corpus_sintetico import INICIO_JOGO
+
+    cache.CACHE_ATIVO = False
+    cascata.CASCATA_ATIVA = limiar_cascata is not None
+    if limiar_cascata is not None:
+        cascata.CASCATA_LIMIAR = limiar_cascata
+    if sem_dedup:
+        deduplicacao.DEDUP_ATIVA = False
+    metricas.ativar(True)
+
+    obter_modelo()
+    base = pico_rss_mb()
+
+    janelas = calcular_janelas(INICIO_JOGO)
+    cliente = ClienteAPI(limitador=LimitadorTaxa(taxa=1000, capacidade=100))
+    pasta_data = os.path.join(pasta, "data")
+    os.makedirs(pasta_data, exist_ok=True)
+
+    metricas.reiniciar()
+    inicio = time.perf_counter()
+    matriz = executar_pipeline(
+        janelas, "SaoPauloFC", ID_PERFIL_FALSO, cliente, pasta_data,
+        pasta_checkpoint=os.path.join(pasta, "checkpoint"), base_url=base_url
+    )
+    duracao = time.perf_counter() - inicio
+
+    dados = metricas.resumo()
+    spans = dados["spans"]
+    total = matriz.total()
+    primeiro_estagio = dados["contadores"].get("cascata.primeiro_estagio", 0)
+    bert = dados["contadores"].get("cascata.bert", 0)
+    copias = dados["contadores"].get("deduplicacao.copias_repetidas", 0)
+
+    resultado = {
+        "tweets": total,
+        "total_s": round(duracao, 3),
+        "tweets_por_s": round(total / duracao, 1),
+        "etapas": {
+            etapa: {
+                "total_s": spans[nome]["total_s"] if nome in spans else 0.0,
+                "itens_por_s": spans[nome]["itens_por_s"] if nome in spans else None
+            }
+            for etapa, nome in ETAPAS.items()
+        },
+        "fracao_primeiro_estagio": round(primeiro_estagio / (primeiro_estagio + bert), 4) if primeiro_estagio + bert else 0.0,
+        "fracao_agrupada": round(copias / total, 4) if total else 0.0,
+        "rss_base_mb": round(base, 1),
+        "rss_pico_mb": round(pico_rss_mb(), 1)
+    }
+    resultado["pico_acima_base_mb"] = round(resultado["rss_pico_mb"] - base, 1)
+
+    print("RESULTADO " + json.dumps(resultado))
+
+
+# ==================================================
+# PROCESSO PRINCIPAL
+# ==================================================
+def medir_tamanho(tamanho, seed, latencia, raiz, limiar_cascata=None, sem_dedup=False):
+    """
+    Gera o corpus, sobe a API falsa e mede o pipeline em um processo novo.
+
+    Returns:
+        dict: Resultado do processo filho + impressão e tempo de geração do corpus
+    """
+    from benchmarks.api_falsa import ApiFalsa
+    from benchmarks.corpus_sintetico import CorpusPartida
+
+    inicio = time.perf_counter()
+    corpus = CorpusPartida(tamanho, seed=seed)
+    geracao = time.perf_counter() - inicio
+
+    # MODELO_PATH é relativo: cada tamanho roda em uma pasta com o modelo substituto
+    pasta = os.path.join(raiz, rotulo_tamanho(tamanho))
+    os.makedirs(pasta)
+    os.symlink(os.path.join(raiz, "modelo_torcedor_spfc"), os.path.join(pasta, "modelo_torcedor_spfc"))
+
+    api = ApiFalsa(latencia=latencia, corpus=corpus)
+    base_url = api.iniciar()
+
+    comando = [sys.executable, "-m", "benchmarks.bench_suite", "--base-url", base_url, "--pasta", pasta]
+    if limiar_cascata is not None:
+        comando += ["--cascata", str(limiar_cascata)]
+    if sem_dedup:
+        comando.append("--sem-dedup")
+
+    try:
+        saida = subprocess.run(
+            comando,
+            capture_output=True, text=True, cwd=pasta,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [RAIZ_REPO, os.environ.get("PYTHONPATH")]))}
+        )
+    finally:
+        api.parar()
+
+    if saida.returncode != 0:
+        print(saida.stdout[-2000:], saida.stderr[-4000:], sep="\n")
+        raise RuntimeError(f"Benchmark de {rotulo_tamanho(tamanho)} respostas falhou")
+
+    linha = [l for l in saida.stdout.splitlines() if l.startswith("RESULTADO")][-1]
+    resultado = json.loads(linha[len("RESULTADO "):])
+    resultado["respostas_corpus"] = tamanho
+    resultado["impressao_corpus"] = corpus.impressao()
+    resultado["geracao_corpus_s"] = round(geracao, 3)
+    resultado["requisicoes_api"] = api.requisicoes
+    return resultado
+
+
+def preparar_cascata(raiz, seed, respostas=8000, treino=0.75):
+    """
+    Treina o primeiro estágio da cascata com os rótulos de uma partida
+    sintética (seed diferente da medida), salva em
+    <raiz>/modelo_torcedor_spfc/cascata e calcula a curva no restante.
+
+    Returns:
+        list: Linhas de curva_cascata
+    """
+    from benchmarks.corpus_sintetico import CorpusPartida
+    from src.backends import BackendPytorch
+    from src.cascata import ClassificadorRapido, curva_cascata, preparar_textos
+    from src.config import EMOCAO_TO_ID
+
+    corpus = CorpusPartida(respostas, seed=seed + 1)
+    textos = preparar_textos(corpus.textos)
+    labels = [EMOCAO_TO_ID[emocao] for emocao in corpus.rotulos()]
+    corte = int(len(textos) * treino)
+
+    rapido = ClassificadorRapido().treinar(textos[:corte], labels[:corte])
+    rapido.salvar(os.path.join(raiz, "modelo_torcedor_spfc", "cascata"))
+
+    substituto = BackendPytorch(os.path.join(raiz, "modelo_torcedor_spfc", "final"))
+    return curva_cascata(rapido, textos[corte:], labels[corte:], modelo=substituto)
+
+
+def comparar(atual, base, tolerancia):
+    """
+    Compara cada tempo e o pico de memória com a linha de base.
+
+    Returns:
+        list: [(tamanho, medida, valor, referência, variação, situação)]
+    """
+    linhas = []
+
+    for tamanho, resultado in atual["tamanhos"].items():
+        referencia = base["tamanhos"].get(tamanho)
+        if referencia is None:
+            continue
+
+        if referencia["impressao_corpus"] != resultado["impressao_corpus"]:
+            print(f"[ERRO] Corpus de {tamanho} diferente da linha de base (seed ou gerador mudou): comparação ignorada")
+            continue
+
+        medidas = [("total (s)", resultado["total_s"], referencia["total_s"], PISO_SEGUNDOS)]
+        medidas += [
+            (f"{etapa} (s)", resultado["etapas"][etapa]["total_s"], referencia["etapas"][etapa]["total_s"], PISO_SEGUNDOS)
+            for etapa in ETAPAS if etapa in referencia["etapas"]
+        ]
+        medidas.append(("pico de memória (MB)", resultado["pico_acima_base_mb"], referencia["pico_acima_base_mb"], PISO_MB))
+
+        for medida, valor, ref, piso in medidas:
+            variacao = (valor - ref) / ref if ref > 0 else 0.0
+            if variacao > tolerancia and valor - ref > piso:
+                situacao = "REGRESSÃO"
+            elif variacao < -tolerancia and ref - valor > piso:
+                situacao = "melhora"
+            else:
+                situacao = "ok"
+            linhas.append((tamanho, medida, valor, ref, variacao, situacao))
+
+    return linhas
+
+
+def imprimir_resultados(resultados):
+    print("\n=== Pipeline da partida (corpus sintético) ===")
+    print(f"{'tamanho':<9}{'tweets':>9}{'total (s)':>11}{'tweets/s':>11}{'pico - base (MB)':>18}"
+          f"{'requisições':>13}{'1º estágio':>12}{'agrupados':>11}")
+    for tamanho, r in resultados["tamanhos"].items():
+        print(f"{tamanho:<9}{r['tweets']:>9}{r['total_s']:>11.2f}{r['tweets_por_s']:>11,.0f}"
+              f"{r['pico_acima_base_mb']:>18.1f}{r['requisicoes_api']:>13}{r['fracao_primeiro_estagio']:>12.1%}"
+              f"{r.get('fracao_agrupada', 0.0):>11.1%}")
+
+    print("\n=== Tempo por etapa (s) ===")
+    print(f"{'tamanho':<9}" + "".join(f"{etapa:>15}" for etapa in ETAPAS))
+    for tamanho, r in resultados["tamanhos"].items():
+        print(f"{tamanho:<9}" + "".join(f"{r['etapas'][etapa]['total_s']:>15.2f}" for etapa in ETAPAS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmark de ponta a ponta (partida sintética)")
+    parser.add_argument("--tamanhos", default="1k,10k,100k", help="Respostas por partida, separadas por vírgula (1k a 1m)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latencia", type=float, default=0.0, help="Atraso (s) da API falsa por requisição")
+    parser.add_argument("--linha-base", default=LINHA_BASE_PADRAO, help="JSON da linha de base")
+    parser.add_argument("--salvar-linha-base", action="store_true", help="Grava os resultados como nova linha de base")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Piora relativa aceita antes de acusar regressão")
+    parser.add_argument("--saida", help="Grava também os resultados desta execução neste JSON")
+    parser.add_argument("--cascata", type=float, metavar="LIMIAR",
+                        help="Ativa a cascata (src/cascata.py) com este limiar de confiança")
+    parser.add_argument("--sem-dedup", action="store_true",
+                        help="Desliga o agrupamento de quase-duplicatas (src/deduplicacao.py)")
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--pasta", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Processo filho: executa um único tamanho
+    if args.base_url:
+        executar_tamanho(args.base_url, args.pasta, args.cascata, args.sem_dedup)
+        return
+
+    from benchmarks.classificador_local import criar_classificador
+    from benchmarks.corpus_sintetico import CorpusPartida
+
+    tamanhos = [ler_tamanho(t) for t in args.tamanhos.split(",")]
+    resultados = {
+        "seed": args.seed,
+        "latencia_api": args.latencia,
+        "cascata": args.cascata,
+        "deduplicacao": not args.sem_dedup,
+        "ambiente": ambiente(),
+        "tamanhos": {}
+    }
+
+    with tempfile.TemporaryDirectory() as raiz:
+        print("[INFO] Criando o classificador substituto...")
+        criar_classificador(
+            os.path.join(raiz, "modelo_torcedor_spfc", "final"),
+            CorpusPartida(5000, seed=args.seed).textos,
+            seed=args.seed
+        )
+
+        if args.cascata is not None:
+            print("[INFO] Treinando o primeiro estágio da cascata...")
+            resultados["curva_cascata"] = preparar_cascata(raiz, args.seed)
+
+        for tamanho in tamanhos:
+            print(f"[INFO] Medindo {rotulo_tamanho(tamanho)} respostas...")
+            resultados["tamanhos"][rotulo_tamanho(tamanho)] = medir_tamanho(
+                tamanho, args.seed, args.latencia, raiz, args.cascata, args.sem_dedup
+            )
+
+    imprimir_resultados(resultados)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=4, ensure_ascii=False)
+        print(f"\n[INFO] Resultados salvos em: {args.saida}")
+
+    if args.salvar_linha_base:
+        with open(args.linha_base, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=4, ensure_ascii=False)
+        print(f"\n[INFO] Linha de base salva em: {args.linha_base}")
+        return
+
+    if not os.path.exists(args.linha_base):
+        print(f"\n[INFO] Sem linha de base em {args.linha_base} (grave uma com --salvar-linha-base)")
+        return
+
+    with open(args.linha_base, encoding="utf-8") as f:
+        base = json.load(f)
+
+    if base["ambiente"] != resultados["ambiente"]:
+        print("\n[INFO] Ambiente diferente do da linha de base: compare os tempos com cautela")
+    if base.get("cascata") != resultados["cascata"]:
+        print(f"\n[INFO] Linha de base com cascata {base.get('cascata')} e esta execução com {resultados['cascata']}")
+    if base.get("deduplicacao", False) != resultados["deduplicacao"]:
+        print(f"\n[INFO] Linha de base com deduplicação {base.get('deduplicacao', False)} "
+              f"e esta execução com {resultados['deduplicacao']}")
+
+    linhas = comparar(resultados, base, args.tolerancia)
+
+    print(f"\n=== Comparação com a linha de base (tolerância: {args.tolerancia:.0%}) ===")
+    print(f"{'tamanho':<9}{'medida':<24}{'atual':>10}{'base':>10}{'variação':>10}  situação")
+    for tamanho, medida, valor, ref, variacao, situacao in linhas:
+        print(f"{tamanho:<9}{medida:<24}{valor:>10.2f}{ref:>10.2f}{variacao:>+10.0%}  {situacao}")
+
+    regressoes = sum(1 for linha in linhas if linha[-1] == "REGRESSÃO")
+    if regressoes:
+        print(f"\n[ERRO] {regressoes} regressões acima da tolerância")
+        sys.exit(1)
+
+    print("\n[INFO] Nenhuma regressão acima da tolerância")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# /benchmarks/bench_tabela.py
+
+"""
+Benchmark do armazenamento dos tweets: lista de dicionários (um por
+resposta, como saem da coleta) x TabelaTweets (src/tabela.py).
+
+Mede a memória retida por cada formato com tracemalloc e o tempo das
+operações que o pipeline faz sobre os tweets classificados: percentuais
+de emoção, agrupamento por janela e escrita dos CSVs. Não usa o modelo
+nem a API: as respostas e as emoções são sintéticas.
+
+Uso:
+    python -m benchmarks.bench_tabela --csv data/texto_bruto.csv --n 200000
+"""
+
+import argparse
+import io
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from src.agregacao import percentual_emocoes
+from src.coleta import limpar_texto
+from src.config import EMOCOES
+from src.janelas import agrupar_por_janela, calcular_janelas
+from src.tabela import TabelaTweets
+from src.utils import em_lotes, escrever_tabela_csv
+
+INICIO_JOGO = datetime(2024, 5, 1, 16, 0, tzinfo=ZoneInfo("America/Sao_Paulo"))
+
+TEXTOS_PADRAO = [
+    "VAMOS SÃO PAULO!!! 🔥🔥 @SaoPauloFC #VamosSaoPaulo",
+    "que fase... esse time não joga nada https://t.co/abc",
+    "GOOOOOL 😍😍 que golaço",
+    "juiz ladrão, roubado de novo 😡",
+    "tô com medo desse segundo tempo",
+]
+
+
+def gerar_tweets(n, textos, semente=0):
+    """
+    Respostas no mesmo formato dos dicionários da coleta, já classificadas.
+    """
+    aleatorio = random.Random(semente)
+    inicio = INICIO_JOGO - timedelta(hours=1)
+    textos_limpos = [limpar_texto(texto) for texto in textos]
+
+    for i in range(n):
+        k = aleatorio.randrange(len(textos))
+        instante = inicio + timedelta(seconds=aleatorio.randrange(5 * 3600))
+
+        # Cópias das strings: na coleta real cada resposta tem os seus objetos str
+        yield {
+            "id_tweet": str(10**18 + i),
+            "texto": (textos[k] + " ")[:-1],
+            "retweets": aleatorio.randrange(50),
+            "likes": aleatorio.randrange(500),
+            "texto_limpo": (textos_limpos[k] + " ")[:-1],
+            "timestamp": instante.astimezone(ZoneInfo("UTC")).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "janela": inicio,
+            "emocao": aleatorio.choice(EMOCOES),
+            "confianca": aleatorio.random()
+        }
+
+
+def medir_memoria(construir):
+    """
+    Memória (MB) retida pelo objeto devolvido por construir().
+    """
+    tracemalloc.start()
+    objeto = construir()
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objeto, atual / 1024 ** 2
+
+
+def medir_tempo(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def escrever_csvs(grupos):
+    for lista_grupos in grupos.values():
+        for _, tweets_j in lista_grupos:
+            with io.StringIO() as f:
+                if isinstance(tweets_j, TabelaTweets):
+                    escrever_tabela_csv(f, tweets_j, cabecalho=True)
+                elif tweets_j:
+                    import pandas as pd
+
+                    pd.DataFrame(tweets_j).to_csv(f, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lista de dicionários x TabelaTweets")
+    parser.add_argument("--csv", help="CSV com textos reais (coluna texto_bruto)")
+    parser.add_argument("--n", type=int, default=200_000, help="Quantidade de respostas")
+    args = parser.parse_args()
+
+    textos = TEXTOS_PADRAO
+    if args.csv:
+        import pandas as pd
+
+        textos = [str(t) for t in pd.read_csv(args.csv)["texto_bruto"].dropna()]
+
+    janelas = calcular_janelas(INICIO_JOGO)
+    inicio_coleta = INICIO_JOGO - timedelta(hours=1)
+
+    lista, mb_lista = medir_memoria(lambda: list(gerar_tweets(args.n, textos)))
+    del lista
+
+    # A tabela é montada em blocos, sem reter a lista completa de dicionários
+    tabela, mb_tabela = medir_memoria(lambda: TabelaTweets.concatenar(
+        [TabelaTweets.de_dicts(lote, janela=inicio_coleta)
+         for lote in em_lotes(gerar_tweets(args.n, textos), 10_000)],
+        janela=inicio_coleta
+    ))
+
+    lista = list(gerar_tweets(args.n, textos))
+
+    resultados = {}
+    for nome, tweets in (("lista", lista), ("tabela", tabela)):
+        grupos = agrupar_por_janela(tweets, janelas)
+        resultados[nome] = {
+            "percentuais": medir_tempo(lambda: percentual_emocoes(tweets)),
+            "agrupar": medir_tempo(lambda: agrupar_por_janela(tweets, janelas)),
+            "csv": medir_tempo(lambda: escrever_csvs(grupos)),
+        }
+
+    print(f"\n=== {args.n} respostas: lista de dicionários x TabelaTweets ===")
+    print(f"{'':<22}{'lista':>12}{'tabela':>12}")
+    print(f"{'memória (MB)':<22}{mb_lista:>12.1f}{mb_tabela:>12.1f}")
+    for operacao in ("percentuais", "agrupar", "csv"):
+        print(f"{operacao + ' (s)':<22}{resultados['lista'][operacao]:>12.3f}{resultados['tabela'][operacao]:>12.3f}")
+
+    print(f"Redução de memória: {(1 - mb_tabela / mb_lista) * 100:.1f}%")
+    print(f"Mesmos percentuais: {'sim' if percentual_emocoes(lista) == percentual_emocoes(tabela) else 'NÃO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# /benchmarks/bench_visualizacao.py
+
+"""
+Benchmark dos gráficos de uma temporada: gera os gráficos de N partidas
+sintéticas (renderizar_partida: distribuição, etapas e linha do tempo por
+janela) de três formas:
+
+    - figura nova a cada gráfico (custo sem o reaproveitamento)
+    - figuras reaproveitadas, no thread principal
+    - RenderizadorGraficos com 1, 2, 4... processos
+
+Para o pool, "bloqueio" é o tempo em que o chamador fica parado nos
+envios (o que o lote deixa de esperar) e "total" inclui subir os processos
+e esperar o último gráfico. As matrizes de emoção são sintéticas: não usa
+o modelo nem a API.
+
+Uso:
+    python -m benchmarks.bench_visualizacao --partidas 100 --processos 1 2 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import numpy as np
+from src import visualizacao
+from src.agregacao import MatrizEmocoes
+from src.janelas import calcular_janelas
+from src.visualizacao import RenderizadorGraficos, renderizar_partida
+
+INICIO_TEMPORADA = datetime(2024, 4, 14, 16, 0, tzinfo=ZoneInfo("America/Sao_Paulo"))
+
+
+def gerar_partidas(quantidade, pasta, seed=42):
+    """
+    Dados de renderizar_partida para `quantidade` partidas, uma por semana,
+    com contagens aleatórias em cada janela.
+    """
+    rng = np.random.default_rng(seed)
+    partidas = []
+
+    for i in range(quantidade):
+        inicio = INICIO_TEMPORADA + timedelta(days=7 * i)
+        matriz = MatrizEmocoes(calcular_janelas(inicio))
+        matriz.contagens[:, :, -1] = rng.poisson(rng.uniform(5, 200, size=matriz.contagens.shape[:2]))
+
+        identificador = inicio.strftime("%Y%m%d_%H%M")
+        pasta_partida = os.path.join(pasta, identificador)
+        os.makedirs(pasta_partida)
+
+        partidas.append({
+            "pasta_resultados": pasta_partida,
+            "identificador_jogo": identificador,
+            "titulo": f" - Partida {i + 1}",
+            "percentuais": matriz.percentuais(),
+            "percentuais_etapas": matriz.percentuais_etapas(),
+            "serie": matriz.serie_temporal()
+        })
+
+    return partidas
+
+
+def medir_sequencial(partidas, reaproveitar=True):
+    inicio = time.perf_counter()
+    for dados in partidas:
+        if not reaproveitar:
+            # Descarta as figuras do thread: cada partida cria as suas
+            visualizacao._local.figuras = {}
+        renderizar_partida(dados)
+    return time.perf_counter() - inicio
+
+
+def medir_pool(partidas, processos):
+    """
+    Returns:
+        tuple: (tempo bloqueado nos envios, tempo total até o último gráfico)
+    """
+    inicio = time.perf_counter()
+    renderizador = RenderizadorGraficos(processos)
+
+    envio = time.perf_counter()
+    for dados in partidas:
+        renderizador.enviar(dados)
+    bloqueio = time.perf_counter() - envio
+
+    renderizador.fechar()
+    return bloqueio, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos gráficos de várias partidas")
+    parser.add_argument("--partidas", type=int, default=100)
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        partidas = gerar_partidas(args.partidas, pasta, args.seed)
+        print(f"[INFO] {len(partidas)} partidas sintéticas ({len(partidas[0]['serie'])} janelas cada)")
+
+        # Aquecimento: importação do matplotlib e cache de fontes
+        renderizar_partida(partidas[0])
+
+        print(f"\n=== Gráficos de {len(partidas)} partidas (3 por partida) ===")
+        print(f"{'modo':<34}{'bloqueio (s)':>14}{'total (s)':>11}{'ms/partida':>12}")
+
+        tempo = medir_sequencial(partidas, reaproveitar=False)
+        print(f"{'figura nova a cada gráfico':<34}{tempo:>14.2f}{tempo:>11.2f}{tempo / len(partidas) * 1000:>12.1f}")
+
+        tempo = medir_sequencial(partidas)
+        print(f"{'figuras reaproveitadas':<34}{tempo:>14.2f}{tempo:>11.2f}{tempo / len(partidas) * 1000:>12.1f}")
+
+        for processos in args.processos:
+            bloqueio, total = medir_pool(partidas, processos)
+            print(f"{f'pool com {processos} processo(s)':<34}{bloqueio:>14.2f}{total:>11.2f}"
+                  f"{total / len(partidas) * 1000:>12.1f}")
+
+        arquivos = sum(len(os.listdir(dados["pasta_resultados"])) for dados in partidas)
+        print(f"\n[INFO] Arquivos gerados: {arquivos}")
+
+
+if __name__ == "__main__":
+    main()
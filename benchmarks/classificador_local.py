@@ -0,0 +1,63 @@
+# /benchmarks/classificador_local.py
+
+"""
+Classificador substituto para os benchmarks: um BERT minúsculo (pesos
+aleatórios com seed) com tokenizer WordPiece treinado nos próprios textos
+sintéticos. Tem a mesma interface do modelo fine-tuned (pasta no formato
+do transformers, 5 emoções), então todo o pipeline de inferência roda
+igual, mas sem baixar o BERTimbau e com custo estável entre máquinas.
+
+As previsões não têm significado: o objetivo é medir o pipeline.
+"""
+
+import os
+import tempfile
+
+VOCABULARIO = 2000
+
+
+def criar_classificador(pasta, textos, seed=42):
+    """
+    Treina o tokenizer e salva o modelo em `pasta` (ex.: <trabalho>/modelo_torcedor_spfc/final).
+
+    Args:
+        pasta (str): Pasta de destino
+        textos (list): Textos usados para treinar o vocabulário
+        seed (int): Seed dos pesos
+
+    Returns:
+        str: A própria pasta
+    """
+    import torch
+    from tokenizers import BertWordPieceTokenizer
+    from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+    from src.config import EMOCAO_TO_ID, ID_TO_EMOCAO, MAX_LEN
+    from src.normalizacao import normalizar_textos
+
+    os.makedirs(pasta, exist_ok=True)
+
+    # Mesmo texto que chega ao tokenizer na inferência
+    with tempfile.TemporaryDirectory() as pasta_vocab:
+        wordpiece = BertWordPieceTokenizer(lowercase=False, strip_accents=False)
+        wordpiece.train_from_iterator(normalizar_textos(textos), vocab_size=VOCABULARIO, min_frequency=1)
+        wordpiece.save_model(pasta_vocab)
+        tokenizer = BertTokenizerFast(os.path.join(pasta_vocab, "vocab.txt"), do_lower_case=False)
+
+    torch.manual_seed(seed)
+    config = BertConfig(
+        vocab_size=tokenizer.vocab_size,
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=128,
+        max_position_embeddings=MAX_LEN,
+        num_labels=len(ID_TO_EMOCAO),
+        id2label=ID_TO_EMOCAO,
+        label2id=EMOCAO_TO_ID
+    )
+    model = BertForSequenceClassification(config).eval()
+
+    tokenizer.model_max_length = MAX_LEN
+    tokenizer.save_pretrained(pasta)
+    model.save_pretrained(pasta)
+    return pasta
@@ -0,0 +1,283 @@
+# /benchmarks/corpus_sintetico.py
+
+"""
+Partida sintética para os benchmarks: respostas em português com emojis,
+hashtags, menções e links, e horários concentrados nos momentos do jogo
+(picos logo depois de cada gol, início e fim da partida).
+
+Tudo é gerado a partir de uma seed, sem rede: o mesmo tamanho e a mesma
+seed produzem exatamente as mesmas respostas (impressao() permite conferir).
+
+As respostas ficam em colunas (arrays NumPy + lista de textos) e cada
+página da busca é montada só quando pedida, então a API falsa
+(benchmarks/api_falsa.py, parâmetro corpus) serve 1M de respostas sem
+guardar 1M de dicionários.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+
+INICIO_JOGO = datetime(2024, 5, 1, 16, 0, tzinfo=ZoneInfo("America/Sao_Paulo"))
+
+# Minutos relativos ao início do jogo
+INICIO_COLETA = -60
+FIM_COLETA = 240
+FIM_PRIMEIRO_TEMPO = 47
+INICIO_SEGUNDO_TEMPO = 62
+FIM_JOGO = 110
+
+ID_PERFIL = "1000"   # mesmo ID_PERFIL_FALSO da API falsa
+ID_BASE = 10**15     # IDs crescem com o horário, como os snowflake IDs do X
+
+JOGADORES = [
+    "Calleri", "Luciano", "Lucas", "Rafinha", "Arboleda", "Alisson",
+    "Ferreirinha", "Pablo Maia", "Rafael", "Wellington Rato", "André Silva", "Bobadilla"
+]
+HASHTAGS = ["#VamosSaoPaulo", "#SPFC", "#TricolorPaulista", "#Brasileirao", "#SPFCxADV"]
+MENCOES = ["@SaoPauloFC", "@spfcoficial", "@Brasileirao", "@geglobo", "@torcedor_spfc"]
+
+EMOJIS = {
+    "alegria": ["😍", "🔥", "🎉", "❤️", "🇾🇪", "🙌🏽", "👏", "⚽"],
+    "raiva": ["😡", "🤬", "💢", "👎", "😤"],
+    "frustracao": ["😞", "😩", "😔", "🤦‍♂️", "😢"],
+    "ironia": ["🙃", "🤡", "😂", "🤔", "👏🏻"],
+    "neutro": ["⚽", "📺", "🕓", ""]
+}
+
+MODELOS_TEXTO = {
+    "alegria": [
+        "GOOOOOL {e}{e}", "que golaço do {j}!!! {e}", "vamos são paulo {h} {e}",
+        "{j} monstro demais {e}", "é tricolor que fala né {e} {h}", "ganhamos!!! {e}{e}{e}",
+        "que jogão, orgulho desse time {e}", "{m} obrigado {j} {e}"
+    ],
+    "raiva": [
+        "juiz ladrão {e}", "{j} não joga nada, tira esse cara {e}", "time sem vergonha {m} {e}",
+        "que vergonha, perdendo em casa {e}{e}", "fora {j}!!! {e}", "VAR roubou de novo {h} {e}"
+    ],
+    "frustracao": [
+        "de novo isso... {e}", "não aguento mais esse time {e}", "tô cansado de sofrer {h}",
+        "mais um empate em casa {e}", "{j} perdeu um gol feito {e}", "sempre a mesma coisa {e}"
+    ],
+    "ironia": [
+        "parabéns {j}, mais uma atuação de gala {e}", "nossa que surpresa, levamos gol {e}",
+        "melhor ataque do mundo {e} {h}", "obrigado {m} pelo entretenimento {e}",
+        "{j} merece seleção {e}{e}"
+    ],
+    "neutro": [
+        "escalação com {j} no banco", "que horas começa o segundo tempo?", "alguém sabe onde passa? {l}",
+        "intervalo {h}", "começou {e}", "público de hoje {m}", "jogo em {l}"
+    ]
+}
+
+EMOCOES = list(MODELOS_TEXTO)
+
+
+class CorpusPartida:
+    """
+    Respostas sintéticas de uma partida.
+
+    Args:
+        total_respostas (int): Quantidade de respostas
+        seed (int): Seed do gerador
+        gols (int): Gols na partida. Se None, sorteado (1 a 5)
+    """
+
+    def __init__(self, total_respostas, seed=42, gols=None):
+        rng = np.random.default_rng(seed)
+        self.total = total_respostas
+
+        # ==================================================
+        # GOLS E TWEETS DO CLUBE
+        # ==================================================
+        gols = int(rng.integers(1, 6)) if gols is None else gols
+        minutos_gols = np.sort(np.where(
+            rng.random(gols) < 0.5,
+            rng.uniform(2, FIM_PRIMEIRO_TEMPO, gols),
+            rng.uniform(INICIO_SEGUNDO_TEMPO, FIM_JOGO, gols)
+        ))
+        self.gols = [(float(m), bool(rng.random() < 0.6)) for m in minutos_gols]  # (minuto, gol nosso?)
+
+        # Um post a cada 15 minutos e um logo depois de cada gol
+        posts = np.union1d(np.arange(INICIO_COLETA, FIM_COLETA, 15.0), minutos_gols + 0.5)
+        self.minutos_posts = posts
+        self.ids_clube = [str(9000 + c) for c in range(len(posts))]
+
+        # ==================================================
+        # HORÁRIOS: fundo + jogo + pós-jogo + picos nos gols
+        # ==================================================
+        pesos = {"fundo": 0.25, "jogo": 0.30, "pos_jogo": 0.15}
+        for k in range(len(self.gols)):
+            pesos[f"gol{k}"] = 0.30 / len(self.gols)
+        if not self.gols:
+            pesos["jogo"] += 0.30
+
+        quantidades = rng.multinomial(total_respostas, list(pesos.values()))
+        partes = []
+        origem = []
+        for (componente, _), n in zip(pesos.items(), quantidades):
+            if componente == "fundo":
+                minutos = rng.uniform(INICIO_COLETA, FIM_COLETA, n)
+            elif componente == "jogo":
+                minutos = rng.uniform(0, FIM_JOGO, n)
+            elif componente == "pos_jogo":
+                minutos = FIM_JOGO + rng.exponential(20, n)
+            else:
+                minuto_gol = self.gols[int(componente[3:])][0]
+                minutos = minuto_gol + rng.exponential(3, n)
+            partes.append(minutos)
+            origem.append(np.full(n, list(pesos).index(componente), dtype=np.int16))
+
+        minutos = np.clip(np.concatenate(partes), INICIO_COLETA, FIM_COLETA - 1e-3)
+        origem = np.concatenate(origem)
+
+        ordem = np.argsort(minutos, kind="stable")
+        minutos = minutos[ordem]
+        origem = origem[ordem]
+
+        inicio_ms = int(INICIO_JOGO.timestamp() * 1000)
+        self.epoch_ms = inicio_ms + np.round(minutos * 60_000).astype(np.int64)
+        self.ids = ID_BASE + np.arange(total_respostas, dtype=np.int64)
+
+        # ==================================================
+        # TEXTOS (emoção depende do momento)
+        # ==================================================
+        emocoes = rng.choice(len(EMOCOES), total_respostas, p=[0.2, 0.2, 0.2, 0.15, 0.25])
+        for k, (_, nosso) in enumerate(self.gols):
+            no_pico = origem == list(pesos).index(f"gol{k}")
+            predominante = ["alegria"] if nosso else ["raiva", "frustracao", "ironia"]
+            sorteio = rng.choice([EMOCOES.index(e) for e in predominante], int(no_pico.sum()))
+            troca = rng.random(int(no_pico.sum())) < 0.7
+            emocoes[no_pico] = np.where(troca, sorteio, emocoes[no_pico])
+
+        # Parte das respostas é ambígua: o texto segue o modelo de outra
+        # emoção (ironia escrita como elogio, raiva como frustração...)
+        ambiguas = rng.random(total_respostas) < 0.15
+        modelos = np.where(ambiguas, rng.integers(0, len(EMOCOES), total_respostas), emocoes)
+
+        self.textos = [self._texto(rng, EMOCOES[e]) for e in modelos.tolist()]
+        self.emocoes = emocoes.astype(np.int8)  # índices de EMOCOES (rótulo de cada resposta)
+
+        self.retweets = rng.poisson(0.5, total_respostas).astype(np.int32)
+        self.likes = rng.poisson(3, total_respostas).astype(np.int32)
+        # Parte das respostas não é direta ao perfil do clube
+        self.direta = rng.random(total_respostas) < 0.9
+
+        # ==================================================
+        # CONVERSAS: cada resposta vai para o último post antes dela
+        # ==================================================
+        conversa = np.clip(np.searchsorted(posts, minutos, side="right") - 1, 0, len(posts) - 1)
+        self.ordem_conversas = np.argsort(conversa, kind="stable")
+        self.limites_conversas = np.searchsorted(conversa[self.ordem_conversas], np.arange(len(posts) + 1))
+
+    @staticmethod
+    def _texto(rng, emocao):
+        modelos = MODELOS_TEXTO[emocao]
+        texto = modelos[int(rng.integers(len(modelos)))]
+        emojis = EMOJIS[emocao]
+
+        texto = texto.format(
+            e=emojis[int(rng.integers(len(emojis)))],
+            j=JOGADORES[int(rng.integers(len(JOGADORES)))],
+            h=HASHTAGS[int(rng.integers(len(HASHTAGS)))],
+            m=MENCOES[int(rng.integers(len(MENCOES)))],
+            l=f"https://t.co/{int(rng.integers(10**6)):06x}"
+        )
+
+        # Variações comuns: menção a outro torcedor, caixa alta, letras repetidas
+        variacao = rng.random()
+        if variacao < 0.25:
+            texto = f"@torcedor{int(rng.integers(5000))} {texto}"
+        elif variacao < 0.35:
+            texto = texto.upper()
+        elif variacao < 0.45:
+            texto = texto + "!" * int(rng.integers(1, 4))
+        return texto
+
+    # ==================================================
+    # CONSULTA
+    # ==================================================
+    def impressao(self):
+        """
+        SHA-256 das respostas (ids, horários e textos), para conferir que
+        duas execuções mediram os mesmos dados.
+        """
+        h = hashlib.sha256()
+        h.update(self.ids.tobytes())
+        h.update(self.epoch_ms.tobytes())
+        for texto in self.textos:
+            h.update(texto.encode("utf-8") + b"\0")
+        return h.hexdigest()[:16]
+
+    def rotulos(self):
+        """
+        Emoção de cada resposta (nomes de EMOCOES). Nas respostas ambíguas,
+        difere da emoção do modelo de texto usado.
+        """
+        return [EMOCOES[e] for e in self.emocoes.tolist()]
+
+    def textos_amostra(self, n):
+        return self.textos[:: max(1, self.total // n)][:n]
+
+    def _iso(self, epoch_ms):
+        return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    @staticmethod
+    def _epoch_ms(iso):
+        instante = datetime.strptime(iso[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+        return int(instante.timestamp() * 1000)
+
+    def responder(self, params):
+        """
+        Corpo JSON da busca recente para os parâmetros de uma requisição
+        (mesmo formato de ApiFalsa.responder).
+        """
+        query = params["query"]
+        max_results = int(params.get("max_results", 100))
+        offset = int(params.get("next_token", 0))
+
+        if query.startswith("from:"):
+            itens = [
+                {
+                    "id": id_clube,
+                    "conversation_id": id_clube,
+                    "created_at": self._iso(int(INICIO_JOGO.timestamp() * 1000 + minuto * 60_000))
+                }
+                for id_clube, minuto in zip(self.ids_clube, self.minutos_posts.tolist())
+            ]
+            pagina = itens[offset:offset + max_results]
+            proximo = offset + max_results < len(itens)
+
+        else:
+            c = int(query.split()[0].split(":")[1]) - 9000
+            indices = self.ordem_conversas[self.limites_conversas[c]:self.limites_conversas[c + 1]]
+
+            # Dentro da conversa os índices já estão em ordem de horário (e de id)
+            epoch = self.epoch_ms[indices]
+            ini, fim = 0, len(indices)
+            if "start_time" in params:
+                ini = int(np.searchsorted(epoch, self._epoch_ms(params["start_time"]), side="left"))
+            if "end_time" in params:
+                fim = int(np.searchsorted(epoch, self._epoch_ms(params["end_time"]), side="left"))
+            if "since_id" in params:
+                ini = max(ini, int(np.searchsorted(self.ids[indices], int(params["since_id"]), side="right")))
+
+            selecionados = indices[ini:fim]
+            pagina = [
+                {
+                    "id": str(self.ids[i]),
+                    "text": self.textos[i],
+                    "created_at": self._iso(int(self.epoch_ms[i])),
+                    "public_metrics": {"retweet_count": int(self.retweets[i]), "like_count": int(self.likes[i])},
+                    "in_reply_to_user_id": ID_PERFIL if self.direta[i] else "42"
+                }
+                for i in selecionados[offset:offset + max_results].tolist()
+            ]
+            proximo = offset + max_results < len(selecionados)
+
+        meta = {"result_count": len(pagina)}
+        if proximo:
+            meta["next_token"] = str(offset + max_results)
+
+        return {"data": pagina, "meta": meta} if pagina else {"meta": meta}
@@ -2,16 +2,19 @@
 
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from dateutil import parser
 from src.janelas import calcular_janelas
-from src.coleta import coletar_tweets
-from src.utils import criar_pasta_resultados, salvar_tweets_csv
-from src.analise_emocoes import analisar_tweets
-from src.agregacao import percentual_emocoes
-from src.visualizacao import gerar_grafico_barras, gerar_tabela_resumo
-from src.config import PERFIL_SPFC, MODELO_PATH, API_BEARER_TOKEN
+from src.pipeline import executar_pipeline
+from src.ao_vivo import executar_ao_vivo
+from src.lote import executar_lote, ler_partidas
+from src.utils import criar_pasta_resultados, salvar_serie_emocoes
+from src.cache import relatar_cache
+from src.metricas import cronometrado, imprimir_resumo, reiniciar, salvar_metricas
+from src.agregacao import MatrizEmocoes
+from src.visualizacao import renderizar_partida
+from src.config import PERFIL_SPFC, MODELO_PATH, CHECKPOINT_PASTA, DEDUP_MAXIMO_POR_GRUPO, obter_token_api
+from src.cliente_api import ClienteAPI
+import argparse
 import os
-import requests
 
 
 # ==================================================
@@ -34,13 +37,14 @@ def verificar_modelo():
 # ==================================================
 # OBTER ID DO USUÁRIO OFICIAL
 # ==================================================
-def obter_id_usuario(username):
+@cronometrado("api.obter_id_usuario")
+def obter_id_usuario(username, cliente):
     url = f"https://api.twitter.com/2/users/by/username/{username}"
-    headers = {"Authorization": f"Bearer {API_BEARER_TOKEN}"}
-    resp = requests.get(url, headers=headers)
 
-    if resp.status_code != 200:
-        raise RuntimeError(f"Não foi possível obter ID do usuário {username}: {resp.text}")
+    try:
+        resp = cliente.get(url)
+    except RuntimeError as e:
+        raise RuntimeError(f"Não foi possível obter ID do usuário {username}: {e}")
 
     data = resp.json().get("data", {})
     user_id = data.get("id")
@@ -52,150 +56,198 @@ def obter_id_usuario(username):
     return user_id
 
 
-# ==================================================
-# INÍCIO DO PIPELINE
-# ==================================================
-if not verificar_modelo():
-    exit(1)
-
-# Entrada do usuário
-adversario = input("Adversário: ")
-data_jogo = input("Data do jogo (DD-MM-AAAA): ")
-hora_jogo = input("Hora de início (HH:MM): ")
-
 timezone_br = ZoneInfo("America/Sao_Paulo")
 
-hora_inicio_jogo = datetime.strptime(
-    f"{data_jogo} {hora_jogo}",
-    "%d-%m-%Y %H:%M"
-).replace(tzinfo=timezone_br)
-
-data_hora = data_jogo.replace("-", "") + "_" + hora_jogo.replace(":", "")
-
-pasta_data, pasta_resultados = criar_pasta_resultados(adversario, data_hora)
-
-janelas = calcular_janelas(hora_inicio_jogo)
-
-print("\n[INFO] Janelas calculadas:")
-for etapa, lista_janelas in janelas.items():
-    print(f"\n{etapa.upper()}")
-    for inicio_j, fim_j in lista_janelas:
-        print(f"{inicio_j.strftime('%H:%M')} → {fim_j.strftime('%H:%M')}")
-
-id_spfc = obter_id_usuario(PERFIL_SPFC)
-
-
-# ==================================================
-# COLETA CONTÍNUA
-# ==================================================
-inicio_coleta = hora_inicio_jogo - timedelta(hours=1)
-fim_coleta = hora_inicio_jogo + timedelta(hours=4)
-
-print("\n[INFO] Coleta contínua:")
-print(f"{inicio_coleta.strftime('%H:%M')} → {fim_coleta.strftime('%H:%M')}")
-
-tweets_coletados = coletar_tweets(
-    janela=(inicio_coleta, fim_coleta),
-    perfil=PERFIL_SPFC,
-    id_perfil=id_spfc
-)
-
-print(f"[INFO] Total bruto coletado: {len(tweets_coletados)} tweets")
-
-tweets_coletados = analisar_tweets(tweets_coletados)
-
-
-# ==================================================
-# DISTRIBUIR NAS JANELAS (CORRIGIDO)
-# ==================================================
-def filtrar_por_janela(lista_tweets, intervalo):
-    inicio_intervalo, fim_intervalo = intervalo
-    filtrados = []
-
-    for tweet in lista_tweets:
-        # Parse timestamp (UTC vindo da API)
-        timestamp_utc = parser.isoparse(tweet["timestamp"])
-
-        # Converter para horário do Brasil
-        timestamp_br = timestamp_utc.astimezone(timezone_br)
-
-        if inicio_intervalo <= timestamp_br < fim_intervalo:
-            filtrados.append(tweet)
-
-    return filtrados
-
-
-tweets_pre = []
-tweets_durante = []
-tweets_pos = []
-
-for intervalo in janelas["pre_jogo"]:
-    tweets_j = filtrar_por_janela(tweets_coletados, intervalo)
-    salvar_tweets_csv(tweets_j, pasta_data, "pre_jogo", intervalo[0])
-    tweets_pre += tweets_j
-
-for intervalo in janelas["durante_jogo"]:
-    tweets_j = filtrar_por_janela(tweets_coletados, intervalo)
-    salvar_tweets_csv(tweets_j, pasta_data, "durante_jogo", intervalo[0])
-    tweets_durante += tweets_j
-
-for intervalo in janelas["pos_jogo"]:
-    tweets_j = filtrar_por_janela(tweets_coletados, intervalo)
-    salvar_tweets_csv(tweets_j, pasta_data, "pos_jogo", intervalo[0])
-    tweets_pos += tweets_j
-
 
 # ==================================================
 # ESTATÍSTICAS
 # ==================================================
-def estatisticas_tweets(lista_tweets):
-    total_tweets = len(lista_tweets)
-    neutros_tweets = sum(1 for t in lista_tweets if t.get("emocao") == "neutro")
+def estatisticas_tweets(matriz, etapa=None):
+    total_tweets = matriz.total(etapa)
+    neutros_tweets = matriz.neutros(etapa)
     percentual_neutros = (neutros_tweets / total_tweets) * 100 if total_tweets else 0
     return total_tweets, neutros_tweets, percentual_neutros
 
 
-print("\n=== Estatísticas por etapa ===")
-for nome, lista in [
-    ("Pré-jogo", tweets_pre),
-    ("Durante o jogo", tweets_durante),
-    ("Pós-jogo", tweets_pos)
-]:
-    total, neutros, perc = estatisticas_tweets(lista)
-    print(f"{nome}: {total} tweets | {neutros} neutros ({perc:.1f}%)")
-
-
-# ==================================================
-# AGREGAÇÃO
-# ==================================================
-percentuais_etapas = {
-    "pre_jogo": percentual_emocoes(tweets_pre),
-    "durante_jogo": percentual_emocoes(tweets_durante),
-    "pos_jogo": percentual_emocoes(tweets_pos)
-}
-
-todos_tweets = tweets_pre + tweets_durante + tweets_pos
-percentuais_totais = percentual_emocoes(todos_tweets)
-
-total_geral, neutros_geral, perc_neutros_geral = estatisticas_tweets(todos_tweets)
-
-print("\n=== Estatísticas gerais ===")
-print(f"Total de tweets: {total_geral}")
-print(f"Tweets neutros: {neutros_geral} ({perc_neutros_geral:.1f}%)")
-
-
 # ==================================================
-# VISUALIZAÇÃO
+# INÍCIO DO PIPELINE
 # ==================================================
-gerar_grafico_barras(
-    percentuais_totais,
-    pasta_resultados,
-    identificador_jogo=data_hora,
-    titulo="Distribuição de Emoções dos Torcedores"
-)
-
-gerar_tabela_resumo(
-    percentuais_etapas,
-    pasta_resultados,
-    identificador_jogo=data_hora
-)
\ No newline at end of file
+def main(ao_vivo=False):
+    if not verificar_modelo():
+        exit(1)
+
+    # Valida o token antes de pedir os dados do jogo
+    obter_token_api()
+
+    # Entrada do usuário
+    adversario = input("Adversário: ")
+    data_jogo = input("Data do jogo (DD-MM-AAAA): ")
+    hora_jogo = input("Hora de início (HH:MM): ")
+
+    hora_inicio_jogo = datetime.strptime(
+        f"{data_jogo} {hora_jogo}",
+        "%d-%m-%Y %H:%M"
+    ).replace(tzinfo=timezone_br)
+
+    data_hora = data_jogo.replace("-", "") + "_" + hora_jogo.replace(":", "")
+
+    # Tempos da execução contados a partir daqui (sem a espera pelo input)
+    reiniciar()
+
+    pasta_data, pasta_resultados = criar_pasta_resultados(adversario, data_hora)
+
+    janelas = calcular_janelas(hora_inicio_jogo)
+
+    print("\n[INFO] Janelas calculadas:")
+    for etapa, lista_janelas in janelas.items():
+        print(f"\n{etapa.upper()}")
+        for inicio_j, fim_j in lista_janelas:
+            print(f"{inicio_j.strftime('%H:%M')} → {fim_j.strftime('%H:%M')}")
+
+    # Um único cliente (sessão keep-alive) para todas as requisições da execução
+    cliente = ClienteAPI()
+
+    id_spfc = obter_id_usuario(PERFIL_SPFC, cliente)
+
+    pasta_checkpoint = os.path.join(CHECKPOINT_PASTA, f"SPFC_vs_{adversario}_{data_hora}")
+
+    if ao_vivo:
+        # ==================================================
+        # MODO AO VIVO (janelas emitidas conforme fecham)
+        # ==================================================
+        matriz = MatrizEmocoes(janelas)
+        executar_ao_vivo(
+            janelas,
+            perfil=PERFIL_SPFC,
+            id_perfil=id_spfc,
+            cliente=cliente,
+            pasta_data=pasta_data,
+            pasta_checkpoint=pasta_checkpoint,
+            matriz=matriz
+        )
+    else:
+        # ==================================================
+        # COLETA → CLASSIFICAÇÃO → JANELAS → CSV (em fluxo)
+        # ==================================================
+        print("\n[INFO] Coleta contínua:")
+        print(f"{(hora_inicio_jogo - timedelta(hours=1)).strftime('%H:%M')} → "
+              f"{(hora_inicio_jogo + timedelta(hours=4)).strftime('%H:%M')}")
+
+        # Os tweets passam um a um pelos estágios; só a matriz de contagens fica em memória.
+        # Mesma partida = mesmo checkpoint: retoma uma coleta interrompida
+        # ou busca apenas as respostas novas desde a última execução
+        matriz = executar_pipeline(
+            janelas,
+            perfil=PERFIL_SPFC,
+            id_perfil=id_spfc,
+            cliente=cliente,
+            pasta_data=pasta_data,
+            pasta_checkpoint=pasta_checkpoint
+        )
+
+    cliente.imprimir_metricas()
+
+    # ==================================================
+    # ESTATÍSTICAS
+    # ==================================================
+    print("\n=== Estatísticas por etapa ===")
+    for nome, etapa in [
+        ("Pré-jogo", "pre_jogo"),
+        ("Durante o jogo", "durante_jogo"),
+        ("Pós-jogo", "pos_jogo")
+    ]:
+        total, neutros, perc = estatisticas_tweets(matriz, etapa)
+        print(f"{nome}: {total} tweets | {neutros} neutros ({perc:.1f}%)")
+
+    # ==================================================
+    # AGREGAÇÃO (soma das linhas da matriz por janela)
+    # ==================================================
+    percentuais_etapas = matriz.percentuais_etapas()
+    percentuais_totais = matriz.percentuais()
+    percentuais_engajamento = matriz.percentuais(peso="engajamento")
+
+    total_geral, neutros_geral, perc_neutros_geral = estatisticas_tweets(matriz)
+
+    print("\n=== Estatísticas gerais ===")
+    print(f"Total de tweets: {total_geral}")
+    print(f"Tweets neutros: {neutros_geral} ({perc_neutros_geral:.1f}%)")
+    excedentes = int(matriz.excedentes.sum())
+    if excedentes:
+        print(f"Cópias repetidas além de {DEDUP_MAXIMO_POR_GRUPO} por grupo (fora do peso sem_spam): {excedentes}")
+    if percentuais_engajamento:
+        print(f"Emoção predominante ponderada por engajamento: "
+              f"{max(percentuais_engajamento, key=percentuais_engajamento.get)}")
+
+    salvar_serie_emocoes(matriz, pasta_resultados, data_hora)
+
+    # ==================================================
+    # VISUALIZAÇÃO
+    # ==================================================
+    renderizar_partida({
+        "pasta_resultados": pasta_resultados,
+        "identificador_jogo": data_hora,
+        "percentuais": percentuais_totais,
+        "percentuais_etapas": percentuais_etapas,
+        "serie": matriz.serie_temporal(),
+        "exibir_tabela": True
+    })
+
+    relatar_cache()
+
+    # ==================================================
+    # MÉTRICAS DA EXECUÇÃO
+    # ==================================================
+    imprimir_resumo()
+    salvar_metricas(pasta_resultados, {"cliente_api": cliente.metricas()})
+
+
+# ==================================================
+# EXECUÇÃO EM LOTE (várias partidas, sem input())
+# ==================================================
+def main_lote(caminho_partidas):
+    if not verificar_modelo():
+        exit(1)
+
+    obter_token_api()
+
+    # Valida a tabela antes de acessar a API
+    partidas = ler_partidas(caminho_partidas)
+    reiniciar()
+
+    # Autenticação, sessão e ID do perfil uma única vez para todas as partidas
+    cliente = ClienteAPI()
+    id_spfc = obter_id_usuario(PERFIL_SPFC, cliente)
+
+    executar_lote(
+        partidas,
+        perfil=PERFIL_SPFC,
+        id_perfil=id_spfc,
+        cliente=cliente,
+        nome=os.path.splitext(os.path.basename(caminho_partidas))[0]
+    )
+
+    cliente.imprimir_metricas()
+    relatar_cache()
+    imprimir_resumo()
+
+
+# Protege o pipeline para que workers do pool de inferência ("spawn")
+# possam importar este módulo sem executar a coleta novamente
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Análise de emoções da torcida do SPFC")
+    parser.add_argument(
+        "--ao-vivo",
+        action="store_true",
+        help="Coleta durante a partida e emite cada janela de 15 minutos assim que ela fecha"
+    )
+    parser.add_argument(
+        "--partidas",
+        metavar="ARQUIVO",
+        help="Tabela de partidas (CSV/YAML com adversario, data e hora) para processar em lote"
+    )
+    args = parser.parse_args()
+
+    if args.partidas:
+        main_lote(args.partidas)
+    else:
+        main(ao_vivo=args.ao_vivo)
@@ -1,18 +1,247 @@
 # /src/agregacao.py
 
 from collections import Counter
-from .config import EMOCOES
+import numpy as np
+from .config import (
+    AGREGACAO_FAIXAS_CONFIANCA,
+    AGREGACAO_JANELAS_MOVEIS,
+    DEDUP_MAXIMO_POR_GRUPO,
+    EMOCAO_TO_ID,
+    EMOCOES
+)
+from .janelas import atribuir_janelas_epoch_ms
+from .tabela import SEM_EMOCAO, TabelaTweets
+
+def percentual_emocoes(tweets, sem_spam=False):
+    """
+    Args:
+        tweets: Lista de tweets classificados ou TabelaTweets
+        sem_spam (bool): Conta no máximo DEDUP_MAXIMO_POR_GRUPO cópias de cada
+                         grupo de duplicatas (coluna / chave 'duplicata')
+    """
+    if sem_spam:
+        if isinstance(tweets, TabelaTweets):
+            tweets = tweets.tomar(np.flatnonzero(tweets.duplicata < DEDUP_MAXIMO_POR_GRUPO))
+        else:
+            tweets = [t for t in tweets if t.get("duplicata", 0) < DEDUP_MAXIMO_POR_GRUPO]
 
-def percentual_emocoes(tweets):
     total = len(tweets)
     if total == 0:
         return {}
 
-    contador = Counter([t["emocao"] for t in tweets])
+    # TabelaTweets: contagem direto da coluna de códigos (np.bincount)
+    if isinstance(tweets, TabelaTweets):
+        contador = tweets.contagem_emocoes()
+    else:
+        contador = Counter([t["emocao"] for t in tweets])
 
     percentuais = {
         emo: (contador.get(emo, 0) / total) * 100
         for emo in EMOCOES
     }
 
-    return percentuais
\ No newline at end of file
+    return percentuais
+
+
+class MatrizEmocoes:
+    """
+    Agregação incremental por janela: contagens de emoção em uma matriz
+    NumPy (janelas x emoções x faixas de confiança), com a soma de likes e
+    de retweets nas mesmas células.
+
+    Cada lote soma suas contagens com um np.bincount e não fica guardado.
+    Percentuais por janela, etapa e partida, média móvel, ponderados por
+    engajamento e filtrados por confiança mínima saem da soma de linhas
+    da matriz, sem percorrer os tweets de novo. As cópias além de
+    DEDUP_MAXIMO_POR_GRUPO de um grupo de duplicatas também são
+    somadas à parte (excedentes), para o peso "sem_spam".
+
+    Args:
+        janelas (dict): Resultado de calcular_janelas (uma linha por janela, na mesma ordem)
+        faixas (int): Faixas de confiança de largura 1/faixas. O filtro por confiança
+                      mínima é exato nos limites das faixas (0.1, 0.2... com 10 faixas)
+    """
+
+    PESOS = ("tweets", "engajamento", "likes", "retweets", "sem_spam")
+
+    def __init__(self, janelas, faixas=AGREGACAO_FAIXAS_CONFIANCA):
+        self.janelas = janelas
+        self.lista_janelas = [(etapa, intervalo) for etapa, lista in janelas.items() for intervalo in lista]
+        self.faixas = faixas
+        self._linhas = {(etapa, intervalo[0]): k for k, (etapa, intervalo) in enumerate(self.lista_janelas)}
+
+        forma = (len(self.lista_janelas), len(EMOCAO_TO_ID), faixas)
+        self.contagens = np.zeros(forma, dtype=np.int64)
+        self.likes = np.zeros(forma, dtype=np.int64)
+        self.retweets = np.zeros(forma, dtype=np.int64)
+        self.excedentes = np.zeros(forma, dtype=np.int64)
+
+    # ==================================================
+    # ATUALIZAÇÃO
+    # ==================================================
+    def adicionar_indices(self, indices, tabela):
+        """
+        Soma as linhas da tabela nas janelas indicadas.
+
+        Args:
+            indices (np.ndarray): Janela de cada linha (atribuir_janelas_epoch_ms; -1 = fora)
+            tabela (TabelaTweets): Lote classificado
+        """
+        validos = (np.asarray(indices) >= 0) & (tabela.emocao != SEM_EMOCAO)
+        if not validos.any():
+            return
+
+        # Margem para 0.7 em float32 (0.69999...) cair na faixa de 0.7
+        faixa = np.clip((tabela.confianca[validos] * self.faixas + 1e-4).astype(np.int64), 0, self.faixas - 1)
+        celulas = (np.asarray(indices)[validos] * self.contagens.shape[1] + tabela.emocao[validos]) * self.faixas + faixa
+
+        tamanho = self.contagens.size
+        forma = self.contagens.shape
+        self.contagens += np.bincount(celulas, minlength=tamanho).reshape(forma)
+        self.likes += np.bincount(celulas, weights=tabela.likes[validos], minlength=tamanho).astype(np.int64).reshape(forma)
+        self.retweets += np.bincount(celulas, weights=tabela.retweets[validos], minlength=tamanho).astype(np.int64).reshape(forma)
+
+        excedentes = tabela.duplicata[validos] >= DEDUP_MAXIMO_POR_GRUPO
+        if excedentes.any():
+            self.excedentes += np.bincount(celulas[excedentes], minlength=tamanho).reshape(forma)
+
+    def adicionar_tabela(self, tabela):
+        """
+        Soma um lote com tweets de qualquer janela (atribuídos pelo timestamp).
+        """
+        self.adicionar_indices(atribuir_janelas_epoch_ms(tabela.timestamp_ms, self.janelas), tabela)
+
+    def adicionar_janela(self, etapa, intervalo, tabela):
+        """
+        Soma um lote já separado por janela (como os produzidos por pipeline.atribuir).
+        """
+        self.adicionar_indices(np.full(len(tabela), self._linhas[(etapa, intervalo[0])]), tabela)
+
+    def somar(self, outra):
+        self.contagens += outra.contagens
+        self.likes += outra.likes
+        self.retweets += outra.retweets
+        self.excedentes += outra.excedentes
+
+    # ==================================================
+    # CONSULTAS
+    # ==================================================
+    def linhas(self, peso="tweets", confianca_minima=0.0):
+        """
+        Returns:
+            np.ndarray: Matriz janelas x emoções (colunas nos códigos de EMOCAO_TO_ID).
+                        peso "engajamento" conta cada tweet como 1 + likes + retweets
+                        e "sem_spam" ignora as cópias excedentes de cada grupo
+        """
+        if peso == "tweets":
+            celulas = self.contagens
+        elif peso == "engajamento":
+            celulas = self.contagens + self.likes + self.retweets
+        elif peso == "likes":
+            celulas = self.likes
+        elif peso == "retweets":
+            celulas = self.retweets
+        elif peso == "sem_spam":
+            celulas = self.contagens - self.excedentes
+        else:
+            raise ValueError(f"Peso inválido: {peso} (use um de {', '.join(self.PESOS)})")
+
+        primeira_faixa = int(np.ceil(confianca_minima * self.faixas - 1e-9))
+        return celulas[:, :, primeira_faixa:].sum(axis=2)
+
+    def _indices_etapa(self, etapa):
+        return [k for k, (etapa_k, _) in enumerate(self.lista_janelas) if etapa_k == etapa]
+
+    def contagem(self, etapa=None, peso="tweets", confianca_minima=0.0):
+        """
+        Returns:
+            dict: {emocao: quantidade (ou soma do peso)} da etapa ou da partida inteira
+        """
+        linhas = self.linhas(peso, confianca_minima)
+        if etapa is not None:
+            linhas = linhas[self._indices_etapa(etapa)]
+
+        soma = linhas.sum(axis=0)
+        return {emo: int(soma[EMOCAO_TO_ID[emo]]) for emo in EMOCOES}
+
+    def total(self, etapa=None, confianca_minima=0.0):
+        return sum(self.contagem(etapa, confianca_minima=confianca_minima).values())
+
+    def neutros(self, etapa=None):
+        return self.contagem(etapa)["neutro"]
+
+    def percentuais(self, etapa=None, peso="tweets", confianca_minima=0.0):
+        """
+        Percentuais de cada emoção na etapa (ou na partida inteira, com
+        etapa=None). Com os pesos e filtros padrão, igual a
+        percentual_emocoes dos mesmos tweets.
+        """
+        contagem = self.contagem(etapa, peso, confianca_minima)
+        total = sum(contagem.values())
+        if total == 0:
+            return {}
+
+        return {emo: (contagem[emo] / total) * 100 for emo in EMOCOES}
+
+    def percentuais_etapas(self, peso="tweets", confianca_minima=0.0):
+        return {etapa: self.percentuais(etapa, peso, confianca_minima) for etapa in self.janelas}
+
+    def percentuais_janela(self, k, peso="tweets", confianca_minima=0.0):
+        """
+        Percentuais da k-ésima janela de lista_janelas.
+        """
+        linha = self.linhas(peso, confianca_minima)[k]
+        total = linha.sum()
+        if total == 0:
+            return {}
+
+        return {emo: (linha[EMOCAO_TO_ID[emo]] / total) * 100 for emo in EMOCOES}
+
+    def percentuais_janelas(self, largura=1, peso="tweets", confianca_minima=0.0):
+        """
+        Percentuais de cada janela; com largura > 1, a média móvel das
+        últimas `largura` janelas (soma acumulada das linhas). As janelas
+        das etapas são contínuas no tempo, então a média atravessa as etapas.
+
+        Returns:
+            np.ndarray: janelas x emoções (ordem de EMOCOES), NaN onde não há tweets
+        """
+        linhas = self.linhas(peso, confianca_minima)[:, [EMOCAO_TO_ID[emo] for emo in EMOCOES]].astype(np.float64)
+
+        if largura > 1:
+            acumulado = np.vstack([np.zeros((1, linhas.shape[1])), np.cumsum(linhas, axis=0)])
+            inicio = np.maximum(np.arange(1, len(linhas) + 1) - largura, 0)
+            linhas = acumulado[1:] - acumulado[inicio]
+
+        totais = linhas.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(totais > 0, linhas / totais * 100, np.nan)
+
+    def serie_temporal(self, largura=AGREGACAO_JANELAS_MOVEIS, confianca_minima=0.0):
+        """
+        Série por janela: tweets, percentuais, média móvel e percentuais
+        ponderados por engajamento.
+
+        Returns:
+            pd.DataFrame: Uma linha por janela (inicio, fim, etapa, tweets e colunas por emoção)
+        """
+        import pandas as pd
+
+        tweets = self.linhas("tweets", confianca_minima).sum(axis=1)
+        serie = pd.DataFrame({
+            "inicio": [intervalo[0] for _, intervalo in self.lista_janelas],
+            "fim": [intervalo[1] for _, intervalo in self.lista_janelas],
+            "etapa": [etapa for etapa, _ in self.lista_janelas],
+            "tweets": tweets
+        })
+
+        colunas = {
+            "": self.percentuais_janelas(1, "tweets", confianca_minima),
+            f"_movel{largura}": self.percentuais_janelas(largura, "tweets", confianca_minima),
+            "_engajamento": self.percentuais_janelas(1, "engajamento", confianca_minima)
+        }
+        for sufixo, valores in colunas.items():
+            for j, emo in enumerate(EMOCOES):
+                serie[f"{emo}{sufixo}"] = valores[:, j].round(2)
+
+        return serie
@@ -1,58 +1,81 @@
 # /src/analise_emocoes.py
 
-import torch
-import unicodedata
 import os
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from .config import MODELO_PATH, ID_TO_EMOCAO, MAX_LEN
+import threading
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from .backends import carregar_backend, pasta_backend
+from .cache import obter_cache
+from .cascata import resolver_primeiro_estagio
+from .metricas import medir
+from .normalizacao import normalizar_texto, normalizar_textos, remover_acentos  # remover_acentos: compatibilidade
+from .config import (
+    EMOCAO_TO_ID,
+    ID_TO_EMOCAO,
+    MAX_LEN,
+    INFERENCIA_BATCH_SIZE,
+    INFERENCIA_MAX_TOKENS,
+    INFERENCIA_PROCESSOS,
+    INFERENCIA_THREADS_POR_PROCESSO,
+    INFERENCIA_TAMANHO_SHARD,
+    INFERENCIA_BACKEND
+)
 
 
 # ==================================================
 # CARREGAMENTO DO MODELO FINE-TUNING
 # ==================================================
 
-def carregar_modelo():
-    """
-    Carrega o modelo BERTimbau fine-tuning.
-    O modelo deve estar salvo em MODELO_PATH/final
-    """
-    model_dir = os.path.join(MODELO_PATH, "final")
+# torch, transformers e onnxruntime são importados dentro dos backends: importar
+# este módulo (ou o pacote) não deve custar segundos quando nada será classificado.
 
-    if not os.path.exists(model_dir):
-        raise RuntimeError(
-            f"Modelo não encontrado em {model_dir}. "
-            "Execute primeiro o fine-tuning com src/fine_tuning.py"
-        )
+def carregar_modelo(backend=INFERENCIA_BACKEND):
+    """
+    Carrega o modelo BERTimbau fine-tuning no backend escolhido.
+    O modelo deve estar salvo em MODELO_PATH/final (e convertido com
+    src/conversao.py para os backends "int8" e "onnx").
 
-    print(f"[INFO] Carregando modelo de: {model_dir}")
+    Args:
+        backend (str): "pytorch", "int8", "onnx" ou "aluno"
 
-    tokenizer = AutoTokenizer.from_pretrained(model_dir)
-    model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+    Returns:
+        Backend com tokenizer e probabilidades(entradas)
+    """
+    print(f"[INFO] Carregando modelo de: {pasta_backend(backend)}")
 
-    # Configura para modo de avaliação
-    model.eval()
+    modelo = carregar_backend(backend)
 
-    # Verifica dispositivo disponível
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model.to(device)
+    print(f"[INFO] Modelo carregado (backend: {modelo.nome})")
 
-    print(f"[INFO] Modelo carregado em: {device}")
+    return modelo
 
-    return tokenizer, model, device
 
+_modelo = None
+_trava_modelo = threading.Lock()
 
-# Carrega o modelo uma única vez
-tokenizer, model, device = carregar_modelo()
+# Uma classificação por vez no modelo do processo: o tokenizer rápido não
+# aceita chamadas concorrentes e cada lote já usa todos os núcleos
+_trava_inferencia = threading.Lock()
 
 
-def remover_acentos(texto):
+def obter_modelo():
     """
-    Remove acentos para padronizar texto.
+    Retorna o modelo carregado, carregando-o na primeira chamada.
+    Seguro para uso com várias threads: o modelo é carregado uma única vez.
+
+    Returns:
+        Backend carregado por carregar_modelo
     """
-    return "".join(
-        c for c in unicodedata.normalize("NFD", texto)
-        if unicodedata.category(c) != "Mn"
-    )
+    global _modelo
+
+    if _modelo is None:
+        with _trava_modelo:
+            if _modelo is None:
+                _modelo = carregar_modelo()
+
+    return _modelo
 
 
 def classificar_emocao(texto):
@@ -68,28 +91,28 @@ def classificar_emocao(texto):
     if not texto or not texto.strip():
         return "neutro", 0.0
 
+    modelo = obter_modelo()
+
     # Pré-processamento
-    texto = remover_acentos(texto.lower())
+    texto = normalizar_texto(texto)
 
     try:
         # Tokeniza o texto
-        inputs = tokenizer(
+        inputs = modelo.tokenizer(
             texto,
             truncation=True,
             padding="max_length",
             max_length=MAX_LEN,
-            return_tensors="pt"
-        ).to(device)
+            return_tensors="np"
+        )
 
         # Faz a predição
-        with torch.no_grad():
-            outputs = model(**inputs)
-            probabilities = torch.softmax(outputs.logits, dim=-1)
-            prediction = torch.argmax(probabilities, dim=-1)
-            confidence = probabilities[0][prediction[0]].item()
+        probabilities = modelo.probabilidades(dict(inputs))[0]
+        prediction = int(probabilities.argmax())
+        confidence = float(probabilities[prediction])
 
         # Converte ID para emoção
-        emocao = ID_TO_EMOCAO[prediction[0].item()]
+        emocao = ID_TO_EMOCAO[prediction]
 
         return emocao, confidence
 
@@ -98,24 +121,339 @@ def classificar_emocao(texto):
         return "neutro", 0.0
 
 
-def analisar_tweets(tweets):
+# ==================================================
+# INFERÊNCIA EM LOTE
+# ==================================================
+
+def montar_lotes(comprimentos, batch_size=INFERENCIA_BATCH_SIZE, max_tokens=INFERENCIA_MAX_TOKENS):
+    """
+    Agrupa os índices dos textos em micro-batches de comprimento parecido.
+
+    Os textos são ordenados pelo número de tokens e empacotados enquanto
+    o lote respeitar o batch_size e o orçamento de tokens
+    (quantidade de textos x maior sequência do lote).
+
+    Args:
+        comprimentos (list): Número de tokens de cada texto
+        batch_size (int): Quantidade máxima de textos por lote
+        max_tokens (int): Orçamento de tokens por lote (após o padding)
+
+    Returns:
+        list: Lista de lotes, cada um com os índices originais dos textos
+    """
+    ordem = sorted(range(len(comprimentos)), key=lambda i: comprimentos[i])
+
+    lotes = []
+    lote_atual = []
+
+    for i in ordem:
+        # Como a ordem é crescente, o texto atual é o maior do lote
+        excede_tokens = comprimentos[i] * (len(lote_atual) + 1) > max_tokens
+
+        if lote_atual and (len(lote_atual) >= batch_size or excede_tokens):
+            lotes.append(lote_atual)
+            lote_atual = []
+
+        lote_atual.append(i)
+
+    if lote_atual:
+        lotes.append(lote_atual)
+
+    return lotes
+
+
+def classificar_emocoes(
+        textos,
+        batch_size=INFERENCIA_BATCH_SIZE,
+        max_tokens=INFERENCIA_MAX_TOKENS,
+        probabilidades=False,
+        modelo=None
+):
+    """
+    Classifica uma lista de textos em micro-batches com padding dinâmico.
+
+    Cada texto é tokenizado uma única vez, sem padding. Os textos são
+    agrupados por comprimento (montar_lotes) e cada lote recebe padding
+    apenas até a maior sequência dele.
+
+    Args:
+        textos (list): Textos dos tweets já limpos
+        batch_size (int): Quantidade máxima de textos por lote
+        max_tokens (int): Orçamento de tokens por lote
+        probabilidades (bool): Se True, inclui o vetor de probabilidades
+                               (None para textos que não passaram pelo modelo)
+        modelo: Backend a usar. Se None, usa o modelo do processo (obter_modelo)
+
+    Returns:
+        list: Lista de tuplas (emocao, confianca) ou
+              (emocao, confianca, probabilidades) na ordem original
+    """
+    padrao = ("neutro", 0.0, None) if probabilidades else ("neutro", 0.0)
+    resultados = [padrao] * len(textos)
+
+    # Textos vazios continuam sendo neutros, sem passar pelo modelo
+    indices_validos = [i for i, texto in enumerate(textos) if texto and texto.strip()]
+    if not indices_validos:
+        return resultados
+
+    if modelo is None:
+        modelo = obter_modelo()
+
+    with _trava_inferencia:
+        _classificar_lotes(modelo, textos, indices_validos, resultados, batch_size, max_tokens, probabilidades)
+
+    return resultados
+
+
+def _classificar_lotes(modelo, textos, indices_validos, resultados, batch_size, max_tokens, probabilidades):
+    # Pré-processamento e tokenização de todos os textos de uma vez
+    with medir("inferencia.normalizacao", itens=len(indices_validos)):
+        textos_proc = normalizar_textos(textos[i] for i in indices_validos)
+    with medir("inferencia.tokenizacao", itens=len(textos_proc)):
+        codificacao = modelo.tokenizer(textos_proc, truncation=True, max_length=MAX_LEN)
+
+    comprimentos = [len(ids) for ids in codificacao["input_ids"]]
+    chaves = list(codificacao.keys())
+
+    for lote in montar_lotes(comprimentos, batch_size, max_tokens):
+        try:
+            exemplos = [{k: codificacao[k][j] for k in chaves} for j in lote]
+            inputs = modelo.tokenizer.pad(exemplos, return_tensors="np")
+
+            with medir("inferencia.forward", itens=len(lote)):
+                probabilities = modelo.probabilidades(dict(inputs))
+            predictions = probabilities.argmax(axis=-1)
+            confidences = probabilities.max(axis=-1)
+
+            for j, pred, conf, probs in zip(
+                    lote,
+                    predictions.tolist(),
+                    confidences.tolist(),
+                    probabilities.tolist()
+            ):
+                if probabilidades:
+                    resultados[indices_validos[j]] = (ID_TO_EMOCAO[pred], conf, probs)
+                else:
+                    resultados[indices_validos[j]] = (ID_TO_EMOCAO[pred], conf)
+
+        except Exception as e:
+            print(f"[ERRO] Falha na classificação do lote: {e}")
+
+
+# ==================================================
+# POOL DE PROCESSOS (CPU)
+# ==================================================
+
+def _inicializar_worker(threads_por_processo):
+    """
+    Executado uma vez em cada worker do pool:
+    carrega o modelo e fixa o número de threads do backend.
+    """
+    obter_modelo().definir_threads(threads_por_processo)
+    print(f"[INFO] Worker {os.getpid()} pronto ({threads_por_processo} threads)")
+
+
+def _classificar_shard(textos, probabilidades=False):
+    return classificar_emocoes(textos, probabilidades=probabilidades)
+
+
+def criar_pool_inferencia(num_processos=INFERENCIA_PROCESSOS, threads_por_processo=INFERENCIA_THREADS_POR_PROCESSO):
+    """
+    Cria um pool de processos em que cada worker carrega o modelo
+    de MODELO_PATH/final uma única vez.
+
+    Args:
+        num_processos (int): Quantidade de workers
+        threads_por_processo (int): Threads de inferência em cada worker.
+                                    Se None, divide os núcleos entre os workers.
+
+    Returns:
+        ProcessPoolExecutor: Pool pronto para classificar_emocoes_pool
+    """
+    if threads_por_processo is None:
+        threads_por_processo = max(1, (os.cpu_count() or 1) // num_processos)
+
+    # "spawn" evita herdar o estado de threads do torch do processo pai
+    contexto = multiprocessing.get_context("spawn")
+
+    return ProcessPoolExecutor(
+        max_workers=num_processos,
+        mp_context=contexto,
+        initializer=_inicializar_worker,
+        initargs=(threads_por_processo,)
+    )
+
+
+def classificar_emocoes_pool(textos, pool, tamanho_shard=INFERENCIA_TAMANHO_SHARD, probabilidades=False):
+    """
+    Divide os textos em shards e classifica cada shard em um worker do pool.
+    Os resultados voltam conforme os shards terminam e são juntados na ordem original.
+
+    Args:
+        textos (list): Textos dos tweets já limpos
+        pool (ProcessPoolExecutor): Pool criado por criar_pool_inferencia
+        tamanho_shard (int): Quantidade de textos por tarefa
+        probabilidades (bool): Se True, inclui o vetor de probabilidades
+
+    Returns:
+        list: Lista de tuplas (emocao, confianca[, probabilidades]) na ordem original
+    """
+    shards = [textos[i:i + tamanho_shard] for i in range(0, len(textos), tamanho_shard)]
+    tarefa = partial(_classificar_shard, probabilidades=probabilidades)
+
+    resultados = []
+    with medir("inferencia.pool", itens=len(textos)):
+        for parcial in pool.map(tarefa, shards):
+            resultados.extend(parcial)
+
+    return resultados
+
+
+def _classificar_textos(textos, num_processos, threads_por_processo, pool, deduplicador=None):
+    """
+    Classifica textos já limpos: agrupa as duplicatas (src/deduplicacao.py),
+    deduplica textos iguais, usa o cache e passa antes pelo primeiro estágio
+    da cascata (src/cascata.py).
+
+    Args:
+        textos: Sequência indexável de textos (lista ou ColunaTexto)
+        deduplicador (Deduplicador): Índice de grupos da execução. Se None,
+                                     cada texto distinto é classificado
+
+    Returns:
+        tuple: (resultados, ordens) - tuplas (emocao, confianca) na ordem dos
+               textos e a ordem de cada cópia no seu grupo (np.int32)
+    """
+    resultados = [("neutro", 0.0)] * len(textos)
+    ordens = np.zeros(len(textos), dtype=np.int32)
+
+    # Textos vazios são neutros e não passam pelo cache nem pelo modelo
+    validos = [(i, texto) for i, texto in enumerate(textos) if texto and texto.strip()]
+    indices = [i for i, _ in validos]
+    normalizados = normalizar_textos(texto for _, texto in validos)
+
+    # Duplicatas: cada texto é trocado pelo representante do grupo,
+    # e grupos já classificados em lotes anteriores não voltam ao modelo
+    conhecidos = {}
+    if deduplicador is not None and normalizados:
+        normalizados, ordem = deduplicador.agrupar(normalizados)
+        ordens[indices] = ordem
+        conhecidos = deduplicador.rotulos
+
+    # Textos iguais são classificados uma única vez
+    pendentes = {}
+    for pos, texto in enumerate(normalizados):
+        if texto in conhecidos:
+            resultados[indices[pos]] = conhecidos[texto]
+        else:
+            pendentes.setdefault(texto, []).append(indices[pos])
+
+    cache = obter_cache()
+    if cache and pendentes:
+        chaves = list(pendentes)
+        for pos, (emocao, confianca, _) in cache.buscar(chaves).items():
+            for i in pendentes.pop(chaves[pos]):
+                resultados[i] = (emocao, confianca)
+            if deduplicador is not None:
+                deduplicador.rotulos[chaves[pos]] = (emocao, confianca)
+
+    # Cascata: o primeiro estágio resolve os textos em que tem confiança
+    # suficiente e só o restante passa pelo BERTimbau
+    unicos, resolvidos = resolver_primeiro_estagio(list(pendentes))
+    for texto, resultado in resolvidos.items():
+        for i in pendentes[texto]:
+            resultados[i] = resultado
+
+    if pool is not None and unicos:
+        novos = classificar_emocoes_pool(unicos, pool, probabilidades=True)
+    elif num_processos > 1 and unicos:
+        with criar_pool_inferencia(num_processos, threads_por_processo) as pool:
+            novos = classificar_emocoes_pool(unicos, pool, probabilidades=True)
+    else:
+        novos = classificar_emocoes(unicos, probabilidades=True)
+
+    for texto, (emocao, confianca, _) in zip(unicos, novos):
+        for i in pendentes[texto]:
+            resultados[i] = (emocao, confianca)
+
+    if deduplicador is not None:
+        # Lotes que falharam (sem probabilidades) voltam ao modelo no próximo membro do grupo
+        deduplicador.rotulos.update(resolvidos)
+        deduplicador.rotulos.update(
+            (texto, (emocao, confianca)) for texto, (emocao, confianca, probs) in zip(unicos, novos)
+            if probs is not None
+        )
+
+    if cache:
+        # Lotes que falharam (sem probabilidades) não entram no cache
+        validos = [(t, r) for t, r in zip(unicos, novos) if r[2] is not None]
+        cache.guardar([t for t, _ in validos], [r for _, r in validos])
+
+    return resultados, ordens
+
+
+def analisar_tweets(
+        tweets,
+        num_processos=INFERENCIA_PROCESSOS,
+        threads_por_processo=INFERENCIA_THREADS_POR_PROCESSO,
+        pool=None,
+        deduplicador=None
+):
     """
     Aplica análise de emoções a uma lista de tweets.
     Mantém a mesma interface do código original.
 
     Args:
         tweets (list): Lista de dicionários com os tweets
+        num_processos (int): Se maior que 1, classifica em um pool de processos
+        threads_por_processo (int): Threads de inferência em cada worker do pool
+        pool (ProcessPoolExecutor): Pool já criado (criar_pool_inferencia), reaproveitado
+                                    entre chamadas. Se informado, ignora num_processos
+        deduplicador (Deduplicador): Grupos de duplicatas compartilhados entre
+                                     chamadas (criar_deduplicador). Se None, sem
+                                     grupos: cada texto distinto é classificado
 
     Returns:
         list: Mesma lista com as chaves 'emocao' e 'confianca' adicionadas
     """
-    for tweet in tweets:
-        emocao, confianca = classificar_emocao(tweet["texto_limpo"])
+    with medir("inferencia.classificacao", itens=len(tweets)):
+        resultados, _ = _classificar_textos(
+            [tweet["texto_limpo"] for tweet in tweets], num_processos, threads_por_processo, pool, deduplicador
+        )
+
+    for tweet, (emocao, confianca) in zip(tweets, resultados):
         tweet["emocao"] = emocao
         tweet["confianca"] = confianca
 
     return tweets
 
 
+def analisar_tabela(
+        tabela,
+        num_processos=INFERENCIA_PROCESSOS,
+        threads_por_processo=INFERENCIA_THREADS_POR_PROCESSO,
+        pool=None,
+        deduplicador=None
+):
+    """
+    Mesmo que analisar_tweets para uma TabelaTweets: lê a coluna
+    texto_limpo e preenche as colunas emocao (códigos), confianca e
+    duplicata (ordem da cópia no grupo de duplicatas; zeros sem deduplicador).
+
+    Returns:
+        TabelaTweets: A mesma tabela, classificada
+    """
+    with medir("inferencia.classificacao", itens=len(tabela)):
+        resultados, ordens = _classificar_textos(
+            tabela.texto_limpo, num_processos, threads_por_processo, pool, deduplicador
+        )
+
+    tabela.emocao[:] = [EMOCAO_TO_ID[emocao] for emocao, _ in resultados]
+    tabela.confianca[:] = [confianca for _, confianca in resultados]
+    tabela.duplicata[:] = ordens
+
+    return tabela
+
+
 # Função de compatibilidade
 analyzer = None  # Mantido para compatibilidade, mas não usado
\ No newline at end of file
@@ -0,0 +1,301 @@
+# /src/ao_vivo.py
+
+"""
+Modo ao vivo: coleta, classifica e agrega as respostas durante a partida.
+
+Três estágios rodam ao mesmo tempo, ligados por filas limitadas:
+
+    coleta (passadas incrementais com since_id)
+        -> fila -> classificação (analisar_tabela, cache + lotes)
+        -> fila -> emissão (percentuais e CSV/Parquet de cada janela)
+
+Enquanto a coleta espera a API (latência e rate limit), o lote anterior
+está sendo classificado. Cada janela de 15 minutos é emitida assim que
+uma passada de coleta cobre o seu fim, sem esperar o fim da partida.
+Os lotes trafegam entre os estágios como TabelaTweets (colunar).
+"""
+
+import queue
+import threading
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from .agregacao import MatrizEmocoes
+from .analise_emocoes import analisar_tabela, criar_pool_inferencia, obter_modelo
+from .deduplicacao import criar_deduplicador
+from .checkpoint import CheckpointColeta
+from .coleta import BASE_URL, coletar_passada, iso_utc
+from .config import (
+    COLETA_THREADS,
+    INFERENCIA_PROCESSOS,
+    AO_VIVO_INTERVALO,
+    AO_VIVO_ATRASO_API,
+    AO_VIVO_TAMANHO_FILA
+)
+from .janelas import atribuir_janelas_epoch_ms
+from .tabela import TabelaTweets
+from .utils import salvar_janela
+
+# Marca o fim do fluxo entre os estágios
+FIM = None
+
+
+# ==================================================
+# ESTÁGIO 1: COLETA
+# ==================================================
+def _coletar(
+        checkpoint,
+        perfil,
+        id_perfil,
+        janela,
+        cliente,
+        saida,
+        parar,
+        erros,
+        intervalo,
+        atraso_api,
+        max_threads,
+        base_url
+):
+    """
+    Faz passadas de coleta até cobrir todo o intervalo (ou até `parar`).
+    Cada passada envia à fila (TabelaTweets com as respostas novas,
+    instante coberto); a fila
+    limitada segura a coleta se a classificação ficar para trás.
+    """
+    inicio, fim = janela
+    inicio_iso = iso_utc(inicio)
+    posicao = 0
+
+    try:
+        while not parar.is_set():
+            # A API não aceita end_time no futuro (nem muito próximo de agora)
+            agora = datetime.now(timezone.utc).replace(microsecond=0)
+            coberto = min(fim, agora - timedelta(seconds=atraso_api))
+
+            if coberto > inicio:
+                incompletas = coletar_passada(
+                    checkpoint, perfil, id_perfil, inicio_iso, iso_utc(coberto),
+                    cliente, max_threads, base_url
+                )
+                novas, posicao = checkpoint.respostas_desde(posicao)
+                novas = TabelaTweets.de_dicts(novas, janela=inicio)
+
+                if incompletas:
+                    # O instante não é dado como coberto: as janelas esperam a próxima passada
+                    print(f"[ERRO] {incompletas} paginações incompletas; nova tentativa na próxima passada")
+                    saida.put((novas, None))
+                else:
+                    saida.put((novas, coberto))
+                    if coberto >= fim:
+                        break
+
+            parar.wait(intervalo)
+
+    except Exception as e:
+        erros.append(e)
+        parar.set()
+
+    finally:
+        saida.put(FIM)
+
+
+# ==================================================
+# ESTÁGIO 2: CLASSIFICAÇÃO
+# ==================================================
+def _classificar(entrada, saida, parar, erros):
+    """
+    Classifica cada lote vindo da coleta e repassa para a emissão.
+    """
+    pool = None
+    deduplicador = criar_deduplicador()
+
+    try:
+        # Carrega o modelo enquanto a primeira passada de coleta ainda está na API
+        if INFERENCIA_PROCESSOS > 1:
+            pool = criar_pool_inferencia()
+        else:
+            obter_modelo()
+
+        while True:
+            item = entrada.get()
+            if item is FIM:
+                break
+            if erros:
+                # Após uma falha, apenas esvazia a fila para a coleta não travar
+                continue
+
+            tabela, coberto = item
+            if len(tabela):
+                analisar_tabela(tabela, pool=pool, deduplicador=deduplicador)
+            saida.put((tabela, coberto))
+
+    except Exception as e:
+        erros.append(e)
+        parar.set()
+        while entrada.get() is not FIM:
+            pass
+
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        saida.put(FIM)
+
+
+# ==================================================
+# ESTÁGIO 3: EMISSÃO POR JANELA
+# ==================================================
+def _emitir_janela(etapa, intervalo, partes, percentuais, pasta_data, ao_fechar_janela, situacao="fechada"):
+    """
+    Junta os lotes recebidos para a janela em uma única tabela e a emite.
+    A lista `partes` passa a conter só a tabela juntada, para que uma
+    nova emissão da mesma janela não repita a concatenação. Os percentuais
+    vêm da linha da janela na MatrizEmocoes.
+    """
+    inicio_j, fim_j = intervalo
+    tweets_j = TabelaTweets.concatenar(partes)
+    partes[:] = [tweets_j]
+
+    salvar_janela(tweets_j, pasta_data, etapa, inicio_j)
+
+    predominante = max(percentuais, key=percentuais.get) if percentuais else "-"
+    mensagem = (
+        f"[INFO] Janela {etapa} {inicio_j.strftime('%H:%M')} → {fim_j.strftime('%H:%M')} "
+        f"{situacao}: {len(tweets_j)} tweets | predominante: {predominante}"
+    )
+
+    # Latência da emissão em relação ao fechamento real da janela
+    atraso = (datetime.now(timezone.utc) - fim_j).total_seconds()
+    if atraso >= 0:
+        mensagem += f" | {atraso:.0f}s após o fim"
+    print(mensagem)
+
+    if ao_fechar_janela:
+        ao_fechar_janela(etapa, intervalo, tweets_j, percentuais)
+
+
+def executar_ao_vivo(
+        janelas,
+        perfil,
+        id_perfil,
+        cliente,
+        pasta_data,
+        pasta_checkpoint=None,
+        ao_fechar_janela=None,
+        parar=None,
+        intervalo=AO_VIVO_INTERVALO,
+        atraso_api=AO_VIVO_ATRASO_API,
+        tamanho_fila=AO_VIVO_TAMANHO_FILA,
+        max_threads=COLETA_THREADS,
+        base_url=BASE_URL,
+        matriz=None
+):
+    """
+    Executa a coleta contínua durante a partida, emitindo cada janela
+    (percentuais de emoção e CSV/Parquet, conforme FORMATO_SAIDA) assim que ela fecha.
+
+    Tweets que chegam atrasados para uma janela já emitida fazem a janela
+    ser emitida de novo (arquivos regravados). Ctrl+C encerra a coleta e emite
+    o que já foi classificado.
+
+    Args:
+        janelas (dict): Resultado de calcular_janelas
+        perfil (str): Username do clube
+        id_perfil (str): ID do perfil do clube
+        cliente (ClienteAPI): Cliente compartilhado da execução
+        pasta_data (str): Pasta onde os dados das janelas são gravados
+        pasta_checkpoint (str): Pasta do checkpoint da partida (retomada). Se None, só em memória
+        ao_fechar_janela (callable): Chamado com (etapa, intervalo, TabelaTweets, percentuais) a cada emissão
+        parar (threading.Event): Evento para encerrar a coleta de fora
+        intervalo (float): Segundos entre passadas de coleta
+        atraso_api (float): Distância (s) entre o end_time das passadas e o instante atual
+        tamanho_fila (int): Lotes que podem aguardar entre os estágios
+        max_threads (int): Conversas coletadas ao mesmo tempo em cada passada
+        base_url (str): Endpoint de busca
+        matriz (MatrizEmocoes): Agregação por janela atualizada a cada lote. Se None, criada internamente
+
+    Returns:
+        dict: {"pre_jogo": [(intervalo, TabelaTweets), ...], ...} (mesmo formato de agrupar_por_janela)
+    """
+    lista_janelas = [(etapa, intervalo_j) for etapa, lista in janelas.items() for intervalo_j in lista]
+    janela_coleta = (lista_janelas[0][1][0], lista_janelas[-1][1][1])
+
+    checkpoint = CheckpointColeta(pasta_checkpoint, tuple(iso_utc(t) for t in janela_coleta))
+
+    parar = parar or threading.Event()
+    erros = []
+    fila_coleta = queue.Queue(maxsize=tamanho_fila)
+    fila_saida = queue.Queue(maxsize=tamanho_fila)
+
+    estagios = [
+        threading.Thread(
+            target=_coletar,
+            args=(checkpoint, perfil, id_perfil, janela_coleta, cliente, fila_coleta, parar, erros,
+                  intervalo, atraso_api, max_threads, base_url),
+            name="ao_vivo_coleta",
+            daemon=True
+        ),
+        threading.Thread(
+            target=_classificar,
+            args=(fila_coleta, fila_saida, parar, erros),
+            name="ao_vivo_classificacao",
+            daemon=True
+        )
+    ]
+    for estagio in estagios:
+        estagio.start()
+
+    matriz = matriz if matriz is not None else MatrizEmocoes(janelas)
+    por_janela = [[] for _ in lista_janelas]
+    emitidas = [False] * len(lista_janelas)
+
+    print(f"\n[INFO] Modo ao vivo: passadas a cada {intervalo:.0f}s (Ctrl+C para encerrar)")
+
+    while True:
+        try:
+            item = fila_saida.get()
+        except KeyboardInterrupt:
+            print("\n[INFO] Encerrando o modo ao vivo...")
+            parar.set()
+            continue
+
+        if item is FIM:
+            break
+
+        tabela, coberto = item
+        alteradas = set()
+
+        if len(tabela):
+            indices = atribuir_janelas_epoch_ms(tabela.timestamp_ms, janelas)
+            matriz.adicionar_indices(indices, tabela)
+            for k in np.unique(indices[indices >= 0]).tolist():
+                por_janela[k].append(tabela.tomar(np.flatnonzero(indices == k)))
+                alteradas.add(k)
+
+        for k, (etapa, intervalo_j) in enumerate(lista_janelas):
+            if emitidas[k]:
+                if k in alteradas:
+                    _emitir_janela(etapa, intervalo_j, por_janela[k], matriz.percentuais_janela(k),
+                                   pasta_data, ao_fechar_janela, situacao="atualizada")
+            elif coberto is not None and intervalo_j[1] <= coberto:
+                _emitir_janela(etapa, intervalo_j, por_janela[k], matriz.percentuais_janela(k),
+                               pasta_data, ao_fechar_janela)
+                emitidas[k] = True
+
+    for estagio in estagios:
+        estagio.join()
+    checkpoint.fechar()
+
+    if erros:
+        raise RuntimeError(f"Modo ao vivo interrompido: {erros[0]}") from erros[0]
+
+    # Encerrado antes do fim da partida: janelas abertas são emitidas com o que foi coletado
+    for k, (etapa, intervalo_j) in enumerate(lista_janelas):
+        if not emitidas[k] and por_janela[k]:
+            _emitir_janela(etapa, intervalo_j, por_janela[k], matriz.percentuais_janela(k),
+                           pasta_data, ao_fechar_janela, situacao="parcial")
+
+    grupos = {etapa: [] for etapa in janelas}
+    for k, (etapa, intervalo_j) in enumerate(lista_janelas):
+        grupos[etapa].append((intervalo_j, TabelaTweets.concatenar(por_janela[k], janela=janela_coleta[0])))
+
+    return grupos
@@ -0,0 +1,230 @@
+# /src/backends.py
+
+"""
+Backends de inferência do classificador de emoções.
+
+- "pytorch": modelo fp32 salvo em MODELO_PATH/final
+- "int8": quantização dinâmica int8 das camadas Linear (PyTorch, CPU)
+- "onnx": modelo exportado para ONNX e executado com o onnxruntime
+- "aluno": modelo menor destilado do fp32, salvo em MODELO_PATH/aluno
+
+Os artefatos de "int8" e "onnx" são gerados a partir de MODELO_PATH/final
+com `python -m src.conversao` e o "aluno" com `python -m src.destilacao`. Todos os backends recebem as entradas já
+tokenizadas (arrays NumPy) e devolvem a matriz de probabilidades.
+"""
+
+import json
+import os
+import numpy as np
+from .cache import impressao_modelo
+from .config import MODELO_PATH
+
+BACKENDS = ("pytorch", "int8", "onnx", "aluno")
+
+ARQUIVO_INT8 = "modelo_int8.pt"
+ARQUIVO_ONNX = "modelo.onnx"
+ARQUIVO_ORIGEM = "origem.json"
+
+
+def pasta_backend(backend):
+    """
+    Pasta com os arquivos do backend informado.
+    """
+    if backend == "pytorch":
+        return os.path.join(MODELO_PATH, "final")
+    return os.path.join(MODELO_PATH, backend)
+
+
+def softmax(logits):
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def quantizar_int8(model):
+    """
+    Aplica quantização dinâmica int8 nas camadas Linear do modelo.
+    """
+    import torch
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def verificar_origem(pasta):
+    """
+    Garante que o artefato convertido corresponde ao modelo atual em final/.
+    """
+    caminho = os.path.join(pasta, ARQUIVO_ORIGEM)
+    if not os.path.exists(caminho):
+        raise RuntimeError(
+            f"Artefato não encontrado em {pasta}. "
+            "Execute primeiro a conversão com: python -m src.conversao"
+        )
+
+    with open(caminho, encoding="utf-8") as f:
+        origem = json.load(f)
+
+    if origem.get("impressao") != impressao_modelo(pasta_backend("pytorch")):
+        raise RuntimeError(
+            f"Artefato em {pasta} foi gerado de um modelo anterior. "
+            "Execute novamente: python -m src.conversao"
+        )
+
+
+# ==================================================
+# PYTORCH (fp32 e int8)
+# ==================================================
+class BackendPytorch:
+    """
+    Modelo transformers executado no PyTorch (GPU se disponível).
+    """
+
+    nome = "pytorch"
+
+    def __init__(self, model_dir):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_dir)
+        self.model.eval()
+
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model.to(self.device)
+
+    def definir_threads(self, threads):
+        import torch
+
+        torch.set_num_threads(threads)
+
+    def probabilidades(self, entradas):
+        """
+        Args:
+            entradas (dict): input_ids, attention_mask, ... como arrays NumPy
+
+        Returns:
+            np.ndarray: Probabilidades (n_textos x n_emoções)
+        """
+        import torch
+
+        tensores = {k: torch.as_tensor(v).to(self.device) for k, v in entradas.items()}
+
+        with torch.inference_mode():
+            logits = self.model(**tensores).logits
+
+        return torch.softmax(logits.float(), dim=-1).cpu().numpy()
+
+
+class BackendInt8(BackendPytorch):
+    """
+    Modelo com quantização dinâmica int8 (somente CPU).
+    """
+
+    nome = "int8"
+
+    def __init__(self, model_dir):
+        import torch
+        from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+        verificar_origem(model_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        config = AutoConfig.from_pretrained(model_dir)
+        model = quantizar_int8(AutoModelForSequenceClassification.from_config(config).eval())
+
+        # Pesos quantizados gerados por src.conversao (só o state_dict)
+        estado = torch.load(os.path.join(model_dir, ARQUIVO_INT8), weights_only=True)
+        model.load_state_dict(estado)
+
+        self.model = model.eval()
+        self.device = torch.device("cpu")
+
+
+class BackendAluno(BackendPytorch):
+    """
+    Modelo aluno (src/destilacao.py): mesmo formato transformers, menos camadas.
+    """
+
+    nome = "aluno"
+
+
+# ==================================================
+# ONNX RUNTIME
+# ==================================================
+class BackendOnnx:
+    """
+    Modelo exportado para ONNX, executado com o onnxruntime na CPU.
+    """
+
+    nome = "onnx"
+
+    def __init__(self, model_dir, threads=None):
+        from transformers import AutoTokenizer
+
+        verificar_origem(model_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.caminho = os.path.join(model_dir, ARQUIVO_ONNX)
+        self.definir_threads(threads)
+
+    def definir_threads(self, threads):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("Backend 'onnx' requer o pacote onnxruntime (pip install onnxruntime)")
+
+        opcoes = ort.SessionOptions()
+        opcoes.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            opcoes.intra_op_num_threads = threads
+
+        self.sessao = ort.InferenceSession(
+            self.caminho,
+            opcoes,
+            providers=["CPUExecutionProvider"]
+        )
+        self.nomes_entrada = {entrada.name for entrada in self.sessao.get_inputs()}
+
+    def probabilidades(self, entradas):
+        feed = {
+            k: np.asarray(v, dtype=np.int64)
+            for k, v in entradas.items()
+            if k in self.nomes_entrada
+        }
+        logits = self.sessao.run(None, feed)[0]
+        return softmax(logits)
+
+
+def carregar_backend(backend):
+    """
+    Carrega o backend de inferência a partir da sua pasta de artefatos.
+
+    Args:
+        backend (str): "pytorch", "int8", "onnx" ou "aluno"
+
+    Returns:
+        objeto com tokenizer, probabilidades(entradas) e definir_threads(n)
+    """
+    classes = {
+        "pytorch": BackendPytorch,
+        "int8": BackendInt8,
+        "onnx": BackendOnnx,
+        "aluno": BackendAluno
+    }
+
+    if backend not in classes:
+        raise ValueError(f"Backend desconhecido: {backend}. Opções: {', '.join(BACKENDS)}")
+
+    model_dir = pasta_backend(backend)
+    if not os.path.exists(model_dir):
+        raise RuntimeError(
+            f"Modelo não encontrado em {model_dir}. "
+            "Execute primeiro o fine-tuning com src/fine_tuning.py"
+            + {
+                "pytorch": "",
+                "aluno": " e a destilação com src/destilacao.py"
+            }.get(backend, " e a conversão com src/conversao.py")
+        )
+
+    return classes[backend](model_dir)
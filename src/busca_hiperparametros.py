@@ -0,0 +1,388 @@
+# /src/busca_hiperparametros.py
+
+"""
+Busca de hiperparâmetros do fine-tuning em paralelo na CPU.
+
+Sorteia BUSCA_TENTATIVAS configurações de BUSCA_ESPACO (learning_rate,
+batch_size, epochs, warmup_ratio, weight_decay, max_len) e treina cada uma
+com treinar_modelo em um pool de processos:
+
+- cada tentativa roda com um orçamento fixo de threads do torch
+  (BUSCA_THREADS_POR_TENTATIVA), para que as tentativas simultâneas não
+  disputem os mesmos núcleos;
+- o corpus é tokenizado uma vez no processo principal para cada max_len do
+  espaço; as tentativas leem o mesmo cache (TOKENIZACAO_CACHE_PASTA);
+- tentativas abaixo da mediana das demais no F1 macro de validação, na
+  mesma época, são podadas (o treino para ali);
+- os resultados vão para <pasta da busca>/resultados.csv e a melhor
+  tentativa (F1 macro na validação) é promovida para MODELO_PATH/final.
+
+Uso:
+    python -m src.busca_hiperparametros --csv data/texto_bruto.csv
+    python -m src.busca_hiperparametros --tentativas 20 --processos 4 --threads 2
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from transformers import AutoTokenizer, TrainerCallback
+from .config import (
+    BATCH_SIZE,
+    BUSCA_ESPACO,
+    BUSCA_PODA_EPOCA_MINIMA,
+    BUSCA_PODA_MIN_TENTATIVAS,
+    BUSCA_PROCESSOS,
+    BUSCA_TENTATIVAS,
+    BUSCA_THREADS_POR_TENTATIVA,
+    EPOCHS,
+    LEARNING_RATE,
+    MAX_LEN,
+    MODELO_NOME,
+    MODELO_PATH,
+    RANDOM_SEED,
+    WARMUP_RATIO,
+    WEIGHT_DECAY
+)
+from .fine_tuning import dividir_dados, preparar_dados, tokenizar_textos, treinar_modelo
+
+# Valores de treinar_modelo para o que não estiver no espaço
+HIPERPARAMETROS_PADRAO = {
+    "learning_rate": LEARNING_RATE,
+    "batch_size": BATCH_SIZE,
+    "epochs": EPOCHS,
+    "warmup_ratio": WARMUP_RATIO,
+    "weight_decay": WEIGHT_DECAY,
+    "max_len": MAX_LEN
+}
+
+COLUNAS_RESULTADOS = [
+    "tentativa", "learning_rate", "batch_size", "epochs", "warmup_ratio", "weight_decay", "max_len",
+    "status", "epocas_treinadas", "f1_macro_validacao", "f1_macro_teste", "tempo_s"
+]
+
+# Estado de cada worker do pool (definido em _inicializar_worker)
+_registro = None
+_trava = None
+
+
+# ==================================================
+# PODA
+# ==================================================
+class PodaMediana(TrainerCallback):
+    """
+    Para o treino quando o melhor F1 macro de validação da tentativa até a
+    época atual fica abaixo da mediana das outras tentativas na mesma época.
+
+    O registro é um dict compartilhado entre os processos:
+    {tentativa: [melhor F1 até a época 1, até a época 2, ...]}.
+    """
+
+    def __init__(self, registro, trava, tentativa,
+                 min_tentativas=BUSCA_PODA_MIN_TENTATIVAS, epoca_minima=BUSCA_PODA_EPOCA_MINIMA):
+        self.registro = registro
+        self.trava = trava
+        self.tentativa = tentativa
+        self.min_tentativas = min_tentativas
+        self.epoca_minima = epoca_minima
+        self.treinando = False
+        self.podada = False
+
+    def on_train_begin(self, args, state, control, **kwargs):
+        self.treinando = True
+
+    def on_train_end(self, args, state, control, **kwargs):
+        # As avaliações seguintes (teste) não entram no registro
+        self.treinando = False
+
+    def on_evaluate(self, args, state, control, metrics=None, **kwargs):
+        if not self.treinando or not metrics or "eval_f1_macro" not in metrics:
+            return
+
+        epoca = int(round(state.epoch))
+
+        with self.trava:
+            historico = list(self.registro.get(self.tentativa, []))
+            melhor = max([metrics["eval_f1_macro"]] + historico[-1:])
+            historico.append(melhor)
+            # Proxy do Manager: a lista precisa ser atribuída de novo
+            self.registro[self.tentativa] = historico
+
+            outras = [
+                valores[epoca - 1]
+                for tentativa, valores in self.registro.items()
+                if tentativa != self.tentativa and len(valores) >= epoca
+            ]
+
+        if epoca <= self.epoca_minima or len(outras) < self.min_tentativas:
+            return
+
+        mediana = statistics.median(outras)
+        if melhor < mediana:
+            print(
+                f"[INFO] Tentativa {self.tentativa} podada na época {epoca} "
+                f"(F1 {melhor:.4f} < mediana {mediana:.4f})"
+            )
+            self.podada = True
+            control.should_training_stop = True
+
+
+# ==================================================
+# TENTATIVAS
+# ==================================================
+def sortear_tentativas(espaco=BUSCA_ESPACO, quantidade=BUSCA_TENTATIVAS, seed=RANDOM_SEED):
+    """
+    Sorteia configurações distintas do espaço (todas, se couberem).
+    Hiperparâmetros fora do espaço ficam com o valor de HIPERPARAMETROS_PADRAO.
+
+    Returns:
+        list: Dicionários {hiperparâmetro: valor}
+    """
+    nomes = list(espaco)
+    combinacoes = [
+        {**HIPERPARAMETROS_PADRAO, **dict(zip(nomes, valores))}
+        for valores in itertools.product(*espaco.values())
+    ]
+
+    if quantidade >= len(combinacoes):
+        return combinacoes
+    return random.Random(seed).sample(combinacoes, quantidade)
+
+
+def pretokenizar(csv_path, valores_max_len, modelo_base=MODELO_NOME):
+    """
+    Tokeniza treino, validação e teste uma vez para cada max_len, gravando
+    o cache que as tentativas leem (mesma divisão de treinar_modelo).
+    """
+    textos, labels = preparar_dados(csv_path)
+    X_train, X_val, X_test, _, _, _ = dividir_dados(textos, labels)
+    tokenizer = AutoTokenizer.from_pretrained(modelo_base)
+
+    for max_len in sorted(set(valores_max_len)):
+        inicio = time.perf_counter()
+        for conjunto in (X_train, X_val, X_test):
+            tokenizar_textos(conjunto, tokenizer, max_len)
+        print(f"[INFO] Corpus tokenizado (max_len={max_len}) em {time.perf_counter() - inicio:.1f}s")
+
+
+def _inicializar_worker(registro, trava, threads_por_tentativa):
+    """
+    Executado uma vez em cada worker: guarda o registro compartilhado da
+    poda e fixa o número de threads do torch.
+    """
+    import torch
+
+    global _registro, _trava
+    _registro = registro
+    _trava = trava
+    torch.set_num_threads(threads_por_tentativa)
+    print(f"[INFO] Worker {os.getpid()} pronto ({threads_por_tentativa} threads)")
+
+
+def _executar_tentativa(numero, hiperparametros, csv_path, pasta_busca, modelo_base):
+    """
+    Treina uma tentativa em <pasta_busca>/tentativa_NN.
+
+    Returns:
+        dict: Linha da tabela de resultados
+    """
+    pasta = os.path.join(pasta_busca, f"tentativa_{numero:02d}")
+    poda = PodaMediana(_registro, _trava, numero)
+
+    inicio = time.perf_counter()
+    trainer, _, test_results = treinar_modelo(
+        csv_path,
+        output_dir=pasta,
+        modelo_base=modelo_base,
+        callbacks=[poda],
+        **hiperparametros
+    )
+    tempo = time.perf_counter() - inicio
+
+    # Só o modelo final de cada tentativa fica em disco
+    for nome in os.listdir(pasta):
+        if nome.startswith("checkpoint-"):
+            shutil.rmtree(os.path.join(pasta, nome), ignore_errors=True)
+
+    return {
+        "tentativa": numero,
+        **hiperparametros,
+        "status": "podada" if poda.podada else "concluida",
+        "epocas_treinadas": int(round(trainer.state.epoch or 0)),
+        "f1_macro_validacao": round(trainer.state.best_metric or 0.0, 4),
+        "f1_macro_teste": round(test_results["eval_f1_macro"], 4),
+        "tempo_s": round(tempo, 1)
+    }
+
+
+def criar_pasta_busca():
+    """
+    MODELO_PATH/busca<k>, sem sobrescrever buscas anteriores.
+    """
+    contagem = 1
+    pasta = os.path.join(MODELO_PATH, f"busca{contagem}")
+
+    while os.path.exists(pasta):
+        contagem += 1
+        pasta = os.path.join(MODELO_PATH, f"busca{contagem}")
+
+    os.makedirs(pasta)
+    return pasta
+
+
+def salvar_resultados(resultados, pasta_busca):
+    """
+    Grava a tabela de resultados (melhor F1 de validação primeiro).
+    """
+    caminho = os.path.join(pasta_busca, "resultados.csv")
+
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.DictWriter(f, fieldnames=COLUNAS_RESULTADOS, extrasaction="ignore")
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+    print(f"\n=== Busca de hiperparâmetros: {len(resultados)} tentativas ===")
+    print(f"{'#':>3} {'lr':>8} {'batch':>6} {'warmup':>7} {'decay':>6} {'max_len':>8} "
+          f"{'status':<10} {'épocas':>6} {'F1 val':>7} {'F1 teste':>9} {'tempo':>7}")
+    for r in resultados:
+        print(f"{r['tentativa']:>3} {r['learning_rate']:>8.0e} {r['batch_size']:>6} {r['warmup_ratio']:>7} "
+              f"{r['weight_decay']:>6} {r['max_len']:>8} {r['status']:<10} {r['epocas_treinadas']:>6} "
+              f"{r['f1_macro_validacao']:>7.4f} {r['f1_macro_teste']:>9.4f} {r['tempo_s']:>6.0f}s")
+    print(f"[INFO] Resultados salvos em: {caminho}")
+
+
+def promover_melhor(resultado, pasta_busca):
+    """
+    Copia o modelo da melhor tentativa para MODELO_PATH/final, junto com as
+    métricas de teste e a matriz de confusão dela.
+    """
+    origem = os.path.join(pasta_busca, f"tentativa_{resultado['tentativa']:02d}")
+    destino = os.path.join(MODELO_PATH, "final")
+
+    shutil.rmtree(destino, ignore_errors=True)
+    shutil.copytree(os.path.join(origem, "final"), destino)
+    for nome in ("metricas_teste.json", "matriz_confusao.txt"):
+        shutil.copy2(os.path.join(origem, nome), os.path.join(MODELO_PATH, nome))
+
+    with open(os.path.join(MODELO_PATH, "hiperparametros.json"), "w", encoding="utf-8") as f:
+        json.dump(resultado, f, indent=4, ensure_ascii=False)
+
+    print(f"[INFO] Tentativa {resultado['tentativa']} promovida para: {destino}")
+    print("[INFO] Os artefatos int8/onnx devem ser gerados de novo com: python -m src.conversao")
+
+
+def executar_busca(
+        csv_path,
+        espaco=BUSCA_ESPACO,
+        tentativas=BUSCA_TENTATIVAS,
+        num_processos=BUSCA_PROCESSOS,
+        threads_por_tentativa=BUSCA_THREADS_POR_TENTATIVA,
+        modelo_base=MODELO_NOME,
+        promover=True
+):
+    """
+    Executa a busca de hiperparâmetros.
+
+    Args:
+        csv_path (str): CSV com os tweets rotulados
+        espaco (dict): {hiperparâmetro de treinar_modelo: lista de valores}
+        tentativas (int): Configurações sorteadas do espaço
+        num_processos (int): Tentativas treinadas ao mesmo tempo
+        threads_por_tentativa (int): Threads do torch por tentativa.
+                                     Se None, divide os núcleos entre os processos.
+        modelo_base (str): Modelo de partida (nome no Hub ou pasta local)
+        promover (bool): Se True, copia a melhor tentativa para MODELO_PATH/final
+
+    Returns:
+        list: Resultados das tentativas, da melhor para a pior
+    """
+    if threads_por_tentativa is None:
+        threads_por_tentativa = max(1, (os.cpu_count() or 1) // num_processos)
+
+    configuracoes = sortear_tentativas(espaco, tentativas)
+    pasta_busca = criar_pasta_busca()
+
+    print(f"\n[INFO] Busca: {len(configuracoes)} tentativas, {num_processos} processos "
+          f"x {threads_por_tentativa} threads, em {pasta_busca}")
+
+    pretokenizar(csv_path, [c["max_len"] for c in configuracoes], modelo_base)
+
+    # "spawn" evita herdar o estado de threads do torch do processo pai
+    contexto = multiprocessing.get_context("spawn")
+    resultados = []
+
+    with contexto.Manager() as gerenciador:
+        registro = gerenciador.dict()
+        trava = gerenciador.Lock()
+
+        with ProcessPoolExecutor(
+            max_workers=num_processos,
+            mp_context=contexto,
+            initializer=_inicializar_worker,
+            initargs=(registro, trava, threads_por_tentativa)
+        ) as pool:
+            futuros = {
+                pool.submit(_executar_tentativa, numero, configuracao, csv_path, pasta_busca, modelo_base): numero
+                for numero, configuracao in enumerate(configuracoes, start=1)
+            }
+
+            for futuro in as_completed(futuros):
+                numero = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    print(f"[ERRO] Tentativa {numero} falhou: {e}")
+                    resultado = {"tentativa": numero, **configuracoes[numero - 1], "status": "erro",
+                                 "epocas_treinadas": 0, "f1_macro_validacao": 0.0,
+                                 "f1_macro_teste": 0.0, "tempo_s": 0.0}
+                else:
+                    print(f"[INFO] Tentativa {numero} {resultado['status']}: "
+                          f"F1 validação {resultado['f1_macro_validacao']:.4f}")
+                resultados.append(resultado)
+
+    resultados.sort(key=lambda r: (r["status"] == "concluida", r["f1_macro_validacao"]), reverse=True)
+    salvar_resultados(resultados, pasta_busca)
+
+    if promover and resultados and resultados[0]["status"] == "concluida":
+        promover_melhor(resultados[0], pasta_busca)
+    elif promover:
+        print("[ERRO] Nenhuma tentativa concluída; MODELO_PATH/final não foi alterado")
+
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros do fine-tuning")
+    parser.add_argument("--csv", default="data/texto_bruto.csv", help="CSV rotulado (texto_bruto, label)")
+    parser.add_argument("--tentativas", type=int, default=BUSCA_TENTATIVAS)
+    parser.add_argument("--processos", type=int, default=BUSCA_PROCESSOS, help="Tentativas ao mesmo tempo")
+    parser.add_argument("--threads", type=int, default=BUSCA_THREADS_POR_TENTATIVA,
+                        help="Threads do torch por tentativa")
+    parser.add_argument("--modelo", default=MODELO_NOME, help="Modelo base (nome no Hub ou pasta local)")
+    parser.add_argument("--sem-promover", action="store_true", help="Não altera MODELO_PATH/final")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"[ERRO] Arquivo não encontrado: {args.csv}")
+        return
+
+    executar_busca(
+        args.csv,
+        tentativas=args.tentativas,
+        num_processos=args.processos,
+        threads_por_tentativa=args.threads,
+        modelo_base=args.modelo,
+        promover=not args.sem_promover
+    )
+
+
+# Workers do pool ("spawn") importam este módulo
+if __name__ == "__main__":
+    main()
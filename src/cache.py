@@ -0,0 +1,297 @@
+# /src/cache.py
+
+"""
+Cache persistente das classificações de emoção.
+
+Cada entrada é endereçada pelo conteúdo: a chave é o hash do texto
+normalizado (limpar_texto + remover_acentos) combinado com a impressão
+digital dos pesos em MODELO_PATH/final (MODELO_PATH/aluno no backend
+"aluno") e o backend de inferência. Impressão e backend também ficam em
+colunas próprias e as buscas conferem os dois.
+Quando o modelo é re-treinado a impressão muda e as entradas antigas
+dos pesos re-treinados são descartadas automaticamente; trocar de
+backend (fp32, int8, onnx) não apaga as entradas dos outros.
+
+Guarda emoção, confiança e o vetor completo de probabilidades, com um
+LRU limitado em memória e um arquivo SQLite limitado em disco.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from .metricas import contar
+from .config import (
+    MODELO_PATH,
+    CACHE_ATIVO,
+    CACHE_PATH,
+    CACHE_MAX_MEMORIA,
+    CACHE_MAX_DISCO,
+    INFERENCIA_BACKEND
+)
+
+# Arquivos de MODELO_PATH/final que definem o comportamento do modelo
+ARQUIVOS_MODELO = (".safetensors", ".bin", ".json", ".txt", ".model")
+
+
+@lru_cache(maxsize=None)
+def impressao_modelo(model_dir):
+    """
+    Calcula a impressão digital (SHA-256) dos arquivos do modelo salvo.
+    O conteúdo de cada arquivo entra no hash, então qualquer re-treino
+    gera uma impressão diferente.
+
+    Args:
+        model_dir (str): Pasta do modelo (ex.: MODELO_PATH/final)
+
+    Returns:
+        str: Hash hexadecimal do modelo
+    """
+    digest = hashlib.sha256()
+
+    for nome in sorted(os.listdir(model_dir)):
+        caminho = os.path.join(model_dir, nome)
+        if not os.path.isfile(caminho) or not nome.endswith(ARQUIVOS_MODELO):
+            continue
+
+        digest.update(nome.encode("utf-8"))
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                digest.update(bloco)
+
+    return digest.hexdigest()
+
+
+class CacheClassificacao:
+    """
+    Cache de classificações com LRU em memória e SQLite em disco.
+
+    Args:
+        caminho (str): Arquivo SQLite do cache
+        impressao (str): Impressão digital dos pesos (impressao_modelo)
+        backend (str): Backend de inferência ("pytorch", "int8", "onnx", "aluno")
+        pesos (str): Pasta dos pesos em MODELO_PATH ("final" ou "aluno"); só as
+                     entradas destes pesos com outra impressão são descartadas
+        max_memoria (int): Entradas mantidas no LRU em memória
+        max_disco (int): Entradas mantidas no arquivo em disco
+    """
+
+    def __init__(
+            self,
+            caminho,
+            impressao,
+            backend=INFERENCIA_BACKEND,
+            pesos="final",
+            max_memoria=CACHE_MAX_MEMORIA,
+            max_disco=CACHE_MAX_DISCO
+    ):
+        self.caminho = caminho
+        self.impressao = impressao
+        self.backend = backend
+        self.pesos = pesos
+        self.max_memoria = max_memoria
+        self.max_disco = max_disco
+
+        self.memoria = OrderedDict()
+        self.acertos = 0
+        self.consultas = 0
+        self.trava = threading.Lock()
+
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+
+        # Arquivos do formato anterior (impressão e backend na mesma coluna) são recriados
+        colunas = [linha[1] for linha in self.conexao.execute("PRAGMA table_info(classificacoes)")]
+        if colunas and "backend" not in colunas:
+            self.conexao.execute("DROP TABLE classificacoes")
+
+        self.conexao.execute(
+            "CREATE TABLE IF NOT EXISTS classificacoes ("
+            "chave TEXT PRIMARY KEY, pesos TEXT, modelo TEXT, backend TEXT, emocao TEXT, "
+            "confianca REAL, probabilidades BLOB, acesso REAL)"
+        )
+        self.conexao.execute(
+            "CREATE INDEX IF NOT EXISTS idx_acesso ON classificacoes (acesso)"
+        )
+
+        # Invalidação automática: descarta entradas de versões anteriores destes pesos
+        removidas = self.conexao.execute(
+            "DELETE FROM classificacoes WHERE pesos = ? AND modelo != ?", (pesos, impressao)
+        ).rowcount
+        self.conexao.commit()
+
+        if removidas:
+            print(f"[INFO] Cache: {removidas} entradas de um modelo anterior removidas")
+
+    def chave(self, texto_normalizado):
+        """
+        Chave endereçada pelo conteúdo: hash do texto normalizado + modelo + backend.
+        """
+        conteudo = f"{self.impressao}\0{self.backend}\0{texto_normalizado}".encode("utf-8")
+        return hashlib.sha256(conteudo).hexdigest()
+
+    def _guardar_memoria(self, chave, valor):
+        self.memoria[chave] = valor
+        self.memoria.move_to_end(chave)
+        if len(self.memoria) > self.max_memoria:
+            self.memoria.popitem(last=False)
+
+    def buscar(self, textos_normalizados):
+        """
+        Procura os textos no cache.
+
+        Args:
+            textos_normalizados (list): Textos já normalizados
+
+        Returns:
+            dict: {índice: (emocao, confianca, probabilidades)} apenas para os acertos
+        """
+        encontrados = {}
+        faltantes = {}
+
+        with self.trava:
+            for i, texto in enumerate(textos_normalizados):
+                chave = self.chave(texto)
+                if chave in self.memoria:
+                    self.memoria.move_to_end(chave)
+                    encontrados[i] = self.memoria[chave]
+                else:
+                    faltantes.setdefault(chave, []).append(i)
+
+            chaves = list(faltantes)
+            agora = time.time()
+
+            # Consulta ao disco em blocos (limite de parâmetros do SQLite)
+            for inicio in range(0, len(chaves), 500):
+                bloco = chaves[inicio:inicio + 500]
+                marcadores = ",".join("?" * len(bloco))
+                linhas = self.conexao.execute(
+                    f"SELECT chave, emocao, confianca, probabilidades FROM classificacoes "
+                    f"WHERE chave IN ({marcadores}) AND modelo = ? AND backend = ?",
+                    bloco + [self.impressao, self.backend]
+                ).fetchall()
+
+                for chave, emocao, confianca, blob in linhas:
+                    valor = (emocao, confianca, list(array("f", blob)))
+                    self._guardar_memoria(chave, valor)
+                    for i in faltantes[chave]:
+                        encontrados[i] = valor
+
+                self.conexao.executemany(
+                    "UPDATE classificacoes SET acesso = ? WHERE chave = ?",
+                    [(agora, linha[0]) for linha in linhas]
+                )
+
+            self.conexao.commit()
+            self.consultas += len(textos_normalizados)
+            self.acertos += len(encontrados)
+
+        contar("cache.consultas", len(textos_normalizados))
+        contar("cache.acertos", len(encontrados))
+
+        return encontrados
+
+    def guardar(self, textos_normalizados, resultados):
+        """
+        Guarda novas classificações no cache.
+
+        Args:
+            textos_normalizados (list): Textos já normalizados
+            resultados (list): Tuplas (emocao, confianca, probabilidades)
+        """
+        agora = time.time()
+        linhas = []
+
+        with self.trava:
+            for texto, (emocao, confianca, probabilidades) in zip(textos_normalizados, resultados):
+                chave = self.chave(texto)
+                self._guardar_memoria(chave, (emocao, confianca, probabilidades))
+                linhas.append((
+                    chave,
+                    self.pesos,
+                    self.impressao,
+                    self.backend,
+                    emocao,
+                    confianca,
+                    array("f", probabilidades).tobytes(),
+                    agora
+                ))
+
+            self.conexao.executemany(
+                "INSERT OR REPLACE INTO classificacoes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                linhas
+            )
+            self._limitar_disco()
+            self.conexao.commit()
+
+    def _limitar_disco(self):
+        """
+        Remove as entradas acessadas há mais tempo quando o disco passa do limite.
+        """
+        total = self.conexao.execute("SELECT COUNT(*) FROM classificacoes").fetchone()[0]
+        excesso = total - self.max_disco
+
+        if excesso > 0:
+            self.conexao.execute(
+                "DELETE FROM classificacoes WHERE chave IN ("
+                "SELECT chave FROM classificacoes ORDER BY acesso LIMIT ?)",
+                (excesso,)
+            )
+
+    def estatisticas(self):
+        """
+        Returns:
+            dict: acertos, consultas e taxa de acerto (%)
+        """
+        taxa = (self.acertos / self.consultas) * 100 if self.consultas else 0
+        return {"acertos": self.acertos, "consultas": self.consultas, "taxa_acerto": taxa}
+
+
+# ==================================================
+# CACHE COMPARTILHADO DO PROCESSO
+# ==================================================
+_cache = None
+_trava_cache = threading.Lock()
+
+
+def obter_cache():
+    """
+    Retorna o cache do processo, criando-o na primeira chamada.
+    Retorna None se CACHE_ATIVO for False.
+    """
+    global _cache
+
+    if not CACHE_ATIVO:
+        return None
+
+    if _cache is None:
+        with _trava_cache:
+            if _cache is None:
+                # Backends diferentes (fp32, int8, onnx) não compartilham entradas,
+                # mas convivem no mesmo arquivo
+                pesos = "aluno" if INFERENCIA_BACKEND == "aluno" else "final"
+                impressao = impressao_modelo(os.path.join(MODELO_PATH, pesos))
+                _cache = CacheClassificacao(CACHE_PATH, impressao, INFERENCIA_BACKEND, pesos)
+
+    return _cache
+
+
+def relatar_cache():
+    """
+    Exibe a taxa de acerto do cache ao final da execução.
+    """
+    if _cache is None:
+        return
+
+    stats = _cache.estatisticas()
+    print(
+        f"[INFO] Cache de classificações: {stats['acertos']}/{stats['consultas']} "
+        f"acertos ({stats['taxa_acerto']:.1f}%)"
+    )
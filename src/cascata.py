@@ -0,0 +1,322 @@
+# /src/cascata.py
+
+"""
+Classificação em cascata: um modelo linear barato (regressão logística
+sobre n-gramas de palavras e de caracteres com hashing) classifica os
+textos em que tem confiança >= CASCATA_LIMIAR, e só o restante passa pelo
+BERTimbau. Os emojis já chegam como nomes (:fire:) pela limpeza e viram
+tokens próprios, então gritos de torcida, textos só com emoji e respostas de uma
+palavra costumam ser resolvidos no primeiro estágio.
+
+O primeiro estágio é treinado com o mesmo CSV e a mesma divisão do
+fine-tuning, sobre os textos como chegam à classificação (limpar_texto,
+depois minúsculas e sem acentos), e salvo em MODELO_PATH/cascata. No
+conjunto de teste é medida a curva limiar x fração resolvida no primeiro
+estágio x acurácia / F1 macro x tempo por tweet (cascata.json).
+
+Sem o primeiro estágio salvo (ou com CASCATA_ATIVA = False) a
+classificação é a de sempre. Os resultados do primeiro estágio não
+entram no cache de classificações (que guarda só as do BERTimbau).
+
+Uso:
+    python -m src.cascata --csv data/texto_bruto.csv
+    python -m src.cascata --csv data/texto_bruto.csv --limiares 0.8 0.9 0.95
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import numpy as np
+from .config import (
+    CASCATA_ATIVA,
+    CASCATA_DIMENSAO_HASH,
+    CASCATA_LIMIAR,
+    CASCATA_LIMIARES_CURVA,
+    EMOCAO_TO_ID,
+    ID_TO_EMOCAO,
+    MODELO_PATH,
+    RANDOM_SEED
+)
+from .metricas import contar, medir
+from .normalizacao import limpar_textos, normalizar_textos
+
+ARQUIVO_MODELO = "modelo.joblib"
+ARQUIVO_CURVA = "cascata.json"
+
+
+def pasta_cascata():
+    return os.path.join(MODELO_PATH, "cascata")
+
+
+# ==================================================
+# PRIMEIRO ESTÁGIO
+# ==================================================
+class ClassificadorRapido:
+    """
+    Regressão logística sobre n-gramas com hashing (sem vocabulário: o
+    vetorizador não guarda estado e o modelo salvo é só a matriz de pesos).
+
+    Args:
+        dimensao (int): Número de atributos do hashing
+    """
+
+    def __init__(self, dimensao=CASCATA_DIMENSAO_HASH):
+        # scikit-learn importado sob demanda para não pesar na inicialização
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline, make_union
+
+        self.modelo = make_pipeline(
+            make_union(
+                HashingVectorizer(n_features=dimensao, analyzer="word", token_pattern=r":[^:\s]+:|[^:\s]+",
+                                  ngram_range=(1, 2), alternate_sign=False),
+                HashingVectorizer(n_features=dimensao, analyzer="char_wb", ngram_range=(2, 4),
+                                  alternate_sign=False)
+            ),
+            LogisticRegression(C=4.0, max_iter=2000, random_state=RANDOM_SEED)
+        )
+
+    def treinar(self, textos, labels):
+        """
+        Args:
+            textos (list): Textos já normalizados
+            labels (list): IDs das emoções
+        """
+        self.modelo.fit(textos, labels)
+        return self
+
+    def probabilidades(self, textos):
+        """
+        Returns:
+            np.ndarray: (textos x emoções), colunas na ordem dos IDs de EMOCAO_TO_ID
+        """
+        parciais = self.modelo.predict_proba(textos)
+
+        # Emoções ausentes do treino ficam com probabilidade zero
+        probs = np.zeros((len(textos), len(ID_TO_EMOCAO)))
+        probs[:, self.modelo.classes_] = parciais
+        return probs
+
+    def salvar(self, pasta):
+        import joblib
+
+        os.makedirs(pasta, exist_ok=True)
+        joblib.dump(self.modelo, os.path.join(pasta, ARQUIVO_MODELO))
+
+    @classmethod
+    def carregar(cls, pasta):
+        import joblib
+
+        classificador = cls.__new__(cls)
+        classificador.modelo = joblib.load(os.path.join(pasta, ARQUIVO_MODELO))
+        return classificador
+
+
+_rapido = None
+_carregado = False
+_trava_rapido = threading.Lock()
+
+
+def obter_classificador_rapido():
+    """
+    Retorna o primeiro estágio salvo em MODELO_PATH/cascata, carregado na
+    primeira chamada, ou None se ele não existir.
+    """
+    global _rapido, _carregado
+
+    if not _carregado:
+        with _trava_rapido:
+            if not _carregado:
+                pasta = pasta_cascata()
+                if os.path.exists(os.path.join(pasta, ARQUIVO_MODELO)):
+                    _rapido = ClassificadorRapido.carregar(pasta)
+                    print(f"[INFO] Cascata ativa: primeiro estágio de {pasta} (limiar {CASCATA_LIMIAR})")
+                _carregado = True
+
+    return _rapido
+
+
+def resolver_primeiro_estagio(textos, limiar=None):
+    """
+    Classifica os textos no primeiro estágio e separa os que ficaram
+    abaixo do limiar de confiança.
+
+    Args:
+        textos (list): Textos já normalizados (não vazios)
+        limiar (float): Confiança mínima. Se None, CASCATA_LIMIAR
+
+    Returns:
+        tuple: (restantes, resolvidos) - lista dos textos que seguem para o
+               BERTimbau e {texto: (emocao, confianca)} dos resolvidos
+    """
+    if not CASCATA_ATIVA or not textos:
+        return textos, {}
+
+    rapido = obter_classificador_rapido()
+    if rapido is None:
+        return textos, {}
+
+    limiar = CASCATA_LIMIAR if limiar is None else limiar
+
+    with medir("inferencia.cascata", itens=len(textos)):
+        probs = rapido.probabilidades(textos)
+
+    predicoes = probs.argmax(axis=1).tolist()
+    confiancas = probs.max(axis=1).tolist()
+
+    restantes = []
+    resolvidos = {}
+    for texto, pred, conf in zip(textos, predicoes, confiancas):
+        if conf >= limiar:
+            resolvidos[texto] = (ID_TO_EMOCAO[pred], conf)
+        else:
+            restantes.append(texto)
+
+    contar("cascata.primeiro_estagio", len(resolvidos))
+    contar("cascata.bert", len(restantes))
+
+    return restantes, resolvidos
+
+
+# ==================================================
+# CURVA LIMIAR x QUALIDADE x TEMPO
+# ==================================================
+def curva_cascata(rapido, X_test, y_test, limiares=CASCATA_LIMIARES_CURVA, modelo=None):
+    """
+    Acurácia, F1 macro, fração resolvida no primeiro estágio e tempo por
+    tweet da cascata em cada limiar, no conjunto de teste.
+
+    O tempo é estimado a partir dos dois estágios medidos separadamente:
+    primeiro estágio em todos os textos + BERTimbau na fração restante.
+
+    Args:
+        rapido (ClassificadorRapido): Primeiro estágio
+        X_test (list): Textos já normalizados
+        y_test (list): IDs das emoções
+        limiares (list): Limiares avaliados
+        modelo: Backend do BERTimbau. Se None, usa o modelo do processo
+
+    Returns:
+        list: Uma linha (dict) por limiar, mais a linha do BERTimbau sozinho (limiar None)
+    """
+    from sklearn.metrics import accuracy_score, f1_score
+    from .analise_emocoes import classificar_emocoes
+
+    y_test = np.asarray(y_test)
+    rotulos = list(ID_TO_EMOCAO)
+
+    inicio = time.perf_counter()
+    probs = rapido.probabilidades(X_test)
+    ms_rapido = (time.perf_counter() - inicio) / len(X_test) * 1000
+
+    classificar_emocoes(X_test[:16], modelo=modelo)
+    inicio = time.perf_counter()
+    pred_bert = np.array([EMOCAO_TO_ID[emocao] for emocao, _ in classificar_emocoes(X_test, modelo=modelo)])
+    ms_bert = (time.perf_counter() - inicio) / len(X_test) * 1000
+
+    pred_rapido = probs.argmax(axis=1)
+    conf_rapido = probs.max(axis=1)
+
+    linhas = [{
+        "limiar": None,
+        "fracao_primeiro_estagio": 0.0,
+        "acuracia": accuracy_score(y_test, pred_bert),
+        "f1_macro": f1_score(y_test, pred_bert, average="macro", labels=rotulos),
+        "ms_por_tweet": ms_bert,
+        "speedup": 1.0
+    }]
+
+    for limiar in limiares:
+        resolvido = conf_rapido >= limiar
+        predicoes = np.where(resolvido, pred_rapido, pred_bert)
+        ms = ms_rapido + (1 - resolvido.mean()) * ms_bert
+
+        linhas.append({
+            "limiar": limiar,
+            "fracao_primeiro_estagio": float(resolvido.mean()),
+            "acuracia_primeiro_estagio": float((pred_rapido[resolvido] == y_test[resolvido]).mean()) if resolvido.any() else None,
+            "acuracia": accuracy_score(y_test, predicoes),
+            "f1_macro": f1_score(y_test, predicoes, average="macro", labels=rotulos),
+            "ms_por_tweet": ms,
+            "speedup": ms_bert / ms
+        })
+
+    print(f"\n=== Cascata: limiar x qualidade x tempo (teste: {len(X_test)} tweets) ===")
+    print(f"{'limiar':<10}{'1º estágio':>11}{'acerto 1º':>11}{'acurácia':>10}{'F1 macro':>10}{'ms/tweet':>10}{'speedup':>9}")
+    for linha in linhas:
+        nome = "só BERT" if linha["limiar"] is None else f"{linha['limiar']:.2f}"
+        acerto = linha.get("acuracia_primeiro_estagio")
+        acerto = f"{acerto:.1%}" if acerto is not None else "-"
+        print(f"{nome:<10}{linha['fracao_primeiro_estagio']:>11.1%}{acerto:>11}{linha['acuracia']:>10.4f}"
+              f"{linha['f1_macro']:>10.4f}{linha['ms_por_tweet']:>10.2f}{linha['speedup']:>8.1f}x")
+
+    return linhas
+
+
+# ==================================================
+# TREINO
+# ==================================================
+def preparar_textos(textos):
+    """
+    Textos brutos -> forma que chega à classificação das partidas.
+    """
+    return normalizar_textos(limpar_textos(str(t) for t in textos))
+
+
+def treinar_cascata(csv_path, pasta=None, limiares=CASCATA_LIMIARES_CURVA):
+    """
+    Treina o primeiro estágio com a divisão do fine-tuning, salva em
+    MODELO_PATH/cascata e grava a curva do conjunto de teste em cascata.json
+    (a curva exige o BERTimbau em MODELO_PATH/final).
+
+    Args:
+        csv_path (str): CSV rotulado (texto_bruto, label)
+        pasta (str): Pasta de destino. Se None, MODELO_PATH/cascata
+        limiares (list): Limiares avaliados na curva
+
+    Returns:
+        tuple: (ClassificadorRapido, linhas da curva ou None)
+    """
+    from .fine_tuning import dividir_dados, preparar_dados
+
+    pasta = pasta or pasta_cascata()
+
+    textos, labels = preparar_dados(csv_path)
+    textos = preparar_textos(textos)
+    X_train, X_val, X_test, y_train, y_val, y_test = dividir_dados(textos, labels)
+
+    # Sem parada antecipada: validação entra no treino
+    inicio = time.perf_counter()
+    rapido = ClassificadorRapido().treinar(X_train + X_val, y_train + y_val)
+    print(f"[INFO] Primeiro estágio treinado em {time.perf_counter() - inicio:.1f}s "
+          f"({len(X_train) + len(X_val)} exemplos)")
+
+    rapido.salvar(pasta)
+    print(f"[INFO] Primeiro estágio salvo em: {pasta}")
+
+    if not os.path.exists(os.path.join(MODELO_PATH, "final")):
+        print(f"[INFO] Sem o BERTimbau em {os.path.join(MODELO_PATH, 'final')}: curva não calculada")
+        return rapido, None
+
+    linhas = curva_cascata(rapido, X_test, y_test, limiares)
+
+    caminho = os.path.join(pasta, ARQUIVO_CURVA)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump({"limiar_configurado": CASCATA_LIMIAR, "teste": len(X_test), "curva": linhas}, f, indent=4)
+    print(f"\n[INFO] Curva salva em: {caminho}")
+
+    return rapido, linhas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Treino do primeiro estágio da cascata de classificação")
+    parser.add_argument("--csv", default="data/texto_bruto.csv", help="CSV rotulado (texto_bruto, label)")
+    parser.add_argument("--limiares", type=float, nargs="+", default=CASCATA_LIMIARES_CURVA)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv):
+        print(f"[ERRO] Arquivo não encontrado: {args.csv}")
+    else:
+        treinar_cascata(args.csv, limiares=args.limiares)
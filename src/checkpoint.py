@@ -0,0 +1,294 @@
+# /src/checkpoint.py
+
+"""
+Checkpoint da coleta de uma partida.
+
+O estado é gravado após cada página da API, então uma coleta interrompida
+(queda de rede, erro na paginação) é retomada exatamente de onde parou, e
+uma nova execução para a mesma partida busca apenas respostas mais novas
+que as já coletadas (since_id), sem gastar cota à toa.
+
+Arquivos na pasta do checkpoint:
+    estado.json      tweets do clube, next_token e tweet mais recente por conversa
+    respostas.jsonl  respostas aceitas (já deduplicadas), uma por linha
+
+As respostas não ficam em memória: o checkpoint guarda apenas a posição
+de cada linha no arquivo e as lê sob demanda (iterar_respostas).
+"""
+
+import io
+import json
+import os
+import threading
+from array import array
+
+ARQUIVO_ESTADO = "estado.json"
+ARQUIVO_RESPOSTAS = "respostas.jsonl"
+
+
+def _maior_id(a, b):
+    """
+    IDs do X são inteiros crescentes no tempo (snowflake) serializados como texto.
+    """
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if int(a) >= int(b) else b
+
+
+class CheckpointColeta:
+    """
+    Estado da coleta de uma partida, persistido a cada página.
+
+    Cada "passada" de paginação (do clube ou de uma conversa) guarda o
+    since_id com que começou e o next_token atual. Uma passada incompleta
+    é retomada com os mesmos parâmetros; uma passada concluída dá lugar a
+    uma nova, com since_id = tweet mais recente já visto.
+
+    Args:
+        pasta (str): Pasta do checkpoint. Se None, o estado fica só em memória.
+        janela_iso (tuple): (inicio_iso, fim_iso) da coleta, para validar a retomada
+    """
+
+    def __init__(self, pasta, janela_iso):
+        self.pasta = pasta
+        self.trava = threading.Lock()
+
+        self.estado = {
+            "janela": list(janela_iso),
+            "clube": {"tweets": [], "next_token": None, "since_id": None,
+                      "concluida": False, "mais_recente_id": None},
+            "conversas": {},
+            "total_respostas": 0
+        }
+        # Posição (em bytes) e conversation_id de cada resposta no arquivo
+        self.posicoes = array("q")
+        self.conversas_respostas = []
+        self.ids_unicos = set()
+
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+            self._carregar(janela_iso)
+            self.arquivo = open(self._caminho(ARQUIVO_RESPOSTAS), "a+b")
+        else:
+            self.arquivo = io.BytesIO()
+
+    # ==================================================
+    # PERSISTÊNCIA
+    # ==================================================
+    def _caminho(self, nome):
+        return os.path.join(self.pasta, nome)
+
+    def _carregar(self, janela_iso):
+        caminho_estado = self._caminho(ARQUIVO_ESTADO)
+        if not os.path.exists(caminho_estado):
+            return
+
+        with open(caminho_estado, encoding="utf-8") as f:
+            estado = json.load(f)
+
+        if estado.get("janela") != list(janela_iso):
+            raise RuntimeError(
+                f"Checkpoint em {self.pasta} pertence a outra janela de coleta: {estado.get('janela')}"
+            )
+
+        # Linhas gravadas depois do último estado confirmado são descartadas:
+        # a página correspondente será buscada novamente.
+        total = estado["total_respostas"]
+        caminho_respostas = self._caminho(ARQUIVO_RESPOSTAS)
+        if os.path.exists(caminho_respostas):
+            with open(caminho_respostas, "r+b") as f:
+                for _ in range(total):
+                    posicao = f.tell()
+                    linha = f.readline()
+                    if not linha:
+                        break
+                    registro = json.loads(linha)
+                    self.posicoes.append(posicao)
+                    self.conversas_respostas.append(registro["conversation_id"])
+                    self.ids_unicos.add(registro["tweet"]["id_tweet"])
+                f.truncate(f.tell())
+
+        estado["total_respostas"] = len(self.posicoes)
+        self.estado = estado
+
+        pendentes = sum(1 for c in estado["conversas"].values() if not c["concluida"])
+        print(
+            f"[INFO] Checkpoint carregado: {len(self.posicoes)} respostas, "
+            f"{len(estado['conversas'])} conversas ({pendentes} a retomar)"
+        )
+
+    def _salvar(self, novas_respostas):
+        """
+        Acrescenta as respostas novas e grava o estado de forma atômica.
+        Deve ser chamado com a trava adquirida.
+        """
+        if novas_respostas:
+            self.arquivo.seek(0, os.SEEK_END)
+            for r in novas_respostas:
+                self.posicoes.append(self.arquivo.tell())
+                self.conversas_respostas.append(r["conversation_id"])
+                self.arquivo.write((json.dumps(r, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.arquivo.flush()
+            if self.pasta:
+                os.fsync(self.arquivo.fileno())
+
+        self.estado["total_respostas"] = len(self.posicoes)
+
+        if not self.pasta:
+            return
+
+        temporario = self._caminho(ARQUIVO_ESTADO + ".tmp")
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.estado, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self._caminho(ARQUIVO_ESTADO))
+
+    # ==================================================
+    # TWEETS DO CLUBE
+    # ==================================================
+    def iniciar_passada_clube(self):
+        """
+        Returns:
+            tuple: (since_id, next_token) para a paginação dos tweets do clube
+        """
+        with self.trava:
+            clube = self.estado["clube"]
+            if clube["concluida"]:
+                clube.update(since_id=clube["mais_recente_id"], next_token=None, concluida=False)
+            return clube["since_id"], clube["next_token"]
+
+    def registrar_pagina_clube(self, tweets, next_token):
+        with self.trava:
+            clube = self.estado["clube"]
+            vistos = {t["id"] for t in clube["tweets"]}
+
+            for t in tweets:
+                if t["id"] not in vistos:
+                    clube["tweets"].append({
+                        "id": t["id"],
+                        "conversation_id": t["conversation_id"],
+                        "created_at": t.get("created_at")
+                    })
+                clube["mais_recente_id"] = _maior_id(clube["mais_recente_id"], t["id"])
+
+            clube["next_token"] = next_token
+            clube["concluida"] = not next_token
+            self._salvar([])
+
+    def tweets_clube(self):
+        with self.trava:
+            return list(self.estado["clube"]["tweets"])
+
+    # ==================================================
+    # RESPOSTAS POR CONVERSA
+    # ==================================================
+    def iniciar_passada_conversa(self, conversation_id):
+        """
+        Returns:
+            tuple: (since_id, next_token) para a paginação da conversa
+        """
+        with self.trava:
+            conversa = self.estado["conversas"].setdefault(conversation_id, {
+                "next_token": None,
+                "since_id": None,
+                "concluida": False,
+                "mais_recente_id": None,
+                "mais_recente_created_at": None
+            })
+
+            if conversa["concluida"]:
+                conversa.update(since_id=conversa["mais_recente_id"], next_token=None, concluida=False)
+
+            return conversa["since_id"], conversa["next_token"]
+
+    def registrar_pagina_respostas(self, conversation_id, pagina, respostas, next_token):
+        """
+        Registra uma página de respostas: deduplica por id_tweet, grava as
+        novas e atualiza o cursor da conversa.
+
+        Args:
+            conversation_id (str): Conversa paginada
+            pagina (list): Todos os tweets da página (para o tweet mais recente)
+            respostas (list): Respostas aceitas, já no formato de dicionário do pipeline
+            next_token (str): Token da próxima página (None se acabou)
+        """
+        with self.trava:
+            conversa = self.estado["conversas"][conversation_id]
+
+            novas = []
+            for tweet in respostas:
+                if tweet["id_tweet"] in self.ids_unicos:
+                    continue
+                self.ids_unicos.add(tweet["id_tweet"])
+                novas.append({"conversation_id": conversation_id, "tweet": tweet})
+
+            for t in pagina:
+                if _maior_id(conversa["mais_recente_id"], t["id"]) == t["id"]:
+                    conversa["mais_recente_id"] = t["id"]
+                    conversa["mais_recente_created_at"] = t.get("created_at")
+
+            conversa["next_token"] = next_token
+            conversa["concluida"] = not next_token
+            self._salvar(novas)
+
+    def _ler(self, i):
+        """
+        Lê a i-ésima resposta do arquivo. Deve ser chamado com a trava adquirida.
+        """
+        self.arquivo.seek(self.posicoes[i])
+        return json.loads(self.arquivo.readline())["tweet"]
+
+    def iterar_respostas(self, tamanho_bloco=1000):
+        """
+        Percorre as respostas acumuladas agrupadas na ordem dos tweets do
+        clube (mesma ordem da coleta sequencial), lendo do arquivo em blocos.
+
+        Yields:
+            dict: Tweet
+        """
+        with self.trava:
+            ordem = {
+                t["conversation_id"]: i
+                for i, t in enumerate(self.estado["clube"]["tweets"])
+            }
+            indices = sorted(
+                range(len(self.posicoes)),
+                key=lambda i: ordem.get(self.conversas_respostas[i], len(ordem))
+            )
+
+        for inicio in range(0, len(indices), tamanho_bloco):
+            with self.trava:
+                bloco = [self._ler(i) for i in indices[inicio:inicio + tamanho_bloco]]
+            yield from bloco
+
+    def respostas_ordenadas(self):
+        """
+        Returns:
+            list: Todas as respostas, na ordem de iterar_respostas
+        """
+        return list(self.iterar_respostas())
+
+    def respostas_desde(self, posicao):
+        """
+        Respostas aceitas depois da posição informada, na ordem de chegada
+        (usado pelo modo ao vivo para repassar só o que é novo a cada passada).
+
+        Args:
+            posicao (int): Quantidade de respostas já consumidas
+
+        Returns:
+            tuple: (lista de tweets novos, nova posição)
+        """
+        with self.trava:
+            novas = [self._ler(i) for i in range(posicao, len(self.posicoes))]
+            return novas, len(self.posicoes)
+
+    def total_respostas(self):
+        with self.trava:
+            return len(self.posicoes)
+
+    def fechar(self):
+        self.arquivo.close()
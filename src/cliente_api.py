@@ -0,0 +1,268 @@
+# /src/cliente_api.py
+
+"""
+Cliente HTTP compartilhado para a API do X.
+
+Um único requests.Session com pool de conexões keep-alive e gzip é usado
+por todas as requisições da execução (ID do perfil e buscas), junto com o
+limitador de taxa compartilhado entre as threads de coleta. O cliente
+registra métricas de reuso de conexões e latência por endpoint.
+"""
+
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from .metricas import contar, registrar_tempo
+from .config import (
+    obter_token_api,
+    COLETA_REQUISICOES_POR_SEGUNDO,
+    COLETA_RAJADA,
+    API_POOL_CONEXOES,
+    API_TIMEOUT_CONEXAO,
+    API_TIMEOUT_LEITURA,
+    API_MAX_TENTATIVAS,
+    API_BACKOFF_BASE,
+    API_BACKOFF_MAX
+)
+
+
+class LimitadorTaxa:
+    """
+    Token bucket compartilhado entre as threads de coleta.
+
+    Cada requisição consome um token; os tokens são repostos à taxa
+    informada, até a capacidade da rajada. Além disso, o limitador segue
+    os cabeçalhos x-rate-limit-remaining / x-rate-limit-reset da API:
+    quando a cota acaba (ou chega um 429), TODAS as threads esperam
+    até o reset, em vez de cada requisição dormir por conta própria.
+
+    Args:
+        taxa (float): Requisições por segundo
+        capacidade (int): Tamanho máximo da rajada
+    """
+
+    def __init__(self, taxa=COLETA_REQUISICOES_POR_SEGUNDO, capacidade=COLETA_RAJADA):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self.tokens = float(capacidade)
+        self.ultima_reposicao = time.monotonic()
+        self.bloqueado_ate = 0.0
+        self.trava = threading.Lock()
+
+    def adquirir(self):
+        """
+        Bloqueia até haver um token disponível e a cota da API não estar esgotada.
+        """
+        while True:
+            with self.trava:
+                agora = time.monotonic()
+                self.tokens = min(
+                    self.capacidade,
+                    self.tokens + (agora - self.ultima_reposicao) * self.taxa
+                )
+                self.ultima_reposicao = agora
+
+                espera_reset = self.bloqueado_ate - time.time()
+                if espera_reset <= 0 and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                espera = max(espera_reset, (1 - self.tokens) / self.taxa)
+
+            registrar_tempo("api.espera_limite", espera)
+            time.sleep(espera)
+
+    def bloquear_ate(self, reset_epoch):
+        """
+        Suspende todas as requisições até o instante (epoch) informado.
+        """
+        with self.trava:
+            if reset_epoch > self.bloqueado_ate:
+                self.bloqueado_ate = reset_epoch
+                print(f"[INFO] Cota da API esgotada. Aguardando {max(0, int(reset_epoch - time.time()))} segundos...")
+
+    def atualizar(self, response_headers):
+        """
+        Lê os cabeçalhos de rate limit de uma resposta da API.
+        """
+        restantes = response_headers.get("x-rate-limit-remaining")
+        reset_time = response_headers.get("x-rate-limit-reset")
+
+        if restantes is not None and reset_time and int(restantes) <= 0:
+            self.bloquear_ate(int(reset_time))
+
+
+def percentil(valores_ordenados, p):
+    """
+    Percentil p (0-100) por interpolação linear de uma lista já ordenada.
+    """
+    if not valores_ordenados:
+        return 0.0
+
+    posicao = (len(valores_ordenados) - 1) * p / 100
+    base = int(posicao)
+    topo = min(base + 1, len(valores_ordenados) - 1)
+    return valores_ordenados[base] + (valores_ordenados[topo] - valores_ordenados[base]) * (posicao - base)
+
+
+class ClienteAPI:
+    """
+    Cliente da API do X com sessão HTTP persistente.
+
+    Args:
+        token (str): Bearer token. Se None, usa obter_token_api()
+        tamanho_pool (int): Conexões keep-alive mantidas por host
+        timeout (tuple): (timeout de conexão, timeout de leitura) em segundos
+        max_tentativas (int): Tentativas em falhas de rede e erros 5xx
+        limitador (LimitadorTaxa): Limitador compartilhado. Se None, cria um com a taxa do config
+    """
+
+    def __init__(
+            self,
+            token=None,
+            tamanho_pool=API_POOL_CONEXOES,
+            timeout=(API_TIMEOUT_CONEXAO, API_TIMEOUT_LEITURA),
+            max_tentativas=API_MAX_TENTATIVAS,
+            limitador=None
+    ):
+        self.timeout = timeout
+        self.max_tentativas = max_tentativas
+        self.limitador = limitador or LimitadorTaxa()
+
+        # Sem retry automático do urllib3: as novas tentativas são feitas em get()
+        self.adapter = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool)
+
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token or obter_token_api()}",
+            "Accept-Encoding": "gzip, deflate"
+        })
+
+        self.latencias = defaultdict(list)
+        self.trava = threading.Lock()
+
+    def _espera_backoff(self, tentativa):
+        """
+        Backoff exponencial limitado, com jitter para as threads não sincronizarem.
+        """
+        espera = min(API_BACKOFF_MAX, API_BACKOFF_BASE * (2 ** tentativa))
+        return espera * random.uniform(0.5, 1.0)
+
+    def get(self, url, params=None):
+        """
+        Faz um GET tratando rate limit (429) sem perder dados e repetindo
+        falhas de rede e erros 5xx com backoff exponencial.
+
+        Returns:
+            requests.Response: Resposta com status 200
+
+        Raises:
+            RuntimeError: Erro 4xx (exceto 429) ou tentativas esgotadas
+        """
+        endpoint = urlparse(url).path
+        tentativa = 0
+
+        while True:
+            self.limitador.adquirir()
+
+            inicio = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                erro = None
+            except requests.RequestException as e:
+                response = None
+                erro = str(e)
+
+            with self.trava:
+                self.latencias[endpoint].append(time.perf_counter() - inicio)
+            contar("api.requisicoes")
+
+            if response is not None:
+                self.limitador.atualizar(response.headers)
+
+                if response.status_code == 200:
+                    return response
+
+                if response.status_code == 429:
+                    contar("api.respostas_429")
+                    reset_time = response.headers.get("x-rate-limit-reset")
+
+                    if reset_time:
+                        tempo_espera = max(int(reset_time) - int(time.time()), 5)
+                    else:
+                        tempo_espera = 60
+
+                    # A espera vale para todas as threads e não conta como tentativa
+                    self.limitador.bloquear_ate(time.time() + tempo_espera)
+                    continue
+
+                if response.status_code < 500:
+                    raise RuntimeError(
+                        f"Requisição falhou: {response.status_code} - {response.text}"
+                    )
+
+                erro = f"{response.status_code} - {response.text}"
+
+            tentativa += 1
+            if tentativa >= self.max_tentativas:
+                raise RuntimeError(f"Requisição falhou após {tentativa} tentativas: {erro}")
+
+            espera = self._espera_backoff(tentativa - 1)
+            print(f"[ERRO] Requisição falhou ({erro}). Nova tentativa em {espera:.1f}s...")
+            contar("api.novas_tentativas")
+            registrar_tempo("api.espera_backoff", espera)
+            time.sleep(espera)
+
+    # ==================================================
+    # MÉTRICAS
+    # ==================================================
+    def metricas(self):
+        """
+        Returns:
+            dict: Reuso de conexões e percentis de latência (ms) por endpoint
+        """
+        conexoes = 0
+        requisicoes_http = 0
+        pools = self.adapter.poolmanager.pools
+        for chave in list(pools.keys()):
+            pool = pools.get(chave)
+            if pool is not None:
+                conexoes += pool.num_connections
+                requisicoes_http += pool.num_requests
+
+        with self.trava:
+            latencias = {k: sorted(v) for k, v in self.latencias.items()}
+
+        return {
+            "conexoes_abertas": conexoes,
+            "requisicoes": requisicoes_http,
+            "requisicoes_por_conexao": requisicoes_http / conexoes if conexoes else 0,
+            "endpoints": {
+                endpoint: {
+                    "requisicoes": len(valores),
+                    "p50_ms": percentil(valores, 50) * 1000,
+                    "p90_ms": percentil(valores, 90) * 1000,
+                    "p99_ms": percentil(valores, 99) * 1000
+                }
+                for endpoint, valores in latencias.items()
+            }
+        }
+
+    def imprimir_metricas(self):
+        m = self.metricas()
+        print("\n=== Cliente da API ===")
+        print(f"Conexões abertas: {m['conexoes_abertas']} | "
+              f"requisições: {m['requisicoes']} | "
+              f"requisições por conexão: {m['requisicoes_por_conexao']:.1f}")
+        for endpoint, e in m["endpoints"].items():
+            print(f"{endpoint}: {e['requisicoes']} req | p50 {e['p50_ms']:.0f} ms | "
+                  f"p90 {e['p90_ms']:.0f} ms | p99 {e['p99_ms']:.0f} ms")
+
+    def fechar(self):
+        self.session.close()
@@ -1,172 +1,250 @@
 # /src/coleta.py
 
-import requests
-from .config import API_BEARER_TOKEN
-import re
+from .checkpoint import CheckpointColeta
+from .cliente_api import ClienteAPI
+from .config import COLETA_THREADS
+from .metricas import contar, cronometrado, medir
+from .normalizacao import limpar_texto, limpar_textos  # limpar_texto: compatibilidade
 import emoji
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timezone
 
 BASE_URL = "https://api.twitter.com/2/tweets/search/recent"
 
 
-def limpar_texto(texto):
-    texto = texto.lower()
-    texto = re.sub(r"http\S+", "", texto)
-    texto = re.sub(r"@\S+", "", texto)
-    texto = re.sub(r"#\S+", "", texto)
-    texto = emoji.demojize(texto)
-    texto = texto.strip()
-    return texto
+def _params_busca(query, campos, inicio_iso, fim_iso, since_id, next_token):
+    params = {
+        "query": query,
+        "start_time": inicio_iso,
+        "end_time": fim_iso,
+        "max_results": 100,
+        "tweet.fields": campos
+    }
 
+    # Passada incremental: since_id já delimita o início
+    if since_id:
+        params["since_id"] = since_id
+        del params["start_time"]
 
-def fazer_requisicao_com_retry(url, headers, params):
+    if next_token:
+        params["next_token"] = next_token
+
+    return params
+
+
+@cronometrado("coleta.paginacao_conversa")
+def coletar_respostas_conversa(conversation_id, id_perfil, inicio_iso, fim_iso, cliente, checkpoint, base_url=BASE_URL):
     """
-    Faz requisição tratando erro 429 (rate limit)
-    sem perder dados.
+    Pagina as respostas de um conversation_id, registrando cada página no checkpoint.
+
+    A paginação começa do cursor salvo no checkpoint (retomada) ou, se a
+    conversa já foi concluída antes, busca só respostas mais novas (since_id).
+
+    Returns:
+        bool: True se a conversa foi paginada até o fim
     """
-    while True:
-        response = requests.get(url, headers=headers, params=params)
+    since_id, next_token = checkpoint.iniciar_passada_conversa(conversation_id)
 
-        if response.status_code == 200:
-            return response
+    while True:
+        params_respostas = _params_busca(
+            f"conversation_id:{conversation_id} lang:pt",
+            "id,text,created_at,public_metrics,in_reply_to_user_id",
+            inicio_iso,
+            fim_iso,
+            since_id,
+            next_token
+        )
 
-        if response.status_code == 429:
-            reset_time = response.headers.get("x-rate-limit-reset")
+        try:
+            response = cliente.get(base_url, params_respostas)
 
-            if reset_time:
-                tempo_espera = int(reset_time) - int(time.time())
-                tempo_espera = max(tempo_espera, 5)
-            else:
-                tempo_espera = 60
+            json_resp = response.json()
+            data = json_resp.get("data", [])
+            meta = json_resp.get("meta", {})
 
-            print(f"[INFO] Rate limit atingido. Aguardando {tempo_espera} segundos...")
-            time.sleep(tempo_espera)
-            continue
+            selecionados = [t for t in data if t.get("in_reply_to_user_id") == id_perfil]
+            with medir("coleta.limpar_texto", itens=len(selecionados)):
+                limpos = limpar_textos([t["text"] for t in selecionados])
+
+            respostas = [
+                {
+                    "id_tweet": t["id"],
+                    "texto": t["text"],
+                    "retweets": t.get("public_metrics", {}).get("retweet_count", 0),
+                    "likes": t.get("public_metrics", {}).get("like_count", 0),
+                    "texto_limpo": limpo,
+                    "timestamp": t["created_at"]
+                }
+                for t, limpo in zip(selecionados, limpos)
+            ]
+            contar("coleta.paginas")
+            contar("coleta.tweets", len(respostas))
+
+            next_token = meta.get("next_token") if data else None
+            checkpoint.registrar_pagina_respostas(conversation_id, data, respostas, next_token)
+
+            if not next_token:
+                return True
 
-        print(f"[ERRO] Requisição falhou: {response.status_code} - {response.text}")
-        time.sleep(5)
+        except Exception as e:
+            # O cursor da conversa fica no checkpoint e será retomado na próxima execução
+            print(f"[ERRO] Falha na coleta de respostas da conversa {conversation_id}: {e}")
+            return False
 
 
-def coletar_tweets(janela, perfil, id_perfil):
+def _preparar_emoji():
     """
-    Coleta TODOS os tweets resposta aos tweets publicados
-    pelo perfil oficial do clube dentro do intervalo informado.
+    emoji.demojize monta sua árvore de busca na primeira chamada, sem trava:
+    threads concorrentes podem usar a árvore ainda incompleta e deixar
+    emojis sem conversão. A primeira chamada é feita antes de abrir as
+    threads da coleta.
     """
+    emoji.demojize("\U0001F389")
 
-    inicio, fim = janela
 
-    inicio_utc = inicio.astimezone(timezone.utc)
-    fim_utc = fim.astimezone(timezone.utc)
+def iso_utc(instante):
+    """
+    Converte um datetime com fuso para o formato ISO 8601 aceito pela API (UTC, sufixo Z).
+    """
+    return instante.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
 
-    inicio_iso = inicio_utc.isoformat().replace("+00:00", "Z")
-    fim_iso = fim_utc.isoformat().replace("+00:00", "Z")
 
-    headers = {"Authorization": f"Bearer {API_BEARER_TOKEN}"}
+@cronometrado("coleta.passada")
+def coletar_passada(checkpoint, perfil, id_perfil, inicio_iso, fim_iso, cliente, max_threads=COLETA_THREADS, base_url=BASE_URL):
+    """
+    Executa uma passada de coleta sobre o checkpoint: pagina os tweets do
+    clube e, em paralelo, as respostas de cada conversation_id. Conversas
+    já concluídas em passadas anteriores buscam só respostas novas (since_id).
 
-    tweets_acumulados = []
-    ids_unicos = set()
+    Returns:
+        int: Quantidade de paginações (tweets do clube e conversas) que não chegaram ao fim
+    """
+    _preparar_emoji()
 
     # ==================================================
     # 1) BUSCAR TODOS OS TWEETS DO CLUBE NO INTERVALO
     # ==================================================
     query_clube = f"from:{perfil} lang:pt"
-    next_token_clube = None
-    tweets_clube = []
-
-    while True:
-        params_clube = {
-            "query": query_clube,
-            "start_time": inicio_iso,
-            "end_time": fim_iso,
-            "max_results": 100,
-            "tweet.fields": "id,conversation_id,created_at"
-        }
+    since_id_clube, next_token_clube = checkpoint.iniciar_passada_clube()
+    clube_incompleto = 0
 
-        if next_token_clube:
-            params_clube["next_token"] = next_token_clube
+    with medir("coleta.paginacao_clube"):
+        while True:
+            params_clube = _params_busca(
+                query_clube,
+                "id,conversation_id,created_at",
+                inicio_iso,
+                fim_iso,
+                since_id_clube,
+                next_token_clube
+            )
 
-        try:
-            resp_clube = fazer_requisicao_com_retry(BASE_URL, headers, params_clube)
+            try:
+                resp_clube = cliente.get(base_url, params_clube)
 
-            json_resp = resp_clube.json()
-            data = json_resp.get("data", [])
-            meta = json_resp.get("meta", {})
+                json_resp = resp_clube.json()
+                data = json_resp.get("data", [])
+                meta = json_resp.get("meta", {})
 
-            if not data:
-                break
+                next_token_clube = meta.get("next_token") if data else None
+                checkpoint.registrar_pagina_clube(data, next_token_clube)
+                contar("coleta.paginas_clube")
 
-            tweets_clube.extend(data)
+                if not next_token_clube:
+                    break
 
-            next_token_clube = meta.get("next_token")
-            if not next_token_clube:
+            except Exception as e:
+                print(f"[ERRO] Exceção ao buscar tweets do clube: {e}")
+                clube_incompleto = 1
                 break
 
-            time.sleep(1)
-
-        except Exception as e:
-            print(f"[ERRO] Exceção ao buscar tweets do clube: {e}")
-            break
-
     # ==================================================
     # 2) BUSCAR TODAS AS RESPOSTAS PARA CADA CONVERSATION_ID
     # ==================================================
-    for tweet_clube in tweets_clube:
-        conversation_id = tweet_clube["conversation_id"]
-        next_token = None
+    conversation_ids = [t["conversation_id"] for t in checkpoint.tweets_clube()]
+
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        futuros = [
+            executor.submit(
+                coletar_respostas_conversa,
+                conversation_id,
+                id_perfil,
+                inicio_iso,
+                fim_iso,
+                cliente,
+                checkpoint,
+                base_url
+            )
+            for conversation_id in conversation_ids
+        ]
+        return clube_incompleto + sum(1 for futuro in futuros if not futuro.result())
+
+
+def _coletar_no_checkpoint(janela, perfil, id_perfil, max_threads, base_url, cliente, pasta_checkpoint):
+    """
+    Executa a passada de coleta e devolve o checkpoint com as respostas.
+    """
+    inicio, fim = janela
 
-        while True:
-            params_respostas = {
-                "query": f"conversation_id:{conversation_id} lang:pt",
-                "start_time": inicio_iso,
-                "end_time": fim_iso,
-                "max_results": 100,
-                "tweet.fields": "id,text,created_at,public_metrics,in_reply_to_user_id"
-            }
+    inicio_iso = iso_utc(inicio)
+    fim_iso = iso_utc(fim)
 
-            if next_token:
-                params_respostas["next_token"] = next_token
+    if cliente is None:
+        cliente = ClienteAPI()
 
-            try:
-                response = fazer_requisicao_com_retry(BASE_URL, headers, params_respostas)
+    checkpoint = CheckpointColeta(pasta_checkpoint, (inicio_iso, fim_iso))
 
-                json_resp = response.json()
-                data = json_resp.get("data", [])
-                meta = json_resp.get("meta", {})
+    incompletas = coletar_passada(
+        checkpoint, perfil, id_perfil, inicio_iso, fim_iso, cliente, max_threads, base_url
+    )
 
-                if not data:
-                    break
+    if incompletas:
+        print(f"[ERRO] {incompletas} paginações não foram coletadas até o fim"
+              + (" (serão retomadas na próxima execução)" if pasta_checkpoint else ""))
 
-                respostas = [
-                    t for t in data
-                    if t.get("in_reply_to_user_id") == id_perfil
-                ]
-
-                for t in respostas:
-                    if t["id"] in ids_unicos:
-                        continue
-
-                    ids_unicos.add(t["id"])
-
-                    tweets_acumulados.append({
-                        "id_tweet": t["id"],
-                        "texto": t["text"],
-                        "retweets": t.get("public_metrics", {}).get("retweet_count", 0),
-                        "likes": t.get("public_metrics", {}).get("like_count", 0),
-                        "texto_limpo": limpar_texto(t["text"]),
-                        "timestamp": t["created_at"],
-                        "janela": inicio
-                    })
-
-                next_token = meta.get("next_token")
-                if not next_token:
-                    break
+    print(f"[INFO] Total coletado no intervalo: {checkpoint.total_respostas()} tweets")
+    return checkpoint
 
-                time.sleep(1)
 
-            except Exception as e:
-                print(f"[ERRO] Falha na coleta de respostas: {e}")
-                break
+def coletar_tweets(
+        janela,
+        perfil,
+        id_perfil,
+        max_threads=COLETA_THREADS,
+        base_url=BASE_URL,
+        cliente=None,
+        pasta_checkpoint=None
+):
+    """
+    Coleta TODOS os tweets resposta aos tweets publicados
+    pelo perfil oficial do clube dentro do intervalo informado.
+
+    As respostas de cada conversation_id são coletadas em paralelo
+    (max_threads), pelo mesmo ClienteAPI (sessão keep-alive e limitador
+    de taxa compartilhados). O resultado é juntado na ordem dos tweets
+    do clube, então a saída é a mesma da coleta sequencial.
+
+    Com pasta_checkpoint, o estado é gravado a cada página: uma coleta
+    interrompida é retomada de onde parou e uma nova execução para a
+    mesma partida busca apenas as respostas mais novas (since_id).
+
+    Args:
+        janela (tuple): (inicio, fim) em datetime com fuso
+        perfil (str): Username do clube
+        id_perfil (str): ID do perfil do clube
+        max_threads (int): Conversas coletadas ao mesmo tempo
+        base_url (str): Endpoint de busca (permite apontar para uma API local de testes)
+        cliente (ClienteAPI): Cliente compartilhado da execução. Se None, cria um
+        pasta_checkpoint (str): Pasta do checkpoint da partida. Se None, não persiste o estado
+    """
+    checkpoint = _coletar_no_checkpoint(
+        janela, perfil, id_perfil, max_threads, base_url, cliente, pasta_checkpoint
+    )
+
+    tweets_acumulados = checkpoint.respostas_ordenadas()
+    checkpoint.fechar()
+
+    for tweet in tweets_acumulados:
+        tweet["janela"] = janela[0]
 
-    print(f"[INFO] Total coletado no intervalo: {len(tweets_acumulados)} tweets")
-    return tweets_acumulados
\ No newline at end of file
+    return tweets_acumulados
@@ -7,9 +7,19 @@ import os
 load_dotenv()
 
 # Token da API do X
+# A validação fica em obter_token_api(): comandos que não acessam a API
+# (reagregação de CSVs, gráficos) não precisam do token.
 API_BEARER_TOKEN = os.getenv("X_API_TOKEN")
-if API_BEARER_TOKEN is None:
-    raise RuntimeError("X_API_TOKEN não encontrado no arquivo .env")
+
+
+def obter_token_api():
+    """
+    Retorna o token da API do X, exigindo que esteja configurado.
+    """
+    if API_BEARER_TOKEN is None:
+        raise RuntimeError("X_API_TOKEN não encontrado no arquivo .env")
+    return API_BEARER_TOKEN
+
 
 # Perfil do clube
 PERFIL_SPFC = "SaoPauloFC"
@@ -18,6 +28,27 @@ PERFIL_SPFC = "SaoPauloFC"
 LIMITE_PRE_JOGO = 75
 LIMITE_DURANTE_POS = 100
 
+# Coleta concorrente (respostas de vários conversation_id em paralelo)
+COLETA_THREADS = 8                   # conversas coletadas ao mesmo tempo
+COLETA_REQUISICOES_POR_SEGUNDO = 2.0  # taxa do token bucket compartilhado
+COLETA_RAJADA = 5                    # requisições permitidas em rajada
+
+# Cliente HTTP da API do X (sessão keep-alive compartilhada)
+API_POOL_CONEXOES = 16      # conexões mantidas no pool (>= COLETA_THREADS)
+API_TIMEOUT_CONEXAO = 5     # segundos para abrir a conexão
+API_TIMEOUT_LEITURA = 30    # segundos para receber a resposta
+API_MAX_TENTATIVAS = 6      # tentativas em falhas de rede e erros 5xx
+API_BACKOFF_BASE = 1.0      # espera inicial (s) do backoff exponencial
+API_BACKOFF_MAX = 60.0      # espera máxima (s) entre tentativas
+
+# Checkpoint da coleta (retomada e execuções incrementais por partida)
+CHECKPOINT_PASTA = "data/checkpoints"
+
+# Modo ao vivo (python main.py --ao-vivo)
+AO_VIVO_INTERVALO = 60      # segundos entre passadas de coleta
+AO_VIVO_ATRASO_API = 30     # end_time fica este tanto no passado (a API exige >= 10 s)
+AO_VIVO_TAMANHO_FILA = 4    # lotes aguardando classificação (contrapressão na coleta)
+
 # Categorias
 EMOCOES = ["raiva", "alegria", "frustracao", "ironia", "neutro"]
 
@@ -74,6 +105,100 @@ EPOCHS = 5             # número de épocas de treinamento
 LEARNING_RATE = 2e-5   # taxa de aprendizado
 WARMUP_RATIO = 0.1     # proporção de warmup steps
 WEIGHT_DECAY = 0.01    # decay de peso para regularização
+TOKENIZACAO_CACHE_PASTA = "./cache/tokenizacao"  # corpus rotulado já tokenizado (por tokenizer e MAX_LEN)
+
+# Busca de hiperparâmetros (python -m src.busca_hiperparametros)
+# Cada tentativa sorteia um valor de cada lista; a melhor (F1 macro na validação)
+# é promovida para MODELO_PATH/final
+BUSCA_ESPACO = {
+    "learning_rate": [1e-5, 2e-5, 3e-5, 5e-5],
+    "batch_size": [8, 16, 32],
+    "epochs": [EPOCHS],
+    "warmup_ratio": [0.0, 0.1],
+    "weight_decay": [0.0, 0.01],
+    "max_len": [64, MAX_LEN]
+}
+BUSCA_TENTATIVAS = 12               # configurações sorteadas do espaço
+BUSCA_PROCESSOS = 2                 # tentativas treinadas ao mesmo tempo
+BUSCA_THREADS_POR_TENTATIVA = None  # threads do torch por tentativa (None = núcleos / processos)
+BUSCA_PODA_MIN_TENTATIVAS = 3       # tentativas avaliadas na época antes de podar alguém
+BUSCA_PODA_EPOCA_MINIMA = 1         # épocas iniciais sem poda
+
+# Destilação para um modelo aluno menor (python -m src.destilacao)
+# O aluno fica em MODELO_PATH/aluno e é usado com INFERENCIA_BACKEND = "aluno"
+DESTILACAO_CAMADAS = 4               # camadas do aluno copiadas do professor (MODELO_PATH/final)
+DESTILACAO_TEMPERATURA = 2.0         # suaviza as probabilidades do professor
+DESTILACAO_ALFA = 0.5                # peso da perda com os rótulos (1 - alfa: divergência com o professor)
+DESTILACAO_EPOCAS = 10
+DESTILACAO_LEARNING_RATE = 5e-5
+DESTILACAO_CONFIANCA_MINIMA = 0.7    # confiança do professor para aceitar um pseudo-rótulo
+
+# Cascata: modelo linear barato antes do BERTimbau (python -m src.cascata)
+# O primeiro estágio fica em MODELO_PATH/cascata; sem ele, tudo vai para o BERTimbau
+CASCATA_ATIVA = True
+CASCATA_LIMIAR = 0.9                 # confiança mínima do primeiro estágio para dispensar o BERTimbau
+CASCATA_DIMENSAO_HASH = 2**16        # atributos dos n-gramas (hashing de palavras e caracteres)
+CASCATA_LIMIARES_CURVA = [0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.98, 0.99]
+
+# Duplicatas (src/deduplicacao.py): cópias exatas do texto normalizado formam um grupo,
+# classificado uma vez pelo representante; o rótulo vale para todos
+DEDUP_ATIVA = True
+# Agrupa também quase-duplicatas (MinHash/LSH). Desligado por padrão: textos quase
+# iguais com sentido oposto ("jogou bem" / "jogou mal") cairiam no mesmo grupo
+DEDUP_QUASE_DUPLICATAS = False
+DEDUP_TAMANHO_SHINGLE = 5            # caracteres (bytes UTF-8) por shingle
+DEDUP_PERMUTACOES = 64               # tamanho da assinatura MinHash
+DEDUP_BANDAS = 16                    # bandas do LSH (DEDUP_PERMUTACOES / DEDUP_BANDAS linhas cada)
+DEDUP_SIMILARIDADE = 0.8             # Jaccard estimado mínimo com o representante do grupo
+DEDUP_MAXIMO_GRUPOS = 50_000         # grupos guardados por execução (limita a memória do índice)
+DEDUP_MAXIMO_POR_GRUPO = 3           # cópias de um grupo que contam no peso "sem_spam"
+
+# Backend de inferência: "pytorch" (fp32), "int8" (quantização dinâmica), "onnx"
+# ou "aluno" (modelo destilado)
+# Os artefatos de "int8" e "onnx" são gerados com: python -m src.conversao
+# e o "aluno" com: python -m src.destilacao
+INFERENCIA_BACKEND = "pytorch"
+
+# Inferência em lote (analisar_tweets)
+INFERENCIA_BATCH_SIZE = 64     # número máximo de tweets por micro-batch
+INFERENCIA_MAX_TOKENS = 4096   # orçamento de tokens (tweets x maior sequência) por micro-batch
+
+# Pool de processos para inferência (opcional)
+INFERENCIA_PROCESSOS = 1                 # 1 = sem pool, tudo no processo principal
+INFERENCIA_THREADS_POR_PROCESSO = None   # threads do torch por worker (None = núcleos / processos)
+INFERENCIA_TAMANHO_SHARD = 512           # tweets enviados a um worker por tarefa
+
+# Pipeline em fluxo (src/pipeline.py)
+PIPELINE_TAMANHO_LOTE = 2048   # tweets classificados e atribuídos às janelas por vez
+
+# Agregação por janela (src/agregacao.py, MatrizEmocoes)
+AGREGACAO_FAIXAS_CONFIANCA = 10   # faixas de confiança guardadas (filtros exatos em 0.1, 0.2, ...)
+AGREGACAO_JANELAS_MOVEIS = 4      # janelas (15 min cada) da média móvel na série temporal
+
+# Gráficos (src/visualizacao.py): matplotlib com canvas Agg, sem janela
+VISUALIZACAO_PROCESSOS = 2     # processos que renderizam os gráficos no lote e na reanálise (0 = no thread principal)
+VISUALIZACAO_DPI = 100
+
+# Execução em lote (python main.py --partidas tabela.csv)
+LOTE_PARTIDAS_SIMULTANEAS = 3  # partidas coletadas/classificadas ao mesmo tempo
+
+# Reanálise offline de partidas já coletadas (python -m src.reanalise)
+REANALISE_PASTAS_SIMULTANEAS = 4  # pastas de partidas lidas ao mesmo tempo
+
+# Formato dos dados de cada janela: "csv", "parquet" ou "ambos"
+# O Parquet (src/parquet.py) é um dataset por partida, particionado por etapa e janela
+FORMATO_SAIDA = "csv"
+PARQUET_COMPRESSAO = "zstd"    # codec das colunas ("zstd", "snappy", "gzip" ou "none")
+
+# Cache persistente de classificações (texto normalizado + impressão do modelo)
+CACHE_ATIVO = True
+CACHE_PATH = "./cache/classificacoes.sqlite"
+CACHE_MAX_MEMORIA = 100_000    # entradas no LRU em memória
+CACHE_MAX_DISCO = 2_000_000    # entradas no arquivo em disco
+
+# Tempos por etapa e contadores da execução (src/metricas.py)
+# Gravados em resultados/<partida>/metrics.json; desativado, o custo é quase nulo
+METRICAS_ATIVAS = True
 
 # Divisão dos dados
 TEST_SIZE = 0.15       # 15% dos dados para teste
@@ -0,0 +1,201 @@
+# /src/conversao.py
+
+"""
+Conversão do modelo fine-tuning para os backends otimizados de inferência
+e verificação de paridade de acurácia entre eles.
+
+Uso:
+    python -m src.conversao --backend int8
+    python -m src.conversao --backend onnx
+    python -m src.conversao --paridade --csv data/texto_bruto.csv
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from sklearn.metrics import accuracy_score, f1_score
+from .backends import (
+    ARQUIVO_INT8,
+    ARQUIVO_ONNX,
+    ARQUIVO_ORIGEM,
+    BACKENDS,
+    carregar_backend,
+    pasta_backend,
+    quantizar_int8
+)
+from .cache import impressao_modelo
+from .config import MODELO_PATH, EMOCAO_TO_ID, ID_TO_EMOCAO
+
+
+def _preparar_destino(backend):
+    """
+    Cria a pasta do artefato com tokenizer e config copiados de final/.
+    """
+    origem = pasta_backend("pytorch")
+    destino = pasta_backend(backend)
+
+    if not os.path.exists(origem):
+        raise RuntimeError(
+            f"Modelo não encontrado em {origem}. "
+            "Execute primeiro o fine-tuning com src/fine_tuning.py"
+        )
+
+    os.makedirs(destino, exist_ok=True)
+
+    for nome in os.listdir(origem):
+        if nome.endswith((".json", ".txt", ".model")):
+            shutil.copy2(os.path.join(origem, nome), destino)
+
+    return origem, destino
+
+
+def _registrar_origem(origem, destino):
+    """
+    Grava a impressão digital do modelo de origem junto ao artefato.
+    """
+    with open(os.path.join(destino, ARQUIVO_ORIGEM), "w", encoding="utf-8") as f:
+        json.dump({"impressao": impressao_modelo(origem)}, f, indent=4)
+
+
+def converter_int8():
+    """
+    Gera MODELO_PATH/int8 com os pesos quantizados dinamicamente (int8).
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    origem, destino = _preparar_destino("int8")
+
+    print(f"[INFO] Quantizando modelo de: {origem}")
+    model = AutoModelForSequenceClassification.from_pretrained(origem).eval()
+    model = quantizar_int8(model)
+
+    torch.save(model.state_dict(), os.path.join(destino, ARQUIVO_INT8))
+    _registrar_origem(origem, destino)
+
+    print(f"[INFO] Modelo int8 salvo em: {destino}")
+
+
+def converter_onnx(opset=17):
+    """
+    Exporta o modelo para MODELO_PATH/onnx/modelo.onnx com eixos dinâmicos
+    de batch e sequência (compatível com o padding dinâmico da inferência).
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    origem, destino = _preparar_destino("onnx")
+
+    print(f"[INFO] Exportando modelo de: {origem}")
+    tokenizer = AutoTokenizer.from_pretrained(origem)
+    model = AutoModelForSequenceClassification.from_pretrained(origem).eval()
+
+    exemplo = tokenizer(["vamos tricolor", "jogo"], padding=True, return_tensors="pt")
+
+    # Entradas posicionais na mesma ordem do forward do BERT
+    nomes = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in exemplo]
+
+    torch.onnx.export(
+        model,
+        tuple(exemplo[nome] for nome in nomes),
+        os.path.join(destino, ARQUIVO_ONNX),
+        input_names=nomes,
+        output_names=["logits"],
+        dynamic_axes={
+            **{nome: {0: "batch", 1: "sequencia"} for nome in nomes},
+            "logits": {0: "batch"}
+        },
+        opset_version=opset,
+        dynamo=False
+    )
+    _registrar_origem(origem, destino)
+
+    print(f"[INFO] Modelo ONNX salvo em: {destino}")
+
+
+# ==================================================
+# PARIDADE DE ACURÁCIA
+# ==================================================
+def avaliar_paridade(csv_path, backends=BACKENDS):
+    """
+    Avalia os backends no conjunto de teste do fine-tuning (mesma divisão
+    e seed de src/fine_tuning.py) e compara acurácia, F1 macro e vazão.
+
+    Args:
+        csv_path (str): CSV com os tweets rotulados (texto_bruto, label)
+        backends (tuple): Backends a avaliar
+
+    Returns:
+        dict: Métricas por backend
+    """
+    from .analise_emocoes import classificar_emocoes
+    from .coleta import limpar_texto
+    from .fine_tuning import preparar_dados, dividir_dados
+
+    textos, labels = preparar_dados(csv_path)
+    _, _, X_test, _, _, y_test = dividir_dados(textos, labels)
+
+    # Mesmo pré-processamento aplicado aos tweets coletados
+    X_test = [limpar_texto(str(t)) for t in X_test]
+
+    resultados = {}
+    referencia = None
+
+    for backend in backends:
+        try:
+            modelo = carregar_backend(backend)
+        except RuntimeError as e:
+            print(f"[ERRO] Backend {backend} indisponível: {e}")
+            continue
+
+        classificar_emocoes(X_test[:16], modelo=modelo)
+
+        inicio = time.perf_counter()
+        predicoes = classificar_emocoes(X_test, modelo=modelo)
+        tempo = time.perf_counter() - inicio
+
+        y_pred = [EMOCAO_TO_ID[emocao] for emocao, _ in predicoes]
+        if referencia is None:
+            referencia = y_pred
+
+        resultados[backend] = {
+            "accuracy": accuracy_score(y_test, y_pred),
+            "f1_macro": f1_score(y_test, y_pred, average="macro", labels=list(ID_TO_EMOCAO)),
+            "concordancia_primeiro_backend": accuracy_score(referencia, y_pred),
+            "tweets_por_segundo": len(X_test) / tempo
+        }
+
+    print("\n=== Paridade entre backends (conjunto de teste) ===")
+    for backend, metricas in resultados.items():
+        print(
+            f"{backend:<8} acc={metricas['accuracy']:.4f} "
+            f"f1_macro={metricas['f1_macro']:.4f} "
+            f"concordância={metricas['concordancia_primeiro_backend']:.4f} "
+            f"{metricas['tweets_por_segundo']:.1f} tweets/s"
+        )
+
+    caminho = os.path.join(MODELO_PATH, "paridade_backends.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=4, ensure_ascii=False)
+    print(f"[INFO] Paridade salva em: {caminho}")
+
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Conversão do modelo para backends otimizados")
+    parser.add_argument("--backend", choices=["int8", "onnx", "todos"])
+    parser.add_argument("--paridade", action="store_true", help="Compara acurácia e vazão dos backends")
+    parser.add_argument("--csv", default="data/texto_bruto.csv")
+    args = parser.parse_args()
+
+    if args.backend in ("int8", "todos"):
+        converter_int8()
+    if args.backend in ("onnx", "todos"):
+        converter_onnx()
+    if args.paridade:
+        avaliar_paridade(args.csv)
+    if not args.backend and not args.paridade:
+        parser.print_help()
@@ -0,0 +1,219 @@
+# /src/deduplicacao.py
+
+"""
+Agrupamento de duplicatas antes da classificação.
+
+As conversas das partidas têm muitas cópias: o mesmo grito com uma
+exclamação a mais, textos colados de outra resposta, floods de bots.
+Sem agrupamento, cada cópia passa pela cascata / BERTimbau e conta como
+um torcedor a mais nos percentuais.
+
+Por padrão, o Deduplicador agrupa apenas cópias exatas do texto
+normalizado (normalizar_textos, a mesma chave do cache), por um
+dicionário. Com DEDUP_QUASE_DUPLICATAS = True (opt-in), também compara
+cada texto novo com os representantes dos grupos já vistos na execução:
+
+    shingles de DEDUP_TAMANHO_SHINGLE bytes -> assinatura MinHash
+    (DEDUP_PERMUTACOES hashes universais) -> LSH em DEDUP_BANDAS bandas
+    -> candidatos conferidos pelo Jaccard estimado (>= DEDUP_SIMILARIDADE)
+
+Essa comparação não enxerga o sentido: "jogou muito bem" e "jogou muito
+mal" têm quase todos os shingles em comum e cairiam no mesmo grupo, com
+o rótulo de um copiado para o outro. Só o representante (primeiro texto
+do grupo) é classificado e o rótulo vale para todos os membros,
+inclusive os dos lotes seguintes.
+
+Cada linha recebe também a ordem da cópia no grupo (coluna duplicata da
+TabelaTweets: 0 para a primeira). O peso "sem_spam" da MatrizEmocoes e
+percentual_emocoes(..., sem_spam=True) contam no máximo
+DEDUP_MAXIMO_POR_GRUPO cópias de cada grupo.
+"""
+
+import numpy as np
+from .config import (
+    DEDUP_ATIVA,
+    DEDUP_BANDAS,
+    DEDUP_MAXIMO_GRUPOS,
+    DEDUP_PERMUTACOES,
+    DEDUP_QUASE_DUPLICATAS,
+    DEDUP_SIMILARIDADE,
+    DEDUP_TAMANHO_SHINGLE,
+    RANDOM_SEED
+)
+from .metricas import contar, medir
+
+# Primo de Mersenne dos hashes universais (a * x + b) mod p: com a, x < 2^31
+# o produto cabe em uint64
+_PRIMO = np.uint64(2**31 - 1)
+
+
+def assinaturas_minhash(textos, a, b, tamanho_shingle=DEDUP_TAMANHO_SHINGLE):
+    """
+    Assinaturas MinHash de vários textos de uma vez. Os shingles são
+    janelas de `tamanho_shingle` bytes do UTF-8 (textos menores são
+    completados com espaços), lidas como inteiros direto do buffer.
+
+    Args:
+        textos (list): Textos (não vazios)
+        a, b (np.ndarray): Coeficientes uint64 dos hashes (um par por permutação)
+        tamanho_shingle (int): Bytes por shingle (até 7)
+
+    Returns:
+        np.ndarray: Matriz textos x permutações (uint32)
+    """
+    k = tamanho_shingle
+    codificados = [texto.encode("utf-8").ljust(k) for texto in textos]
+    comprimentos = np.fromiter(map(len, codificados), dtype=np.int64, count=len(codificados))
+
+    buffer = np.frombuffer(b"".join(codificados), dtype=np.uint8).astype(np.uint64)
+    m = len(buffer) - k + 1
+    valores = np.zeros(m, dtype=np.uint64)
+    for j in range(k):
+        valores |= buffer[j:j + m] << np.uint64(8 * j)
+
+    # Shingles de cada texto: posições inicio .. inicio + comprimento - k
+    quantidades = comprimentos - k + 1
+    inicios = np.concatenate(([0], np.cumsum(comprimentos)[:-1]))
+    primeiros = np.concatenate(([0], np.cumsum(quantidades)[:-1]))
+    posicoes = np.arange(quantidades.sum()) + np.repeat(inicios - primeiros, quantidades)
+    shingles = valores[posicoes] % _PRIMO
+
+    assinaturas = np.empty((len(textos), len(a)), dtype=np.uint32)
+    for j in range(len(a)):
+        assinaturas[:, j] = np.minimum.reduceat((a[j] * shingles + b[j]) % _PRIMO, primeiros)
+
+    return assinaturas
+
+
+class Deduplicador:
+    """
+    Grupos de uma execução (uma partida). Guarda o rótulo do
+    representante de cada grupo e quantas cópias já apareceram; com
+    quase_duplicatas, também a assinatura e o índice LSH.
+
+    Args:
+        quase_duplicatas (bool): Agrupa textos parecidos (MinHash/LSH), não só iguais
+        permutacoes (int): Tamanho da assinatura MinHash
+        bandas (int): Bandas do LSH (permutacoes deve ser múltiplo)
+        similaridade (float): Jaccard estimado mínimo para entrar em um grupo
+        maximo_grupos (int): Acima disso, textos novos seguem sem grupo
+    """
+
+    def __init__(
+            self,
+            quase_duplicatas=DEDUP_QUASE_DUPLICATAS,
+            permutacoes=DEDUP_PERMUTACOES,
+            bandas=DEDUP_BANDAS,
+            similaridade=DEDUP_SIMILARIDADE,
+            maximo_grupos=DEDUP_MAXIMO_GRUPOS
+    ):
+        if permutacoes % bandas:
+            raise ValueError(f"DEDUP_PERMUTACOES ({permutacoes}) deve ser múltiplo de DEDUP_BANDAS ({bandas})")
+
+        rng = np.random.default_rng(RANDOM_SEED)
+        self.a = rng.integers(1, int(_PRIMO), size=permutacoes, dtype=np.uint64)
+        self.b = rng.integers(0, int(_PRIMO), size=permutacoes, dtype=np.uint64)
+        # Multiplicadores ímpares que combinam as linhas de uma banda em uma chave
+        self._mistura = rng.integers(1, 2**63, size=permutacoes // bandas, dtype=np.uint64) | np.uint64(1)
+
+        self.quase_duplicatas = quase_duplicatas
+        self.bandas = bandas
+        self.similaridade = similaridade
+        self.maximo_grupos = maximo_grupos
+
+        self.representantes = []   # texto do representante de cada grupo
+        self.tamanhos = []         # cópias vistas de cada grupo
+        self.rotulos = {}          # representante -> (emocao, confianca)
+        self._assinaturas = []
+        self._baldes = [{} for _ in range(bandas)]
+        self._exatos = {}          # texto -> grupo
+
+    def _chaves(self, assinaturas):
+        linhas = assinaturas.reshape(len(assinaturas), self.bandas, -1).astype(np.uint64)
+        return (linhas * self._mistura).sum(axis=2).tolist()
+
+    def _buscar(self, assinatura, chaves):
+        candidatos = {self._baldes[banda].get(chave) for banda, chave in enumerate(chaves)}
+        candidatos.discard(None)
+
+        melhor, maior = None, self.similaridade
+        for grupo in candidatos:
+            similaridade = float((self._assinaturas[grupo] == assinatura).mean())
+            if similaridade >= maior:
+                melhor, maior = grupo, similaridade
+
+        return melhor
+
+    def _novo_grupo(self, texto, assinatura, chaves):
+        grupo = len(self.representantes)
+        self.representantes.append(texto)
+        self.tamanhos.append(0)
+        if self.quase_duplicatas:
+            self._assinaturas.append(assinatura)
+            for banda, chave in enumerate(chaves):
+                self._baldes[banda].setdefault(chave, grupo)
+        return grupo
+
+    def agrupar(self, textos):
+        """
+        Coloca cada texto no grupo de um representante igual (ou parecido,
+        com quase_duplicatas), ou abre um grupo novo, e conta a cópia.
+
+        Args:
+            textos (list): Textos normalizados (não vazios)
+
+        Returns:
+            tuple: (representantes, ordens) - o texto do representante de cada
+                   posição (o próprio texto quando não há grupo) e a ordem da
+                   cópia no grupo (np.int32, 0 = primeira)
+        """
+        n = len(textos)
+        grupos = [self._exatos.get(texto) for texto in textos]
+        novos = [i for i, grupo in enumerate(grupos) if grupo is None]
+
+        with medir("inferencia.deduplicacao", itens=n):
+            if novos:
+                assinaturas = chaves = [None] * len(novos)
+                if self.quase_duplicatas:
+                    assinaturas = assinaturas_minhash([textos[i] for i in novos], self.a, self.b)
+                    chaves = self._chaves(assinaturas)
+
+                for linha, i in enumerate(novos):
+                    texto = textos[i]
+                    # Cópia exata de um texto novo deste mesmo lote
+                    grupo = self._exatos.get(texto)
+                    if grupo is None and self.quase_duplicatas:
+                        grupo = self._buscar(assinaturas[linha], chaves[linha])
+                    if grupo is None and len(self.representantes) < self.maximo_grupos:
+                        grupo = self._novo_grupo(texto, assinaturas[linha], chaves[linha])
+                    if grupo is not None and len(self._exatos) < 4 * self.maximo_grupos:
+                        self._exatos[texto] = grupo
+                    grupos[i] = grupo
+
+        representantes = list(textos)
+        ordens = np.zeros(n, dtype=np.int32)
+        agrupados = 0
+        for i, grupo in enumerate(grupos):
+            if grupo is None:
+                continue
+            representante = self.representantes[grupo]
+            if representante != textos[i]:
+                representantes[i] = representante
+                agrupados += 1
+            ordens[i] = self.tamanhos[grupo]
+            self.tamanhos[grupo] += 1
+
+        contar("deduplicacao.quase_duplicatas", agrupados)
+        contar("deduplicacao.copias_repetidas", int((ordens > 0).sum()))
+
+        return representantes, ordens
+
+
+def criar_deduplicador():
+    """
+    Returns:
+        Deduplicador: Índice novo para uma execução (None com DEDUP_ATIVA = False)
+    """
+    if not DEDUP_ATIVA:
+        return None
+    return Deduplicador()
@@ -0,0 +1,531 @@
+# /src/destilacao.py
+
+"""
+Destilação do BERTimbau fine-tuning (professor, MODELO_PATH/final) para um
+modelo aluno menor, usado na inferência com INFERENCIA_BACKEND = "aluno".
+
+- O aluno é o próprio professor com menos camadas (DESTILACAO_CAMADAS,
+  escolhidas em intervalos regulares e copiadas com os pesos) ou um BERT
+  compacto já salvo em disco (--aluno-base).
+- O aluno aprende com as probabilidades do professor suavizadas pela
+  temperatura (rótulos suaves) e com os rótulos do CSV:
+      perda = alfa * CE(rótulos) + (1 - alfa) * T² * KL(professor || aluno)
+- Opcionalmente, os tweets já coletados em data/ (sem rótulo) entram no
+  treino com o rótulo previsto pelo professor, quando a confiança dele
+  passa de DESTILACAO_CONFIANCA_MINIMA (pseudo-rótulos).
+
+Professor e aluno recebem os textos como na classificação das partidas
+(limpar_texto, depois minúsculas e sem acentos). Ao final, os dois são
+comparados no conjunto de teste do fine-tuning: F1 macro, latência,
+tamanho e pico de memória (RSS de um processo novo que carrega o modelo e
+classifica um lote), salvos em MODELO_PATH/destilacao.json.
+
+Uso:
+    python -m src.destilacao --csv data/texto_bruto.csv
+    python -m src.destilacao --csv data/texto_bruto.csv --camadas 2 --pseudo-rotulos
+    python -m src.destilacao --aluno-base ./bert_compacto --pseudo-rotulos data/SPFC_vs_Santos_08052024_2130_EXEC1
+"""
+
+import argparse
+import copy
+import glob
+import json
+import multiprocessing
+import os
+import re
+import resource
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sklearn.metrics import f1_score
+from .analise_emocoes import classificar_emocoes
+from .backends import BackendAluno, BackendPytorch, pasta_backend
+from .config import (
+    BATCH_SIZE,
+    DESTILACAO_ALFA,
+    DESTILACAO_CAMADAS,
+    DESTILACAO_CONFIANCA_MINIMA,
+    DESTILACAO_EPOCAS,
+    DESTILACAO_LEARNING_RATE,
+    DESTILACAO_TEMPERATURA,
+    EMOCAO_TO_ID,
+    ID_TO_EMOCAO,
+    EMOCOES,
+    MAX_LEN,
+    MODELO_PATH,
+    RANDOM_SEED,
+    WARMUP_RATIO,
+    WEIGHT_DECAY
+)
+from .fine_tuning import (
+    TweetsDataset,
+    argumentos_agrupamento,
+    argumentos_avaliacao,
+    argumentos_tokenizer,
+    compute_metrics,
+    dividir_dados,
+    preparar_dados
+)
+from .normalizacao import limpar_textos, normalizar_textos
+
+
+# ==================================================
+# MODELO ALUNO
+# ==================================================
+def criar_aluno(pasta_professor, num_camadas=DESTILACAO_CAMADAS, aluno_base=None):
+    """
+    Monta o modelo aluno.
+
+    Args:
+        pasta_professor (str): Modelo fine-tuning (MODELO_PATH/final)
+        num_camadas (int): Camadas mantidas do professor (ignorado com aluno_base)
+        aluno_base (str): Pasta de um BERT compacto já salvo. Se None, o aluno
+                          é o professor com num_camadas camadas
+
+    Returns:
+        tuple: (tokenizer, modelo) do aluno
+    """
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    if aluno_base:
+        print(f"[INFO] Aluno a partir de: {aluno_base}")
+        tokenizer = AutoTokenizer.from_pretrained(aluno_base)
+        aluno = AutoModelForSequenceClassification.from_pretrained(
+            aluno_base,
+            num_labels=len(EMOCOES),
+            id2label=ID_TO_EMOCAO,
+            label2id=EMOCAO_TO_ID,
+            ignore_mismatched_sizes=True
+        )
+        return tokenizer, aluno
+
+    tokenizer = AutoTokenizer.from_pretrained(pasta_professor)
+    professor = AutoModelForSequenceClassification.from_pretrained(pasta_professor)
+
+    total = professor.config.num_hidden_layers
+    num_camadas = min(num_camadas, total)
+    # Camadas em intervalos regulares, sempre com a primeira e a última
+    camadas = np.linspace(0, total - 1, num_camadas).round().astype(int).tolist()
+
+    config = copy.deepcopy(professor.config)
+    config.num_hidden_layers = num_camadas
+    aluno = AutoModelForSequenceClassification.from_config(config)
+
+    padrao_camada = re.compile(r"^(.*\.layer\.)(\d+)(\..*)$")
+    pesos_professor = professor.state_dict()
+    pesos_aluno = {}
+    for nome in aluno.state_dict():
+        encontrado = padrao_camada.match(nome)
+        origem = nome
+        if encontrado:
+            origem = f"{encontrado[1]}{camadas[int(encontrado[2])]}{encontrado[3]}"
+        pesos_aluno[nome] = pesos_professor[origem]
+    aluno.load_state_dict(pesos_aluno)
+
+    print(f"[INFO] Aluno: camadas {camadas} de {total} do professor")
+    return tokenizer, aluno
+
+
+class DatasetDestilacao(TweetsDataset):
+    """
+    TweetsDataset com as probabilidades do professor em cada exemplo.
+    """
+
+    def __init__(self, textos, labels, probs_professor, tokenizer, max_len):
+        # Sem cache em disco: os pseudo-rótulos mudam a cada execução
+        super().__init__(textos, labels, tokenizer, max_len, pasta_cache=None)
+        self.probs_professor = probs_professor
+
+    def __getitem__(self, idx):
+        exemplo = super().__getitem__(idx)
+        exemplo["probs_professor"] = self.probs_professor[idx]
+        return exemplo
+
+
+def _classe_trainer(temperatura, alfa):
+    """
+    Trainer com a perda de destilação (criado sob demanda: importa o transformers).
+    """
+    import torch
+    import torch.nn.functional as F
+    from transformers import Trainer
+
+    class TrainerDestilacao(Trainer):
+
+        def compute_loss(self, model, inputs, return_outputs=False, num_items_in_batch=None):
+            probs_professor = inputs.pop("probs_professor").float()
+            outputs = model(**inputs)
+
+            # softmax(log p / T) = softmax(logits / T) do professor
+            alvo = torch.softmax(torch.log(probs_professor.clamp_min(1e-12)) / temperatura, dim=-1)
+            divergencia = F.kl_div(
+                F.log_softmax(outputs.logits / temperatura, dim=-1),
+                alvo,
+                reduction="batchmean"
+            ) * temperatura ** 2
+
+            loss = alfa * outputs.loss + (1 - alfa) * divergencia
+            return (loss, outputs) if return_outputs else loss
+
+    return TrainerDestilacao
+
+
+# ==================================================
+# RÓTULOS DO PROFESSOR
+# ==================================================
+def rotular_com_professor(professor, textos):
+    """
+    Probabilidades do professor para textos já limpos (mesmo caminho da
+    classificação das partidas). Textos vazios ficam com None.
+    """
+    return [r[2] for r in classificar_emocoes(textos, probabilidades=True, modelo=professor)]
+
+
+def carregar_textos_coletados(pastas):
+    """
+    Textos limpos (texto_limpo) dos tweets gravados nas pastas de partidas,
+    sem repetições.
+    """
+    from .reanalise import lotes_por_etapa
+
+    textos = {}
+    for pasta in pastas:
+        try:
+            for _, tabela in lotes_por_etapa(pasta):
+                textos.update(dict.fromkeys(tabela.texto_limpo))
+        except FileNotFoundError as e:
+            print(f"[ERRO] {e}")
+
+    return list(textos)
+
+
+def pseudo_rotular(professor, textos, excluir=(), confianca_minima=DESTILACAO_CONFIANCA_MINIMA):
+    """
+    Rótulo do professor para textos sem rótulo, mantendo só os confiantes.
+
+    Args:
+        professor: Backend do professor
+        textos (list): Textos já limpos
+        excluir (iterable): Textos que não podem entrar (validação e teste)
+        confianca_minima (float): Probabilidade mínima da emoção prevista
+
+    Returns:
+        tuple: (textos, labels, probabilidades) aceitos
+    """
+    excluir = set(excluir)
+    textos = [t for t in textos if t and t.strip() and t not in excluir]
+    probs = rotular_com_professor(professor, textos)
+
+    aceitos = [
+        (texto, int(np.argmax(p)), p)
+        for texto, p in zip(textos, probs)
+        if p is not None and max(p) >= confianca_minima
+    ]
+    print(f"[INFO] Pseudo-rótulos: {len(aceitos)} de {len(textos)} textos (confiança >= {confianca_minima})")
+
+    if not aceitos:
+        return [], [], []
+    return tuple(list(coluna) for coluna in zip(*aceitos))
+
+
+# ==================================================
+# COMPARAÇÃO PROFESSOR x ALUNO
+# ==================================================
+def _tamanho_pasta_mb(pasta):
+    return sum(
+        os.path.getsize(os.path.join(pasta, nome))
+        for nome in os.listdir(pasta)
+        if nome.endswith((".safetensors", ".bin"))
+    ) / 1e6
+
+
+def _pico_rss_mb():
+    # ru_maxrss é informado em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _medir_memoria(classe, pasta, textos):
+    """
+    Executado em um processo novo: carrega o modelo e classifica um lote.
+
+    Returns:
+        tuple: (pico de RSS do processo, acréscimo sobre o processo só com
+                torch/transformers importados), em MB
+    """
+    # Bibliotecas carregadas antes da medida base: o acréscimo fica só com
+    # o modelo e o lote (o transformers carrega os módulos no primeiro acesso)
+    import torch
+    import transformers
+
+    torch.set_num_threads(torch.get_num_threads())
+    transformers.AutoTokenizer, transformers.AutoModelForSequenceClassification
+
+    base = _pico_rss_mb()
+
+    classificar_emocoes(textos, modelo=classe(pasta))
+
+    pico = _pico_rss_mb()
+    return pico, pico - base
+
+
+def medir_memoria(classe, pasta, textos):
+    """
+    Pico de memória de um modelo em um processo "spawn" separado, para que
+    o professor já carregado (e o treino) não entrem na medida.
+
+    Args:
+        classe: Classe do backend (BackendPytorch, BackendAluno, ...)
+        pasta (str): Pasta do modelo
+        textos (list): Lote classificado depois de carregar
+
+    Returns:
+        tuple: (pico de RSS, acréscimo do modelo) em MB
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(_medir_memoria, classe, pasta, textos).result()
+
+
+def comparar_modelos(modelos, X_test, y_test, repeticoes_latencia=200, tamanho_lote_memoria=64):
+    """
+    F1 macro, vazão em lote, latência de um tweet, tamanho e pico de
+    memória de cada modelo no conjunto de teste.
+
+    Args:
+        modelos (dict): {nome: (backend, pasta)}
+        X_test (list): Textos já limpos
+        y_test (list): IDs das emoções
+        tamanho_lote_memoria (int): Tweets classificados na medida de memória
+
+    Returns:
+        dict: Métricas por modelo
+    """
+    resultados = {}
+
+    for nome, (modelo, pasta) in modelos.items():
+        classificar_emocoes(X_test[:16], modelo=modelo)
+
+        inicio = time.perf_counter()
+        predicoes = classificar_emocoes(X_test, modelo=modelo)
+        tempo_lote = time.perf_counter() - inicio
+
+        latencias = []
+        for texto in X_test[:repeticoes_latencia]:
+            inicio = time.perf_counter()
+            classificar_emocoes([texto], modelo=modelo)
+            latencias.append(time.perf_counter() - inicio)
+
+        pico_rss, memoria_modelo = medir_memoria(type(modelo), pasta, X_test[:tamanho_lote_memoria])
+
+        y_pred = [EMOCAO_TO_ID[emocao] for emocao, _ in predicoes]
+        resultados[nome] = {
+            "f1_macro": f1_score(y_test, y_pred, average="macro", labels=list(ID_TO_EMOCAO)),
+            "tweets_por_segundo": len(X_test) / tempo_lote,
+            "latencia_p50_ms": float(np.percentile(latencias, 50) * 1000),
+            "latencia_p95_ms": float(np.percentile(latencias, 95) * 1000),
+            "parametros_milhoes": sum(p.numel() for p in modelo.model.parameters()) / 1e6,
+            "tamanho_mb": _tamanho_pasta_mb(pasta),
+            "memoria_pico_mb": pico_rss,
+            "memoria_modelo_mb": memoria_modelo
+        }
+
+    print(f"\n=== Professor x aluno (teste: {len(X_test)} tweets) ===")
+    print(f"{'modelo':<10}{'F1 macro':>9}{'tweets/s':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+          f"{'params (M)':>12}{'disco (MB)':>12}{'RSS (MB)':>10}{'modelo (MB)':>13}")
+    for nome, m in resultados.items():
+        print(f"{nome:<10}{m['f1_macro']:>9.4f}{m['tweets_por_segundo']:>10.1f}{m['latencia_p50_ms']:>10.1f}"
+              f"{m['latencia_p95_ms']:>10.1f}{m['parametros_milhoes']:>12.1f}{m['tamanho_mb']:>12.1f}"
+              f"{m['memoria_pico_mb']:>10.0f}{m['memoria_modelo_mb']:>13.0f}")
+
+    return resultados
+
+
+# ==================================================
+# DESTILAÇÃO
+# ==================================================
+def destilar_modelo(
+        csv_path,
+        pastas_pseudo=(),
+        num_camadas=DESTILACAO_CAMADAS,
+        aluno_base=None,
+        temperatura=DESTILACAO_TEMPERATURA,
+        alfa=DESTILACAO_ALFA,
+        epochs=DESTILACAO_EPOCAS,
+        learning_rate=DESTILACAO_LEARNING_RATE,
+        batch_size=BATCH_SIZE,
+        confianca_minima=DESTILACAO_CONFIANCA_MINIMA,
+        max_len=MAX_LEN,
+        seed=RANDOM_SEED
+):
+    """
+    Treina o aluno a partir do professor em MODELO_PATH/final e salva em
+    MODELO_PATH/aluno.
+
+    Args:
+        csv_path (str): CSV com os tweets rotulados (mesma divisão do fine-tuning)
+        pastas_pseudo (list): Pastas de partidas em data/ usadas como pseudo-rótulos
+        num_camadas (int): Camadas do aluno (quando montado a partir do professor)
+        aluno_base (str): Pasta de um BERT compacto para usar como aluno
+        temperatura (float): Temperatura dos rótulos suaves
+        alfa (float): Peso da perda com os rótulos
+        epochs (int): Número de épocas
+        learning_rate (float): Taxa de aprendizado
+        batch_size (int): Tamanho do batch
+        confianca_minima (float): Confiança mínima dos pseudo-rótulos
+        max_len (int): Tamanho máximo dos tweets
+        seed (int): Seed para reprodutibilidade
+
+    Returns:
+        dict: Métricas de professor e aluno no conjunto de teste
+    """
+    import tempfile
+    from transformers import DataCollatorWithPadding, EarlyStoppingCallback, TrainingArguments
+
+    print("\n" + "=" * 50)
+    print("INICIANDO DESTILAÇÃO")
+    print("=" * 50)
+
+    pasta_professor = pasta_backend("pytorch")
+    pasta_aluno = pasta_backend("aluno")
+    if not os.path.exists(pasta_professor):
+        raise RuntimeError(
+            f"Modelo não encontrado em {pasta_professor}. "
+            "Execute primeiro o fine-tuning com src/fine_tuning.py"
+        )
+
+    # 1. Dados: mesma divisão do fine-tuning, textos limpos como na coleta
+    textos, labels = preparar_dados(csv_path)
+    X_train, X_val, X_test, y_train, y_val, y_test = dividir_dados(textos, labels, seed=seed)
+    X_train, X_val, X_test = (limpar_textos(str(t) for t in X) for X in (X_train, X_val, X_test))
+
+    # 2. Rótulos suaves do professor
+    print(f"\n[INFO] Professor: {pasta_professor}")
+    professor = BackendPytorch(pasta_professor)
+    probs_train = rotular_com_professor(professor, X_train)
+    probs_val = rotular_com_professor(professor, X_val)
+
+    # Textos vazios depois da limpeza não têm saída do professor
+    treino = [(t, y, p) for t, y, p in zip(X_train, y_train, probs_train) if p is not None]
+    validacao = [(t, y, p) for t, y, p in zip(X_val, y_val, probs_val) if p is not None]
+
+    # 3. Pseudo-rótulos dos tweets coletados (fora da validação e do teste)
+    if pastas_pseudo:
+        coletados = carregar_textos_coletados(pastas_pseudo)
+        treino += zip(*pseudo_rotular(professor, coletados, X_val + X_test, confianca_minima))
+
+    print(f"[INFO] Treino: {len(treino)} exemplos | Validação: {len(validacao)} exemplos")
+
+    # 4. Aluno e datasets (entrada normalizada como em _classificar_lotes)
+    tokenizer, aluno = criar_aluno(pasta_professor, num_camadas, aluno_base)
+
+    def montar(exemplos):
+        textos_ex, labels_ex, probs_ex = zip(*exemplos)
+        return DatasetDestilacao(normalizar_textos(textos_ex), list(labels_ex), list(probs_ex), tokenizer, max_len)
+
+    train_dataset = montar(treino)
+    val_dataset = montar(validacao)
+
+    # 5. Treino (checkpoints em pasta temporária; só o melhor aluno é salvo)
+    extras = {**argumentos_agrupamento(), **argumentos_avaliacao("epoch")}
+    if "warmup_ratio" in TrainingArguments.__dataclass_fields__:
+        extras["warmup_ratio"] = WARMUP_RATIO
+    else:
+        extras["warmup_steps"] = WARMUP_RATIO
+
+    with tempfile.TemporaryDirectory() as pasta_checkpoints:
+        training_args = TrainingArguments(
+            output_dir=pasta_checkpoints,
+            num_train_epochs=epochs,
+            per_device_train_batch_size=batch_size,
+            per_device_eval_batch_size=batch_size,
+            learning_rate=learning_rate,
+            weight_decay=WEIGHT_DECAY,
+            logging_steps=50,
+            save_strategy="epoch",
+            load_best_model_at_end=True,
+            metric_for_best_model="f1_macro",
+            greater_is_better=True,
+            save_total_limit=2,
+            remove_unused_columns=False,
+            seed=seed,
+            report_to="none",
+            **extras
+        )
+
+        trainer = _classe_trainer(temperatura, alfa)(
+            model=aluno,
+            args=training_args,
+            train_dataset=train_dataset,
+            eval_dataset=val_dataset,
+            data_collator=DataCollatorWithPadding(tokenizer),
+            compute_metrics=compute_metrics,
+            callbacks=[EarlyStoppingCallback(early_stopping_patience=3)],
+            **argumentos_tokenizer(tokenizer)
+        )
+
+        print("\n[INFO] Treinando o aluno...")
+        trainer.train()
+
+        shutil.rmtree(pasta_aluno, ignore_errors=True)
+        trainer.save_model(pasta_aluno)
+        tokenizer.save_pretrained(pasta_aluno)
+    print(f"[INFO] Aluno salvo em: {pasta_aluno}")
+
+    # 6. Professor x aluno no conjunto de teste
+    resultados = comparar_modelos(
+        {
+            "professor": (professor, pasta_professor),
+            "aluno": (BackendAluno(pasta_aluno), pasta_aluno)
+        },
+        X_test,
+        y_test
+    )
+    resultados["configuracao"] = {
+        "camadas": aluno.config.num_hidden_layers,
+        "aluno_base": aluno_base,
+        "temperatura": temperatura,
+        "alfa": alfa,
+        "exemplos_treino": len(treino),
+        "pseudo_rotulos": len(treino) - sum(1 for p in probs_train if p is not None)
+    }
+
+    caminho = os.path.join(MODELO_PATH, "destilacao.json")
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=4, ensure_ascii=False)
+    print(f"[INFO] Comparação salva em: {caminho}")
+    print('[INFO] Para usar o aluno na classificação: INFERENCIA_BACKEND = "aluno" em src/config.py')
+
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Destilação do modelo fine-tuning para um aluno menor")
+    parser.add_argument("--csv", default="data/texto_bruto.csv", help="CSV rotulado (texto_bruto, label)")
+    parser.add_argument("--camadas", type=int, default=DESTILACAO_CAMADAS, help="Camadas do aluno")
+    parser.add_argument("--aluno-base", help="Pasta de um BERT compacto para usar como aluno")
+    parser.add_argument("--pseudo-rotulos", nargs="*",
+                        help="Pastas de partidas sem rótulo (sem valor: todas em data/)")
+    parser.add_argument("--epocas", type=int, default=DESTILACAO_EPOCAS)
+    parser.add_argument("--temperatura", type=float, default=DESTILACAO_TEMPERATURA)
+    parser.add_argument("--alfa", type=float, default=DESTILACAO_ALFA)
+    args = parser.parse_args()
+
+    pastas_pseudo = args.pseudo_rotulos or []
+    if args.pseudo_rotulos == []:
+        pastas_pseudo = sorted(
+            p for p in glob.glob(os.path.join("data", "SPFC_vs_*_EXEC*"))
+            if os.path.isdir(p)
+        )
+
+    if not os.path.exists(args.csv):
+        print(f"[ERRO] Arquivo não encontrado: {args.csv}")
+    else:
+        destilar_modelo(
+            args.csv,
+            pastas_pseudo=pastas_pseudo,
+            num_camadas=args.camadas,
+            aluno_base=args.aluno_base,
+            temperatura=args.temperatura,
+            alfa=args.alfa,
+            epochs=args.epocas
+        )
@@ -7,18 +7,20 @@ raiva, alegria, frustracao, ironia, neutro.
 """
 
 import pandas as pd
-import torch
 import numpy as np
 from torch.utils.data import Dataset
 from transformers import (
     AutoTokenizer,
     AutoModelForSequenceClassification,
+    DataCollatorWithPadding,
     Trainer,
     TrainingArguments,
     EarlyStoppingCallback
 )
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, f1_score, confusion_matrix
+import hashlib
+import inspect
 import os
 import json
 from .config import (
@@ -33,47 +35,133 @@ from .config import (
     TEST_SIZE,
     VAL_SIZE,
     RANDOM_SEED,
+    TOKENIZACAO_CACHE_PASTA,
     EMOCAO_TO_ID,
     ID_TO_EMOCAO,
     EMOCOES
 )
 
 
+def impressao_tokenizer(tokenizer):
+    """
+    Hash do vocabulário (com os tokens adicionados) e dos tokens especiais:
+    um tokenizer refeito no mesmo caminho, mesmo com o mesmo tamanho, gera
+    outra impressão.
+
+    Returns:
+        str: Hash hexadecimal do tokenizer
+    """
+    digest = hashlib.sha256()
+    for token, indice in sorted(tokenizer.get_vocab().items(), key=lambda item: item[1]):
+        digest.update(f"{indice}\0{token}\0".encode("utf-8"))
+    digest.update(json.dumps(tokenizer.special_tokens_map, sort_keys=True, default=str).encode("utf-8"))
+    digest.update(str(tokenizer.init_kwargs.get("do_lower_case")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def tokenizar_textos(textos, tokenizer, max_len, pasta_cache=TOKENIZACAO_CACHE_PASTA):
+    """
+    Tokeniza os textos uma única vez (chamada em lote do tokenizer rápido,
+    sem padding) e guarda o resultado em disco. A chave do cache combina
+    o tokenizer (classe, caminho e impressao_tokenizer), o max_len e o
+    conteúdo dos textos.
+
+    Args:
+        textos (list): Textos dos tweets
+        tokenizer: Tokenizer do modelo
+        max_len (int): Tamanho máximo (truncamento)
+        pasta_cache (str): Pasta dos arquivos .npz. Se None, não usa cache
+
+    Returns:
+        list: input_ids (lista de inteiros, sem padding) de cada texto
+    """
+    textos = [str(t) for t in textos]
+
+    caminho = None
+    if pasta_cache:
+        hash_chave = hashlib.sha256()
+        hash_chave.update(
+            f"{type(tokenizer).__name__}|{tokenizer.name_or_path}|{impressao_tokenizer(tokenizer)}|{max_len}".encode("utf-8")
+        )
+        for texto in textos:
+            hash_chave.update(texto.encode("utf-8") + b"\0")
+        caminho = os.path.join(pasta_cache, f"{hash_chave.hexdigest()[:32]}.npz")
+
+        if os.path.exists(caminho):
+            with np.load(caminho) as arquivo:
+                ids, offsets = arquivo["ids"], arquivo["offsets"].tolist()
+            return [ids[offsets[i]:offsets[i + 1]].tolist() for i in range(len(textos))]
+
+    input_ids = tokenizer(textos, truncation=True, max_length=max_len)["input_ids"]
+
+    if caminho:
+        os.makedirs(pasta_cache, exist_ok=True)
+        offsets = np.zeros(len(input_ids) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in input_ids], out=offsets[1:])
+        ids = np.fromiter((t for seq in input_ids for t in seq), dtype=np.int32, count=int(offsets[-1]))
+        np.savez(caminho, ids=ids, offsets=offsets)
+
+    return input_ids
+
+
 class TweetsDataset(Dataset):
     """
     Dataset personalizado para os tweets.
-    Converte textos e labels para o formato esperado pelo transformers.
+    Os textos são tokenizados uma vez na criação (tokenizar_textos) e os
+    exemplos saem sem padding: o DataCollatorWithPadding completa cada
+    batch só até a maior sequência dele.
     """
 
-    def __init__(self, textos, labels, tokenizer, max_len):
+    def __init__(self, textos, labels, tokenizer, max_len, pasta_cache=TOKENIZACAO_CACHE_PASTA):
         self.textos = textos
         self.labels = labels
         self.tokenizer = tokenizer
         self.max_len = max_len
+        self.input_ids = tokenizar_textos(textos, tokenizer, max_len, pasta_cache)
 
     def __len__(self):
         return len(self.textos)
 
     def __getitem__(self, idx):
-        texto = str(self.textos[idx])
-        label = self.labels[idx]
-
-        # Tokeniza o texto
-        encoding = self.tokenizer(
-            texto,
-            truncation=True,
-            padding="max_length",
-            max_length=self.max_len,
-            return_tensors="pt"
-        )
+        input_ids = self.input_ids[idx]
 
         return {
-            "input_ids": encoding["input_ids"].flatten(),
-            "attention_mask": encoding["attention_mask"].flatten(),
-            "labels": torch.tensor(label, dtype=torch.long)
+            "input_ids": input_ids,
+            "attention_mask": [1] * len(input_ids),
+            "labels": self.labels[idx]
         }
 
 
+def argumentos_agrupamento():
+    """
+    Amostragem por comprimento (batches com sequências parecidas): no
+    transformers 5 o group_by_length virou train_sampling_strategy.
+    """
+    if "train_sampling_strategy" in TrainingArguments.__dataclass_fields__:
+        return {"train_sampling_strategy": "group_by_length"}
+    return {"group_by_length": True}
+
+
+def argumentos_avaliacao(estrategia):
+    """
+    Estratégia de avaliação: o evaluation_strategy virou eval_strategy
+    (transformers 4.41).
+    """
+    if "eval_strategy" in TrainingArguments.__dataclass_fields__:
+        return {"eval_strategy": estrategia}
+    return {"evaluation_strategy": estrategia}
+
+
+def argumentos_tokenizer(tokenizer):
+    """
+    Tokenizer do Trainer: o argumento tokenizer virou processing_class
+    (transformers 4.46).
+    """
+    if "processing_class" in inspect.signature(Trainer.__init__).parameters:
+        return {"processing_class": tokenizer}
+    return {"tokenizer": tokenizer}
+
+
 def compute_metrics(eval_pred):
     """
     Calcula as métricas de avaliação: acurácia e F1-score (macro e weighted).
@@ -136,6 +224,44 @@ def preparar_dados(csv_path):
     return textos, labels
 
 
+def dividir_dados(textos, labels, test_size=TEST_SIZE, val_size=VAL_SIZE, seed=RANDOM_SEED):
+    """
+    Divide os dados em treino, validação e teste (estratificado).
+    Usado pelo fine-tuning e por quem precisa reproduzir o mesmo conjunto de teste.
+
+    Args:
+        textos (list): Textos dos tweets
+        labels (list): IDs das emoções
+        test_size (float): Proporção dos dados para teste
+        val_size (float): Proporção dos dados para validação
+        seed (int): Seed para reprodutibilidade
+
+    Returns:
+        tuple: (X_train, X_val, X_test, y_train, y_val, y_test)
+    """
+    # Primeiro separa treino + validação do teste
+    X_temp, X_test, y_temp, y_test = train_test_split(
+        textos,
+        labels,
+        test_size=test_size,
+        random_state=seed,
+        stratify=labels
+    )
+
+    # Depois separa treino da validação
+    # Ajusta val_size para ser proporcional ao conjunto temporário
+    val_relative = val_size / (1 - test_size)
+    X_train, X_val, y_train, y_val = train_test_split(
+        X_temp,
+        y_temp,
+        test_size=val_relative,
+        random_state=seed,
+        stratify=y_temp
+    )
+
+    return X_train, X_val, X_test, y_train, y_val, y_test
+
+
 def treinar_modelo(
         csv_path,
         output_dir=MODELO_PATH,
@@ -147,7 +273,9 @@ def treinar_modelo(
         warmup_ratio=WARMUP_RATIO,
         weight_decay=WEIGHT_DECAY,
         max_len=MAX_LEN,
-        seed=RANDOM_SEED
+        seed=RANDOM_SEED,
+        modelo_base=MODELO_NOME,
+        callbacks=None
 ):
     """
     Função principal para fine-tuning do BERTimbau.
@@ -164,6 +292,8 @@ def treinar_modelo(
         weight_decay (float): Weight decay para regularização
         max_len (int): Tamanho máximo dos tweets
         seed (int): Seed para reprodutibilidade
+        modelo_base (str): Modelo de partida (nome no Hub ou pasta local)
+        callbacks (list): TrainerCallbacks extras (ex.: poda da busca de hiperparâmetros)
 
     Returns:
         tuple: (trainer, test_dataset, test_results)
@@ -178,25 +308,12 @@ def treinar_modelo(
 
     # 2. Dividir dados (treino, validação, teste)
     print("\n[INFO] Dividindo dados...")
-
-    # Primeiro separa treino + validação do teste
-    X_temp, X_test, y_temp, y_test = train_test_split(
+    X_train, X_val, X_test, y_train, y_val, y_test = dividir_dados(
         textos,
         labels,
         test_size=test_size,
-        random_state=seed,
-        stratify=labels
-    )
-
-    # Depois separa treino da validação
-    # Ajusta val_size para ser proporcional ao conjunto temporário
-    val_relative = val_size / (1 - test_size)
-    X_train, X_val, y_train, y_val = train_test_split(
-        X_temp,
-        y_temp,
-        test_size=val_relative,
-        random_state=seed,
-        stratify=y_temp
+        val_size=val_size,
+        seed=seed
     )
 
     print(f"   Treino: {len(X_train)} exemplos")
@@ -205,31 +322,35 @@ def treinar_modelo(
 
     # 3. Carregar tokenizer e modelo BERTimbau
     print("\n[INFO] Carregando BERTimbau...")
-    tokenizer = AutoTokenizer.from_pretrained(MODELO_NOME)
+    tokenizer = AutoTokenizer.from_pretrained(modelo_base)
     model = AutoModelForSequenceClassification.from_pretrained(
-        MODELO_NOME,
+        modelo_base,
         num_labels=len(EMOCOES),
         id2label=ID_TO_EMOCAO,
         label2id=EMOCAO_TO_ID
     )
 
-    # 4. Criar datasets
+    # 4. Criar datasets (tokenizados uma vez; cache em TOKENIZACAO_CACHE_PASTA)
     train_dataset = TweetsDataset(X_train, y_train, tokenizer, max_len)
     val_dataset = TweetsDataset(X_val, y_val, tokenizer, max_len)
     test_dataset = TweetsDataset(X_test, y_test, tokenizer, max_len)
 
     # 5. Configurar argumentos de treinamento
+    # (no transformers 5 o warmup_steps aceita a proporção e o logging_dir saiu)
+    extras = {**argumentos_agrupamento(), **argumentos_avaliacao("epoch")}
+    if "warmup_ratio" in TrainingArguments.__dataclass_fields__:
+        extras.update(warmup_ratio=warmup_ratio, logging_dir="./logs")
+    else:
+        extras["warmup_steps"] = warmup_ratio
+
     training_args = TrainingArguments(
         output_dir=output_dir,
         num_train_epochs=epochs,
         per_device_train_batch_size=batch_size,
         per_device_eval_batch_size=batch_size,
-        warmup_ratio=warmup_ratio,
         learning_rate=learning_rate,
         weight_decay=weight_decay,
-        logging_dir="./logs",
         logging_steps=50,
-        evaluation_strategy="epoch",
         save_strategy="epoch",
         load_best_model_at_end=True,
         metric_for_best_model="f1_macro",
@@ -237,7 +358,8 @@ def treinar_modelo(
         save_total_limit=2,
         remove_unused_columns=False,
         seed=seed,
-        report_to="none"  # Desativa relatórios para wandb/tensorboard
+        report_to="none",  # Desativa relatórios para wandb/tensorboard
+        **extras
     )
 
     # 6. Criar trainer
@@ -246,9 +368,10 @@ def treinar_modelo(
         args=training_args,
         train_dataset=train_dataset,
         eval_dataset=val_dataset,
-        tokenizer=tokenizer,
+        data_collator=DataCollatorWithPadding(tokenizer),
         compute_metrics=compute_metrics,
-        callbacks=[EarlyStoppingCallback(early_stopping_patience=3)]
+        callbacks=[EarlyStoppingCallback(early_stopping_patience=3)] + list(callbacks or []),
+        **argumentos_tokenizer(tokenizer)
     )
 
     # 7. Treinar
@@ -1,6 +1,7 @@
 # /src/janelas.py
 
 from datetime import timedelta
+from .metricas import medir
 
 def calcular_janelas(hora_inicio_jogo):
     """
@@ -51,4 +52,102 @@ def calcular_janelas(hora_inicio_jogo):
         fim = inicio + intervalo
         janelas["pos_jogo"].append((inicio, fim))
 
-    return janelas
\ No newline at end of file
+    return janelas
+
+
+def atribuir_janelas(timestamps, janelas):
+    """
+    Calcula, em uma única passada vetorizada, a janela de cada tweet.
+
+    Os timestamps são convertidos uma vez para datetime64 (UTC) e a janela
+    é encontrada com searchsorted contra os inícios das janelas, na ordem
+    pre_jogo → durante_jogo → pos_jogo.
+
+    Args:
+        timestamps (list): Timestamps ISO 8601 vindos da API (ex.: "2024-05-01T18:03:22.000Z")
+        janelas (dict): Resultado de calcular_janelas
+
+    Returns:
+        np.ndarray: Índice da janela de cada tweet na lista achatada de janelas
+                    (-1 para tweets fora de todas as janelas)
+    """
+    import numpy as np  # importados sob demanda para não pesar na inicialização
+    import pandas as pd
+
+    with medir("janelas.atribuir", itens=len(timestamps)):
+        instantes = pd.to_datetime(pd.Series(timestamps, dtype=object), utc=True, format="ISO8601")
+        instantes = instantes.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+        return _indices_janelas(instantes, janelas)
+
+
+def atribuir_janelas_epoch_ms(epoch_ms, janelas):
+    """
+    Mesmo que atribuir_janelas, para timestamps já em epoch (ms), como
+    na coluna timestamp_ms de TabelaTweets.
+    """
+    import numpy as np
+
+    with medir("janelas.atribuir", itens=len(epoch_ms)):
+        return _indices_janelas(np.asarray(epoch_ms, dtype=np.int64) * 1_000_000, janelas)
+
+
+def _indices_janelas(instantes_ns, janelas):
+    import numpy as np
+    import pandas as pd
+
+    intervalos = [intervalo for lista in janelas.values() for intervalo in lista]
+
+    inicios = np.array([pd.Timestamp(inicio).value for inicio, _ in intervalos], dtype=np.int64)
+    fins = np.array([pd.Timestamp(fim).value for _, fim in intervalos], dtype=np.int64)
+
+    # Última janela cujo início é <= instante; depois confere o fim (inicio <= t < fim)
+    indices = np.searchsorted(inicios, instantes_ns, side="right") - 1
+    validos = (indices >= 0) & (instantes_ns < fins[np.clip(indices, 0, None)])
+
+    return np.where(validos, indices, -1)
+
+
+def agrupar_por_janela(tweets, janelas):
+    """
+    Distribui os tweets nas janelas de cada etapa usando atribuir_janelas.
+    Os grupos preservam a ordem de coleta dentro de cada janela.
+
+    Aceita uma lista de dicionários (os grupos referenciam os mesmos
+    dicionários, sem cópia) ou uma TabelaTweets (cada grupo é uma
+    sub-tabela).
+
+    Args:
+        tweets (list | TabelaTweets): Tweets com timestamp
+        janelas (dict): Resultado de calcular_janelas
+
+    Returns:
+        dict: {"pre_jogo": [(intervalo, tweets_j), ...], "durante_jogo": [...], "pos_jogo": [...]}
+    """
+    import numpy as np
+    from .tabela import TabelaTweets
+
+    if isinstance(tweets, TabelaTweets):
+        indices = atribuir_janelas_epoch_ms(tweets.timestamp_ms, janelas)
+    else:
+        indices = atribuir_janelas([t["timestamp"] for t in tweets], janelas)
+
+    # Ordenação estável: cada janela vira uma fatia contínua de "ordem"
+    ordem = np.argsort(indices, kind="stable")
+    total_janelas = sum(len(lista) for lista in janelas.values())
+    limites = np.searchsorted(indices[ordem], np.arange(total_janelas + 1), side="left")
+
+    grupos = {}
+    k = 0
+    for etapa, lista_janelas in janelas.items():
+        grupos[etapa] = []
+        for intervalo in lista_janelas:
+            fatia = ordem[limites[k]:limites[k + 1]]
+            if isinstance(tweets, TabelaTweets):
+                tweets_j = tweets.tomar(fatia)
+            else:
+                tweets_j = [tweets[i] for i in fatia]
+            grupos[etapa].append((intervalo, tweets_j))
+            k += 1
+
+    return grupos
@@ -0,0 +1,223 @@
+# /src/lote.py
+
+"""
+Execução em lote: várias partidas em um único processo, sem perguntas
+no terminal.
+
+A tabela de partidas (CSV ou YAML com adversario, data e hora, nos
+mesmos formatos pedidos por main.py) é processada com até
+LOTE_PARTIDAS_SIMULTANEAS partidas ao mesmo tempo. O modelo é carregado
+uma única vez e, assim como o cliente da API (sessão, limitador de taxa
+e token), o cache e o pool de inferência, é compartilhado por todas as
+partidas. Cada partida usa as pastas de criar_pasta_resultados e o seu
+checkpoint; no fim, uma tabela compara todas as partidas.
+
+Uso:
+    python main.py --partidas partidas.csv
+
+    adversario,data,hora
+    Palmeiras,01-05-2024,16:00
+    Santos,08-05-2024,21:30
+"""
+
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from .analise_emocoes import criar_pool_inferencia, obter_modelo
+from .coleta import BASE_URL
+from .config import CHECKPOINT_PASTA, FORMATO_SAIDA, INFERENCIA_PROCESSOS, LOTE_PARTIDAS_SIMULTANEAS
+from .janelas import calcular_janelas
+from .metricas import salvar_metricas
+from .pipeline import executar_pipeline
+from .utils import criar_pasta_resultados, salvar_serie_emocoes
+from .visualizacao import RenderizadorGraficos, gerar_tabela_temporada
+
+FUSO_BR = ZoneInfo("America/Sao_Paulo")
+
+
+# ==================================================
+# TABELA DE PARTIDAS
+# ==================================================
+def ler_partidas(caminho):
+    """
+    Lê a tabela de partidas em CSV ou YAML (lista de itens com as mesmas
+    chaves). YAML exige o PyYAML instalado.
+
+    Args:
+        caminho (str): Arquivo .csv, .yml ou .yaml
+
+    Returns:
+        list: Dicionários com "adversario", "hora_inicio" (datetime) e "data_hora"
+    """
+    if caminho.endswith((".yml", ".yaml")):
+        try:
+            import yaml  # importado sob demanda: só é necessário para tabelas em YAML
+        except ImportError:
+            raise RuntimeError("Instale o PyYAML para ler tabelas de partidas em YAML")
+
+        with open(caminho, encoding="utf-8") as f:
+            linhas = yaml.safe_load(f) or []
+    else:
+        with open(caminho, encoding="utf-8", newline="") as f:
+            linhas = list(csv.DictReader(f))
+
+    partidas = []
+    for numero, linha in enumerate(linhas, start=1):
+        try:
+            adversario = str(linha["adversario"]).strip()
+            data_jogo = str(linha["data"]).strip()
+            hora_jogo = str(linha["hora"]).strip()
+
+            hora_inicio = datetime.strptime(
+                f"{data_jogo} {hora_jogo}", "%d-%m-%Y %H:%M"
+            ).replace(tzinfo=FUSO_BR)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Partida {numero} inválida em {caminho}: {e}")
+
+        partidas.append({
+            "adversario": adversario,
+            "hora_inicio": hora_inicio,
+            "data_hora": data_jogo.replace("-", "") + "_" + hora_jogo.replace(":", "")
+        })
+
+    return partidas
+
+
+def criar_pasta_lote(nome):
+    """
+    Pasta do comparativo do lote (mesmo esquema de EXEC de criar_pasta_resultados).
+    """
+    base = f"resultados/lote_{nome}"
+    exec_count = 1
+    pasta = f"{base}_EXEC{exec_count}"
+
+    while os.path.exists(pasta):
+        exec_count += 1
+        pasta = f"{base}_EXEC{exec_count}"
+
+    os.makedirs(pasta)
+    return pasta
+
+
+# ==================================================
+# EXECUÇÃO
+# ==================================================
+def _processar_partida(partida, perfil, id_perfil, cliente, pool, formato, base_url):
+    janelas = calcular_janelas(partida["hora_inicio"])
+
+    matriz = executar_pipeline(
+        janelas,
+        perfil=perfil,
+        id_perfil=id_perfil,
+        cliente=cliente,
+        pasta_data=partida["pasta_data"],
+        pasta_checkpoint=os.path.join(
+            CHECKPOINT_PASTA, f"SPFC_vs_{partida['adversario']}_{partida['data_hora']}"
+        ),
+        base_url=base_url,
+        formato=formato,
+        pool=pool
+    )
+
+    salvar_serie_emocoes(matriz, partida["pasta_resultados"], partida["data_hora"])
+
+    return {
+        "adversario": partida["adversario"],
+        "data_hora": partida["data_hora"],
+        "pasta_resultados": partida["pasta_resultados"],
+        "total": matriz.total(),
+        "percentuais": matriz.percentuais(),
+        "percentuais_etapas": matriz.percentuais_etapas(),
+        "serie": matriz.serie_temporal()
+    }
+
+
+def executar_lote(
+        partidas,
+        perfil,
+        id_perfil,
+        cliente,
+        nome="partidas",
+        max_partidas=LOTE_PARTIDAS_SIMULTANEAS,
+        formato=FORMATO_SAIDA,
+        base_url=BASE_URL
+):
+    """
+    Coleta e classifica várias partidas, gera os resultados de cada uma
+    e o comparativo entre elas. Uma partida com erro é relatada e não
+    interrompe as demais.
+
+    Args:
+        partidas (list): Resultado de ler_partidas
+        perfil (str): Username do clube
+        id_perfil (str): ID do perfil do clube
+        cliente (ClienteAPI): Cliente compartilhado por todas as partidas
+        nome (str): Nome do lote (pasta do comparativo)
+        max_partidas (int): Partidas processadas ao mesmo tempo
+        formato (str): "csv", "parquet" ou "ambos"
+        base_url (str): Endpoint de busca
+
+    Returns:
+        list: Resumo de cada partida concluída, na ordem da tabela
+    """
+    # Pastas criadas antes das threads: criar_pasta_resultados procura o próximo EXEC livre
+    for partida in partidas:
+        partida["pasta_data"], partida["pasta_resultados"] = criar_pasta_resultados(
+            partida["adversario"], partida["data_hora"]
+        )
+
+    # Modelo (ou pool) carregado uma única vez para o lote inteiro
+    pool = criar_pool_inferencia() if INFERENCIA_PROCESSOS > 1 else None
+    if pool is None:
+        obter_modelo()
+
+    print(f"\n[INFO] Lote: {len(partidas)} partidas, até {max_partidas} ao mesmo tempo")
+
+    # Gráficos em outros processos: a próxima partida não espera o matplotlib
+    renderizador = RenderizadorGraficos()
+
+    concluidas = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_partidas) as executor:
+            futuros = {
+                executor.submit(_processar_partida, partida, perfil, id_perfil, cliente, pool, formato, base_url): i
+                for i, partida in enumerate(partidas)
+            }
+
+            for futuro in as_completed(futuros):
+                i = futuros[futuro]
+                partida = partidas[i]
+
+                try:
+                    resumo = futuro.result()
+                except Exception as e:
+                    print(f"[ERRO] Partida SPFC x {partida['adversario']} ({partida['data_hora']}) falhou: {e}")
+                    continue
+
+                renderizador.enviar({
+                    "pasta_resultados": resumo["pasta_resultados"],
+                    "identificador_jogo": resumo["data_hora"],
+                    "titulo": f" - SPFC x {resumo['adversario']}",
+                    "percentuais": resumo["percentuais"],
+                    "percentuais_etapas": resumo["percentuais_etapas"],
+                    "serie": resumo["serie"]
+                })
+
+                print(f"[INFO] Partida SPFC x {resumo['adversario']} concluída: {resumo['total']} tweets")
+                concluidas[i] = resumo
+
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        renderizador.fechar()
+
+    resumos = [concluidas[i] for i in sorted(concluidas)]
+    if resumos:
+        pasta_lote = criar_pasta_lote(nome)
+        gerar_tabela_temporada(resumos, pasta_lote)
+        salvar_metricas(pasta_lote, {"cliente_api": cliente.metricas()})
+
+    print(f"[INFO] Lote concluído: {len(resumos)} de {len(partidas)} partidas")
+    return resumos
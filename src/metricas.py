@@ -0,0 +1,251 @@
+# /src/metricas.py
+
+"""
+Instrumentação leve da execução: tempos por etapa (spans) e contadores.
+
+    with medir("coleta.paginacao_conversa"):      # tempo de um trecho
+        ...
+    with medir("inferencia.forward", itens=64):   # tempo + itens (vazão)
+        ...
+    @cronometrado("visualizacao.grafico")         # tempo de cada chamada
+    def gerar_grafico(...): ...
+    contar("api.respostas_429")                   # contador
+    registrar_tempo("api.espera_limite", 1.5)     # tempo medido por fora (ex.: sleep)
+
+Cada nome acumula chamadas, tempo total, mínimo, máximo e itens. Os
+spans de threads diferentes são somados: o total de um nome pode passar
+da duração da execução quando ele roda em paralelo (coleta por conversa).
+Workers do pool de inferência são outros processos e não entram na soma.
+
+Ao final, salvar_metricas grava metrics.json na pasta de resultados e
+imprimir_resumo exibe a tabela. Com METRICAS_ATIVAS = False, medir devolve
+sempre o mesmo objeto sem efeito e contar / registrar_tempo retornam na
+primeira linha: o custo fica em uma chamada de função por ponto medido.
+"""
+
+import json
+import os
+import threading
+import time
+from functools import wraps
+from .config import METRICAS_ATIVAS
+
+ARQUIVO_METRICAS = "metrics.json"
+
+_ativo = METRICAS_ATIVAS
+_trava = threading.Lock()
+_spans = {}       # nome -> [chamadas, total_s, min_s, max_s, itens]
+_contadores = {}  # nome -> valor
+_inicio = time.perf_counter()
+
+
+class _SpanNulo:
+    """
+    Span usado com as métricas desativadas: não mede nada.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class _Span:
+    """
+    Mede o tempo de um bloco with. itens pode ser ajustado dentro do bloco
+    (ex.: quantidade só conhecida depois da requisição).
+    """
+
+    __slots__ = ("nome", "itens", "inicio")
+
+    def __init__(self, nome, itens):
+        self.nome = nome
+        self.itens = itens
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        registrar_tempo(self.nome, time.perf_counter() - self.inicio, self.itens)
+        return False
+
+
+# ==================================================
+# REGISTRO
+# ==================================================
+def ativar(ativo=True):
+    """
+    Liga ou desliga a coleta de métricas em tempo de execução.
+    """
+    global _ativo
+    _ativo = ativo
+
+
+def ativas():
+    return _ativo
+
+
+def reiniciar():
+    """
+    Descarta o que foi registrado e reinicia a contagem da duração total.
+    """
+    global _inicio
+
+    with _trava:
+        _spans.clear()
+        _contadores.clear()
+        _inicio = time.perf_counter()
+
+
+def medir(nome, itens=0):
+    """
+    Context manager que soma o tempo do bloco em `nome`.
+
+    Args:
+        nome (str): Nome da etapa ("modulo.etapa")
+        itens (int): Itens processados no bloco (tweets, páginas...), para a vazão
+    """
+    if not _ativo:
+        return _SPAN_NULO
+    return _Span(nome, itens)
+
+
+def cronometrado(nome):
+    """
+    Decorador: mede cada chamada da função como um span `nome`.
+    """
+
+    def decorador(funcao):
+        @wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not _ativo:
+                return funcao(*args, **kwargs)
+
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                registrar_tempo(nome, time.perf_counter() - inicio)
+
+        return envolvida
+
+    return decorador
+
+
+def registrar_tempo(nome, segundos, itens=0):
+    """
+    Soma uma duração já medida (ex.: o tempo de um time.sleep) em `nome`.
+    """
+    if not _ativo:
+        return
+
+    with _trava:
+        span = _spans.get(nome)
+        if span is None:
+            _spans[nome] = [1, segundos, segundos, segundos, itens]
+        else:
+            span[0] += 1
+            span[1] += segundos
+            if segundos < span[2]:
+                span[2] = segundos
+            if segundos > span[3]:
+                span[3] = segundos
+            span[4] += itens
+
+
+def contar(nome, quantidade=1):
+    """
+    Soma `quantidade` ao contador `nome`.
+    """
+    if not _ativo:
+        return
+
+    with _trava:
+        _contadores[nome] = _contadores.get(nome, 0) + quantidade
+
+
+# ==================================================
+# RESUMO
+# ==================================================
+def resumo():
+    """
+    Returns:
+        dict: duracao_total_s, spans {nome: {...}} (do maior tempo total para
+              o menor) e contadores {nome: valor}
+    """
+    with _trava:
+        spans = {nome: list(valores) for nome, valores in _spans.items()}
+        contadores = dict(_contadores)
+        duracao = time.perf_counter() - _inicio
+
+    return {
+        "duracao_total_s": round(duracao, 3),
+        "spans": {
+            nome: {
+                "chamadas": chamadas,
+                "total_s": round(total, 6),
+                "media_ms": round(total / chamadas * 1000, 3),
+                "min_ms": round(minimo * 1000, 3),
+                "max_ms": round(maximo * 1000, 3),
+                "itens": itens,
+                "itens_por_s": round(itens / total, 1) if itens and total > 0 else None
+            }
+            for nome, (chamadas, total, minimo, maximo, itens)
+            in sorted(spans.items(), key=lambda item: item[1][1], reverse=True)
+        },
+        "contadores": dict(sorted(contadores.items()))
+    }
+
+
+def salvar_metricas(pasta_resultados, extras=None):
+    """
+    Grava o resumo em <pasta_resultados>/metrics.json.
+
+    Args:
+        pasta_resultados (str): Pasta de resultados da execução
+        extras (dict): Seções adicionais (ex.: {"cliente_api": cliente.metricas()})
+
+    Returns:
+        str: Caminho do arquivo (None com as métricas desativadas)
+    """
+    if not _ativo:
+        return None
+
+    dados = resumo()
+    dados.update(extras or {})
+
+    caminho = os.path.join(pasta_resultados, ARQUIVO_METRICAS)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=4, ensure_ascii=False)
+
+    print(f"[INFO] Métricas da execução salvas em: {caminho}")
+    return caminho
+
+
+def imprimir_resumo():
+    """
+    Exibe os tempos por etapa e os contadores.
+    """
+    if not _ativo:
+        return
+
+    dados = resumo()
+
+    print(f"\n=== Tempo por etapa (execução: {dados['duracao_total_s']:.1f}s) ===")
+    print(f"{'etapa':<34}{'chamadas':>9}{'total (s)':>11}{'média (ms)':>12}{'máx (ms)':>11}{'itens/s':>11}")
+    for nome, span in dados["spans"].items():
+        vazao = f"{span['itens_por_s']:,.0f}" if span["itens_por_s"] else "-"
+        print(f"{nome:<34}{span['chamadas']:>9}{span['total_s']:>11.2f}"
+              f"{span['media_ms']:>12.1f}{span['max_ms']:>11.1f}{vazao:>11}")
+
+    if dados["contadores"]:
+        print("\n=== Contadores ===")
+        for nome, valor in dados["contadores"].items():
+            print(f"{nome:<34}{valor:>9}")
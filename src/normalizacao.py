@@ -0,0 +1,119 @@
+# /src/normalizacao.py
+
+"""
+Normalização dos textos dos tweets em poucas passadas.
+
+    limpar_texto     -> texto_limpo gravado na coleta (minúsculas, sem links,
+                        menções e hashtags, emojis em texto, sem espaços nas pontas)
+    remover_acentos  -> sem diacríticos, para o modelo e a chave do cache
+    normalizar_texto -> remover_acentos(texto.lower())
+
+Mesma saída das versões anteriores (quatro re.sub + emoji.demojize em
+coleta.py e NFD + unicodedata.category caractere a caractere em
+analise_emocoes.py; conferido com python -m benchmarks.bench_normalizacao),
+mas com:
+
+- uma única expressão regular compilada para links, menções e hashtags;
+- acentos removidos por str.translate com uma tabela preenchida sob
+  demanda (um cálculo por caractere distinto, não por ocorrência);
+- emoji.demojize aplicado só aos trechos não ASCII, com memoização: os
+  mesmos emojis e palavras acentuadas se repetem em milhares de tweets.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+import emoji
+
+# As três substituições antigas (http, depois @, depois #) em uma passada.
+# Os lookaheads reproduzem a ordem: um "@" colado em um link que seria
+# removido antes não consome o link, e o mesmo vale para "#" antes de
+# um link ou de uma menção.
+_PADRAO_REMOCAO = re.compile(
+    r"http\S+"
+    r"|@(?!http\S)\S+"
+    r"|#(?!http\S|@(?!http\S)\S)\S+"
+)
+
+# Trechos passados ao demojize: caracteres não ASCII consecutivos, com o
+# caractere base de um keycap (1️⃣, #️⃣, *️⃣) quando houver
+_PADRAO_NAO_ASCII = re.compile(r"[#*0-9]?[^\x00-\x7f]+")
+
+
+class _TabelaAcentos(dict):
+    """
+    Tabela de str.translate que calcula cada caractere na primeira vez
+    em que aparece: decomposição NFD sem as marcas combinantes (Mn).
+    """
+
+    def __missing__(self, codigo):
+        caractere = chr(codigo)
+        sem_marcas = "".join(
+            c for c in unicodedata.normalize("NFD", caractere)
+            if unicodedata.category(c) != "Mn"
+        )
+        # None remove o caractere; o próprio código mantém sem cópia
+        valor = codigo if sem_marcas == caractere else (sem_marcas or None)
+        self[codigo] = valor
+        return valor
+
+
+_TABELA_ACENTOS = _TabelaAcentos()
+
+
+@lru_cache(maxsize=65536)
+def _demojizar_trecho(trecho):
+    return emoji.demojize(trecho)
+
+
+def _demojizar(texto):
+    if texto.isascii():
+        return texto
+    return _PADRAO_NAO_ASCII.sub(lambda m: _demojizar_trecho(m.group()), texto)
+
+
+def limpar_texto(texto):
+    """
+    Limpa o texto de um tweet para a análise (coluna texto_limpo).
+    """
+    texto = _PADRAO_REMOCAO.sub("", texto.lower())
+    return _demojizar(texto).strip()
+
+
+def remover_acentos(texto):
+    """
+    Remove acentos para padronizar texto.
+    """
+    return texto.translate(_TABELA_ACENTOS)
+
+
+def normalizar_texto(texto):
+    """
+    Forma usada pelo modelo e pela chave do cache: minúsculas e sem acentos.
+    """
+    return texto.lower().translate(_TABELA_ACENTOS)
+
+
+# ==================================================
+# EM LOTE
+# ==================================================
+def limpar_textos(textos):
+    """
+    limpar_texto de uma sequência de textos (lista, ColunaTexto, array...).
+
+    Returns:
+        list: Textos limpos, na mesma ordem
+    """
+    sub = _PADRAO_REMOCAO.sub
+    return [_demojizar(sub("", texto.lower())).strip() for texto in textos]
+
+
+def normalizar_textos(textos):
+    """
+    normalizar_texto de uma sequência de textos.
+
+    Returns:
+        list: Textos normalizados, na mesma ordem
+    """
+    tabela = _TABELA_ACENTOS
+    return [texto.lower().translate(tabela) for texto in textos]
@@ -0,0 +1,240 @@
+# /src/parquet.py
+
+"""
+Saída colunar em Parquet (pyarrow), alternativa aos CSVs por janela.
+
+Cada partida vira um único dataset, particionado (estilo Hive) por etapa
+e início da janela:
+
+    <pasta_data>/tweets_parquet/etapa=pre_jogo/janela_inicio=20240501_1500/parte-0.parquet
+
+As colunas são tipadas (ids int64, contagens int32, timestamps em ms UTC,
+confiança float32), comprimidas (PARQUET_COMPRESSAO) e a emoção é
+gravada como dicionário. ler_dataset aplica os filtros de etapa/janela
+nas partições, sem abrir os arquivos das demais janelas.
+"""
+
+import os
+import numpy as np
+from .config import ID_TO_EMOCAO, PARQUET_COMPRESSAO
+from .metricas import medir
+from .tabela import SEM_EMOCAO, ColunaTexto, TabelaTweets
+
+NOME_DATASET = "tweets_parquet"
+ARQUIVO_PARTE = "parte-0.parquet"
+
+# Emoções na ordem dos códigos de EMOCAO_TO_ID (índices do dicionário)
+EMOCOES_POR_ID = [ID_TO_EMOCAO[i] for i in range(len(ID_TO_EMOCAO))]
+
+
+def esquema():
+    """
+    Esquema Arrow das linhas (sem as colunas de partição).
+    """
+    import pyarrow as pa  # importado sob demanda para não pesar na inicialização
+
+    return pa.schema([
+        ("id_tweet", pa.int64()),
+        ("texto", pa.large_string()),
+        ("retweets", pa.int32()),
+        ("likes", pa.int32()),
+        ("texto_limpo", pa.large_string()),
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("janela", pa.timestamp("ms", tz="UTC")),
+        ("emocao", pa.dictionary(pa.int8(), pa.string())),
+        ("confianca", pa.float32()),
+    ])
+
+
+def _coluna_texto_arrow(coluna):
+    import pyarrow as pa
+
+    # Mesmo layout de um large_string do Arrow: offsets int64 + buffer UTF-8
+    return pa.LargeStringArray.from_buffers(
+        len(coluna), pa.py_buffer(coluna.offsets), pa.py_buffer(coluna.dados)
+    )
+
+
+def tabela_para_arrow(tabela):
+    """
+    Converte uma TabelaTweets em pyarrow.Table, reaproveitando os buffers
+    das colunas sempre que possível. Linhas não classificadas ficam com
+    emocao nula.
+    """
+    import pyarrow as pa
+
+    n = len(tabela)
+    janela_ms = 0 if tabela.janela is None else int(tabela.janela.timestamp() * 1000)
+
+    emocao = pa.DictionaryArray.from_arrays(
+        pa.array(tabela.emocao, mask=tabela.emocao == SEM_EMOCAO),
+        pa.array(EMOCOES_POR_ID, type=pa.string())
+    )
+
+    return pa.Table.from_arrays([
+        pa.array(tabela.id_tweet),
+        _coluna_texto_arrow(tabela.texto),
+        pa.array(tabela.retweets),
+        pa.array(tabela.likes),
+        _coluna_texto_arrow(tabela.texto_limpo),
+        pa.array(tabela.timestamp_ms, type=pa.timestamp("ms", tz="UTC")),
+        pa.array(np.full(n, janela_ms, dtype=np.int64), type=pa.timestamp("ms", tz="UTC"),
+                 mask=np.full(n, tabela.janela is None)),
+        emocao,
+        pa.array(tabela.confianca),
+    ], schema=esquema())
+
+
+def _texto_arrow_coluna(coluna):
+    import pyarrow as pa
+
+    coluna = coluna.cast(pa.large_string()).combine_chunks()
+    _, buf_offsets, buf_dados = coluna.buffers()
+
+    offsets = np.frombuffer(buf_offsets, dtype=np.int64)[coluna.offset:coluna.offset + len(coluna) + 1]
+    dados = buf_dados.to_pybytes()[offsets[0]:offsets[-1]] if len(coluna) else b""
+
+    return ColunaTexto(dados, offsets - offsets[0])
+
+
+def arrow_para_tabela(tabela_arrow):
+    """
+    Converte uma pyarrow.Table (por exemplo, de ler_dataset) em TabelaTweets.
+    O início da coleta (janela) volta em UTC.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    emocao = pc.index_in(
+        tabela_arrow["emocao"].cast(pa.string()),
+        value_set=pa.array(EMOCOES_POR_ID, type=pa.string())
+    )
+    janelas = tabela_arrow["janela"].drop_null()
+
+    return TabelaTweets(
+        id_tweet=tabela_arrow["id_tweet"].to_numpy(),
+        texto=_texto_arrow_coluna(tabela_arrow["texto"]),
+        retweets=tabela_arrow["retweets"].to_numpy(),
+        likes=tabela_arrow["likes"].to_numpy(),
+        texto_limpo=_texto_arrow_coluna(tabela_arrow["texto_limpo"]),
+        timestamp_ms=tabela_arrow["timestamp"].cast(pa.int64()).to_numpy(),
+        janela=janelas[0].as_py() if len(janelas) else None,
+        emocao=pc.fill_null(emocao, SEM_EMOCAO).to_numpy(),
+        confianca=tabela_arrow["confianca"].to_numpy()
+    )
+
+
+def _valor_janela(inicio):
+    # Mesmo formato do nome dos CSVs (horário local do início da janela)
+    return inicio.strftime("%Y%m%d_%H%M")
+
+
+def caminho_particao(pasta_data, etapa, janela_inicio):
+    return os.path.join(
+        pasta_data, NOME_DATASET, f"etapa={etapa}", f"janela_inicio={_valor_janela(janela_inicio)}"
+    )
+
+
+# ==================================================
+# ESCRITA
+# ==================================================
+def salvar_tabela_parquet(tabela, pasta_data, etapa, janela_inicio, compressao=PARQUET_COMPRESSAO):
+    """
+    Grava (ou regrava) a partição de uma janela com o conteúdo da tabela.
+    """
+    import pyarrow.parquet as pq
+
+    if not len(tabela):
+        return
+
+    pasta = caminho_particao(pasta_data, etapa, janela_inicio)
+    os.makedirs(pasta, exist_ok=True)
+
+    path = os.path.join(pasta, ARQUIVO_PARTE)
+    with medir("saida.parquet", itens=len(tabela)):
+        pq.write_table(tabela_para_arrow(tabela), path, compression=compressao)
+
+    print(f"[INFO] Janela salva em Parquet: {path}")
+
+
+class EscritorParquet:
+    """
+    Equivalente a EscritorJanelas (src/pipeline.py) para o dataset Parquet:
+    cada lote vira um row group no arquivo da partição da sua janela.
+
+    Args:
+        pasta_data (str): Pasta dos dados da execução
+        compressao (str): Codec das colunas
+    """
+
+    def __init__(self, pasta_data, compressao=PARQUET_COMPRESSAO):
+        self.pasta_data = pasta_data
+        self.compressao = compressao
+        self.arquivos = {}
+
+    def escrever(self, etapa, intervalo, tabela):
+        import pyarrow.parquet as pq
+
+        chave = (intervalo[0], etapa)
+
+        if chave not in self.arquivos:
+            pasta = caminho_particao(self.pasta_data, etapa, intervalo[0])
+            os.makedirs(pasta, exist_ok=True)
+
+            path = os.path.join(pasta, ARQUIVO_PARTE)
+            self.arquivos[chave] = (path, pq.ParquetWriter(path, esquema(), compression=self.compressao))
+
+        with medir("saida.parquet", itens=len(tabela)):
+            self.arquivos[chave][1].write_table(tabela_para_arrow(tabela))
+
+    def fechar(self):
+        for chave in sorted(self.arquivos):
+            path, writer = self.arquivos[chave]
+            writer.close()
+            print(f"[INFO] Janela salva em Parquet: {path}")
+
+        self.arquivos = {}
+
+
+# ==================================================
+# LEITURA
+# ==================================================
+def ler_dataset(pasta_data, etapas=None, janelas=None, colunas=None, memory_map=True):
+    """
+    Lê o dataset Parquet de uma partida. Os filtros de etapa e janela são
+    aplicados nas partições: arquivos de outras janelas nem são abertos.
+
+    Args:
+        pasta_data (str): Pasta dos dados da execução (ou o próprio dataset)
+        etapas (list): Etapas desejadas (ex.: ["durante_jogo"]). Se None, todas
+        janelas (list): Inícios (datetime) das janelas desejadas. Se None, todas
+        colunas (list): Colunas a carregar. Se None, todas
+        memory_map (bool): Lê os arquivos por memory map em vez de copiá-los
+
+    Returns:
+        pyarrow.Table: Linhas, com as colunas de partição "etapa" e "janela_inicio"
+                       (início da janela no formato dos nomes dos CSVs)
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    caminho = pasta_data
+    if os.path.basename(os.path.normpath(pasta_data)) != NOME_DATASET:
+        caminho = os.path.join(pasta_data, NOME_DATASET)
+
+    filtros = []
+    if etapas is not None:
+        filtros.append(("etapa", "in", list(etapas)))
+    if janelas is not None:
+        filtros.append(("janela_inicio", "in", [_valor_janela(j) for j in janelas]))
+
+    return pq.read_table(
+        caminho,
+        columns=colunas,
+        filters=filtros or None,
+        memory_map=memory_map,
+        partitioning=ds.partitioning(
+            pa.schema([("etapa", pa.string()), ("janela_inicio", pa.string())]), flavor="hive"
+        )
+    )
@@ -0,0 +1,212 @@
+# /src/pipeline.py
+
+"""
+Pipeline da partida em estágios encadeados (geradores):
+
+    coletar -> classificar -> atribuir -> gravar CSV/Parquet / contar emoções
+
+Cada estágio consome e produz lotes de PIPELINE_TAMANHO_LOTE tweets em
+TabelaTweets (colunar), então a memória não cresce com o número de
+respostas: as respostas ficam no checkpoint em disco e cada lote é
+gravado nos CSVs das suas janelas e somado aos contadores assim que sai
+da classificação.
+"""
+
+import os
+import numpy as np
+from .agregacao import MatrizEmocoes
+from .analise_emocoes import analisar_tabela, criar_pool_inferencia
+from .deduplicacao import criar_deduplicador
+from .checkpoint import CheckpointColeta
+from .coleta import BASE_URL, coletar_passada, iso_utc
+from .config import COLETA_THREADS, FORMATO_SAIDA, INFERENCIA_PROCESSOS, PIPELINE_TAMANHO_LOTE
+from .janelas import atribuir_janelas_epoch_ms
+from .tabela import TabelaTweets
+from .utils import em_lotes, escrever_tabela_csv
+
+
+# ==================================================
+# ESTÁGIOS
+# ==================================================
+def coletar(
+        janela,
+        perfil,
+        id_perfil,
+        cliente,
+        pasta_checkpoint=None,
+        max_threads=COLETA_THREADS,
+        base_url=BASE_URL,
+        tamanho_lote=PIPELINE_TAMANHO_LOTE
+):
+    """
+    Coleta as respostas do intervalo (mesma coleta de coletar_tweets) e as
+    percorre direto do checkpoint, sem montar a lista completa em memória.
+
+    Yields:
+        TabelaTweets: Lote de respostas, na ordem dos tweets do clube
+    """
+    inicio, fim = janela
+    inicio_iso = iso_utc(inicio)
+    fim_iso = iso_utc(fim)
+
+    checkpoint = CheckpointColeta(pasta_checkpoint, (inicio_iso, fim_iso))
+
+    try:
+        incompletas = coletar_passada(
+            checkpoint, perfil, id_perfil, inicio_iso, fim_iso, cliente, max_threads, base_url
+        )
+
+        if incompletas:
+            print(f"[ERRO] {incompletas} paginações não foram coletadas até o fim"
+                  + (" (serão retomadas na próxima execução)" if pasta_checkpoint else ""))
+
+        print(f"[INFO] Total coletado no intervalo: {checkpoint.total_respostas()} tweets")
+
+        for lote in em_lotes(checkpoint.iterar_respostas(), tamanho_lote):
+            yield TabelaTweets.de_dicts(lote, janela=inicio)
+
+    finally:
+        checkpoint.fechar()
+
+
+def classificar(tabelas, pool=None):
+    """
+    Classifica cada lote (analisar_tabela: grupos de duplicatas, cache
+    e micro-batches) e o repassa na mesma ordem. Os grupos de
+    duplicatas valem para a execução inteira.
+
+    Yields:
+        TabelaTweets: Lote com as colunas emocao e confianca preenchidas
+    """
+    pool_proprio = None
+    if pool is None and INFERENCIA_PROCESSOS > 1:
+        # Um único pool para todos os lotes da execução
+        pool = pool_proprio = criar_pool_inferencia()
+
+    deduplicador = criar_deduplicador()
+
+    try:
+        for tabela in tabelas:
+            yield analisar_tabela(tabela, pool=pool, deduplicador=deduplicador)
+    finally:
+        if pool_proprio is not None:
+            pool_proprio.shutdown()
+
+
+def atribuir(tabelas, janelas):
+    """
+    Divide cada lote pelas janelas (atribuir_janelas_epoch_ms), mantendo a
+    ordem de coleta dentro de cada janela. Tweets fora de todas as janelas
+    são descartados.
+
+    Yields:
+        tuple: (etapa, intervalo, sub-tabela da janela)
+    """
+    lista_janelas = [(etapa, intervalo) for etapa, lista in janelas.items() for intervalo in lista]
+
+    for tabela in tabelas:
+        indices = atribuir_janelas_epoch_ms(tabela.timestamp_ms, janelas)
+
+        ordem = np.argsort(indices, kind="stable")
+        limites = np.searchsorted(indices[ordem], np.arange(len(lista_janelas) + 1), side="left")
+
+        for k, (etapa, intervalo) in enumerate(lista_janelas):
+            if limites[k] < limites[k + 1]:
+                yield etapa, intervalo, tabela.tomar(ordem[limites[k]:limites[k + 1]])
+
+
+class EscritorJanelas:
+    """
+    Grava os lotes no CSV da sua janela à medida que chegam (mesmos nomes
+    de arquivo e colunas de salvar_tweets_csv). Janelas sem tweets não
+    geram arquivo.
+
+    Args:
+        pasta_data (str): Pasta dos CSVs da execução
+    """
+
+    def __init__(self, pasta_data):
+        self.pasta_data = pasta_data
+        self.arquivos = {}
+
+    def escrever(self, etapa, intervalo, tabela):
+        chave = (intervalo[0], etapa)
+        novo = chave not in self.arquivos
+
+        if novo:
+            filename = f"{etapa}_{intervalo[0].strftime('%Y%m%d_%H%M')}.csv"
+            path = os.path.join(self.pasta_data, filename)
+            self.arquivos[chave] = (path, open(path, "w", encoding="utf-8", newline=""))
+
+        escrever_tabela_csv(self.arquivos[chave][1], tabela, cabecalho=novo)
+
+    def fechar(self):
+        for chave in sorted(self.arquivos):
+            path, arquivo = self.arquivos[chave]
+            arquivo.close()
+            print(f"[INFO] Janela salva em CSV: {path}")
+
+        self.arquivos = {}
+
+
+# ==================================================
+# EXECUÇÃO
+# ==================================================
+def executar_pipeline(
+        janelas,
+        perfil,
+        id_perfil,
+        cliente,
+        pasta_data,
+        pasta_checkpoint=None,
+        base_url=BASE_URL,
+        formato=FORMATO_SAIDA,
+        pool=None
+):
+    """
+    Coleta, classifica, distribui nas janelas e grava os CSVs (e/ou o
+    dataset Parquet) em um único fluxo, mantendo apenas a matriz de
+    contagens por janela (MatrizEmocoes).
+
+    Args:
+        janelas (dict): Resultado de calcular_janelas (define também o intervalo de coleta)
+        perfil (str): Username do clube
+        id_perfil (str): ID do perfil do clube
+        cliente (ClienteAPI): Cliente compartilhado da execução
+        pasta_data (str): Pasta dos CSVs da execução
+        pasta_checkpoint (str): Pasta do checkpoint da partida
+        base_url (str): Endpoint de busca
+        formato (str): "csv", "parquet" ou "ambos"
+        pool (ProcessPoolExecutor): Pool de inferência compartilhado. Se None, classificar decide
+
+    Returns:
+        MatrizEmocoes: Contagens por janela, emoção e faixa de confiança
+    """
+    intervalos = [intervalo for lista in janelas.values() for intervalo in lista]
+    janela_coleta = (intervalos[0][0], intervalos[-1][1])
+
+    tabelas = coletar(
+        janela_coleta, perfil, id_perfil, cliente,
+        pasta_checkpoint=pasta_checkpoint, base_url=base_url
+    )
+    tabelas = classificar(tabelas, pool=pool)
+
+    matriz = MatrizEmocoes(janelas)
+    escritores = []
+    if formato in ("csv", "ambos"):
+        escritores.append(EscritorJanelas(pasta_data))
+    if formato in ("parquet", "ambos"):
+        from .parquet import EscritorParquet  # pyarrow só é exigido com saída em Parquet
+
+        escritores.append(EscritorParquet(pasta_data))
+
+    try:
+        for etapa, intervalo, tabela in atribuir(tabelas, janelas):
+            for escritor in escritores:
+                escritor.escrever(etapa, intervalo, tabela)
+            matriz.adicionar_janela(etapa, intervalo, tabela)
+    finally:
+        for escritor in escritores:
+            escritor.fechar()
+
+    return matriz
@@ -0,0 +1,246 @@
+# /src/reanalise.py
+
+"""
+Reanálise offline: reclassifica partidas já coletadas, sem acessar a API.
+
+Lê os dados de cada janela gravados em data/SPFC_vs_<adversario>_<data_hora>_EXEC<n>/
+(CSVs ou o dataset Parquet), reclassifica a coluna texto_limpo com o
+modelo atual (inferência em lote, cache e pool de processos), soma tudo
+em uma MatrizEmocoes com as janelas da partida e gera de novo os
+gráficos, a série por janela e a tabela resumo em
+resultados/<pasta>_REANALISE<k>/.
+Os dados originais não são alterados.
+
+Várias pastas são lidas ao mesmo tempo (REANALISE_PASTAS_SIMULTANEAS);
+a classificação usa o modelo do processo ou o pool compartilhado
+(INFERENCIA_PROCESSOS > 1 ou --processos).
+
+Uso:
+    python -m src.reanalise                           # todas as partidas em data/
+    python -m src.reanalise data/SPFC_vs_Santos_08052024_2130_EXEC1 --processos 4
+"""
+
+import argparse
+import csv
+import glob
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from .agregacao import MatrizEmocoes
+from .analise_emocoes import analisar_tabela, criar_pool_inferencia, obter_modelo
+from .deduplicacao import criar_deduplicador
+from .cache import relatar_cache
+from .config import INFERENCIA_PROCESSOS, PIPELINE_TAMANHO_LOTE, REANALISE_PASTAS_SIMULTANEAS
+from .janelas import calcular_janelas
+from .tabela import TabelaTweets
+from .utils import em_lotes, salvar_serie_emocoes
+from .visualizacao import RenderizadorGraficos
+
+ETAPAS = ["pre_jogo", "durante_jogo", "pos_jogo"]
+
+# SPFC_vs_<adversario>_<DDMMAAAA>_<HHMM>_EXEC<n> (mesmo nome de criar_pasta_resultados)
+PADRAO_PASTA = re.compile(r"^SPFC_vs_(?P<adversario>.+)_(?P<data_hora>\d{8}_\d{4})_EXEC\d+$")
+PADRAO_CSV = re.compile(r"^(?P<etapa>pre_jogo|durante_jogo|pos_jogo)_(?P<inicio>\d{8}_\d{4})\.csv$")
+
+FUSO_BR = ZoneInfo("America/Sao_Paulo")
+
+
+# ==================================================
+# LEITURA DOS DADOS GRAVADOS
+# ==================================================
+def _lotes_csv(caminho, tamanho_lote):
+    """
+    Percorre um CSV de janela em lotes de TabelaTweets, sem carregar o
+    arquivo inteiro. A classificação antiga é descartada.
+    """
+    with open(caminho, encoding="utf-8", newline="") as f:
+        linhas = (
+            {k: v for k, v in linha.items() if k not in ("emocao", "confianca")}
+            for linha in csv.DictReader(f)
+        )
+        for lote in em_lotes(linhas, tamanho_lote):
+            yield TabelaTweets.de_dicts(lote, janela=lote[0]["janela"])
+
+
+def _lotes_parquet(pasta_data, etapa, tamanho_lote):
+    from .parquet import arrow_para_tabela, ler_dataset
+
+    tabela = arrow_para_tabela(ler_dataset(pasta_data, etapas=[etapa]))
+
+    for inicio in range(0, len(tabela), tamanho_lote):
+        yield tabela.tomar(range(inicio, min(inicio + tamanho_lote, len(tabela))))
+
+
+def lotes_por_etapa(pasta_data, tamanho_lote=PIPELINE_TAMANHO_LOTE):
+    """
+    Lotes gravados de uma partida, por etapa. Usa os CSVs das janelas e,
+    se não houver nenhum, o dataset Parquet (src/parquet.py).
+
+    Yields:
+        tuple: (etapa, TabelaTweets)
+    """
+    from .parquet import NOME_DATASET
+
+    arquivos = sorted(f for f in os.listdir(pasta_data) if PADRAO_CSV.match(f))
+
+    if arquivos:
+        for arquivo in arquivos:
+            etapa = PADRAO_CSV.match(arquivo)["etapa"]
+            for tabela in _lotes_csv(os.path.join(pasta_data, arquivo), tamanho_lote):
+                yield etapa, tabela
+
+    elif os.path.isdir(os.path.join(pasta_data, NOME_DATASET)):
+        for etapa in ETAPAS:
+            for tabela in _lotes_parquet(pasta_data, etapa, tamanho_lote):
+                yield etapa, tabela
+
+    else:
+        raise FileNotFoundError(f"Nenhum dado de janela encontrado em {pasta_data}")
+
+
+def hora_inicio_partida(pasta_data):
+    """
+    Início do jogo (horário de Brasília) pelo nome da pasta
+    (SPFC_vs_<adversario>_<DDMMAAAA>_<HHMM>_EXEC<n>) ou, em uma pasta
+    renomeada, pela primeira janela de pré-jogo gravada em CSV (1 hora antes).
+
+    Returns:
+        datetime: Mesmo valor passado a calcular_janelas na coleta
+    """
+    encontrado = PADRAO_PASTA.match(os.path.basename(os.path.normpath(pasta_data)))
+    if encontrado:
+        return datetime.strptime(encontrado["data_hora"], "%d%m%Y_%H%M").replace(tzinfo=FUSO_BR)
+
+    inicios = sorted(
+        PADRAO_CSV.match(f)["inicio"] for f in os.listdir(pasta_data)
+        if PADRAO_CSV.match(f) and f.startswith("pre_jogo")
+    )
+    if not inicios:
+        raise ValueError(f"Não foi possível identificar o início do jogo em {pasta_data}")
+
+    return datetime.strptime(inicios[0], "%Y%m%d_%H%M").replace(tzinfo=FUSO_BR) + timedelta(hours=1)
+
+
+def criar_pasta_reanalise(pasta_data):
+    """
+    resultados/<pasta da partida>_REANALISE<k>, sem sobrescrever reanálises anteriores.
+    """
+    base = os.path.join("resultados", os.path.basename(os.path.normpath(pasta_data)))
+    contagem = 1
+    pasta = f"{base}_REANALISE{contagem}"
+
+    while os.path.exists(pasta):
+        contagem += 1
+        pasta = f"{base}_REANALISE{contagem}"
+
+    os.makedirs(pasta)
+    return pasta
+
+
+# ==================================================
+# REANÁLISE
+# ==================================================
+def reanalisar_partida(pasta_data, pool=None, tamanho_lote=PIPELINE_TAMANHO_LOTE):
+    """
+    Reclassifica os tweets gravados de uma partida.
+
+    Returns:
+        MatrizEmocoes: Contagens por janela da partida
+    """
+    matriz = MatrizEmocoes(calcular_janelas(hora_inicio_partida(pasta_data)))
+    deduplicador = criar_deduplicador()
+
+    for _, tabela in lotes_por_etapa(pasta_data, tamanho_lote):
+        analisar_tabela(tabela, pool=pool, deduplicador=deduplicador)
+        matriz.adicionar_tabela(tabela)
+
+    return matriz
+
+
+def executar_reanalise(pastas, max_pastas=REANALISE_PASTAS_SIMULTANEAS, num_processos=INFERENCIA_PROCESSOS):
+    """
+    Reanalisa várias partidas e gera os resultados de cada uma.
+
+    Args:
+        pastas (list): Pastas de dados das partidas (data/SPFC_vs_...)
+        max_pastas (int): Partidas lidas ao mesmo tempo
+        num_processos (int): Processos de inferência (1 = modelo no próprio processo)
+
+    Returns:
+        dict: {pasta: pasta_resultados} das partidas reanalisadas
+    """
+    pool = criar_pool_inferencia(num_processos) if num_processos > 1 else None
+    if pool is None:
+        obter_modelo()
+
+    print(f"\n[INFO] Reanálise: {len(pastas)} partidas, até {max_pastas} ao mesmo tempo")
+
+    renderizador = RenderizadorGraficos()
+
+    concluidas = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_pastas) as executor:
+            futuros = {executor.submit(reanalisar_partida, pasta, pool): pasta for pasta in pastas}
+
+            for futuro in as_completed(futuros):
+                pasta = futuros[futuro]
+
+                try:
+                    matriz = futuro.result()
+                except Exception as e:
+                    print(f"[ERRO] Reanálise de {pasta} falhou: {e}")
+                    continue
+
+                nome = os.path.basename(os.path.normpath(pasta))
+                encontrado = PADRAO_PASTA.match(nome)
+                identificador = encontrado["data_hora"] if encontrado else nome
+
+                # Gráficos e tabela resumo no pool do renderizador
+                pasta_resultados = criar_pasta_reanalise(pasta)
+                salvar_serie_emocoes(matriz, pasta_resultados, identificador)
+                renderizador.enviar({
+                    "pasta_resultados": pasta_resultados,
+                    "identificador_jogo": identificador,
+                    "percentuais": matriz.percentuais(),
+                    "percentuais_etapas": matriz.percentuais_etapas(),
+                    "serie": matriz.serie_temporal()
+                })
+
+                print(f"[INFO] {nome}: {matriz.total()} tweets reclassificados")
+                concluidas[pasta] = pasta_resultados
+
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        renderizador.fechar()
+
+    print(f"[INFO] Reanálise concluída: {len(concluidas)} de {len(pastas)} partidas")
+    return concluidas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reclassifica partidas já coletadas (sem acessar a API)")
+    parser.add_argument("pastas", nargs="*", help="Pastas data/SPFC_vs_... (padrão: todas em data/)")
+    parser.add_argument("--paralelas", type=int, default=REANALISE_PASTAS_SIMULTANEAS,
+                        help="Partidas lidas ao mesmo tempo")
+    parser.add_argument("--processos", type=int, default=INFERENCIA_PROCESSOS,
+                        help="Processos de inferência (1 = sem pool)")
+    args = parser.parse_args()
+
+    pastas = args.pastas or sorted(
+        p for p in glob.glob(os.path.join("data", "SPFC_vs_*_EXEC*"))
+        if os.path.isdir(p)
+    )
+    if not pastas:
+        print("[ERRO] Nenhuma pasta de partida encontrada")
+        return
+
+    executar_reanalise(pastas, max_pastas=args.paralelas, num_processos=args.processos)
+    relatar_cache()
+
+
+# Workers do pool de inferência ("spawn") importam este módulo
+if __name__ == "__main__":
+    main()
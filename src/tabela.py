@@ -0,0 +1,289 @@
+# /src/tabela.py
+
+"""
+Armazenamento colunar dos tweets.
+
+Em vez de um dicionário por resposta (nove chaves, strings soltas e um
+datetime repetido em toda linha), TabelaTweets guarda cada campo em um
+array NumPy:
+
+    id_tweet       int64
+    retweets/likes int32
+    timestamp_ms   int64 (epoch em milissegundos, UTC)
+    emocao         int8  (códigos de EMOCAO_TO_ID; -1 = ainda não classificado)
+    confianca      float32
+    duplicata      int32 (ordem da cópia no grupo de duplicatas; 0 = primeira)
+    texto/texto_limpo  UTF-8 concatenado em um único buffer + offsets int64
+
+O início da coleta ("janela" nos CSVs) é igual para todas as linhas e é
+guardado uma única vez na tabela.
+"""
+
+import numpy as np
+from .config import EMOCAO_TO_ID, ID_TO_EMOCAO
+
+# Colunas dos CSVs das janelas (mesma ordem dos dicionários da coleta)
+COLUNAS_CSV = [
+    "id_tweet", "texto", "retweets", "likes", "texto_limpo",
+    "timestamp", "janela", "emocao", "confianca"
+]
+
+SEM_EMOCAO = -1
+
+
+class ColunaTexto:
+    """
+    Strings empacotadas: um buffer UTF-8 com todos os textos e os offsets
+    de início/fim de cada um. Indexação e iteração devolvem str.
+
+    Args:
+        dados (bytes): Textos concatenados em UTF-8
+        offsets (np.ndarray): n + 1 posições (int64) no buffer
+    """
+
+    def __init__(self, dados=b"", offsets=None):
+        self.dados = dados
+        self.offsets = offsets if offsets is not None else np.zeros(1, dtype=np.int64)
+
+    @classmethod
+    def de_lista(cls, textos):
+        codificados = [texto.encode("utf-8") for texto in textos]
+
+        offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in codificados], out=offsets[1:])
+
+        return cls(b"".join(codificados), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.dados[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def __iter__(self):
+        dados = self.dados
+        offsets = self.offsets.tolist()
+        for inicio, fim in zip(offsets, offsets[1:]):
+            yield dados[inicio:fim].decode("utf-8")
+
+    def tomar(self, indices):
+        """
+        Nova coluna com os textos nas posições informadas.
+        """
+        offsets = self.offsets.tolist()
+        partes = [self.dados[offsets[i]:offsets[i + 1]] for i in indices]
+
+        novos = np.zeros(len(partes) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in partes], out=novos[1:])
+
+        return ColunaTexto(b"".join(partes), novos)
+
+    @staticmethod
+    def concatenar(colunas):
+        deslocamento = 0
+        offsets = [np.zeros(1, dtype=np.int64)]
+
+        for coluna in colunas:
+            offsets.append(coluna.offsets[1:] + deslocamento)
+            deslocamento += len(coluna.dados)
+
+        return ColunaTexto(b"".join(c.dados for c in colunas), np.concatenate(offsets))
+
+    @property
+    def nbytes(self):
+        return len(self.dados) + self.offsets.nbytes
+
+
+def iso_para_epoch_ms(timestamps):
+    """
+    Converte timestamps ISO 8601 da API (ex.: "2024-05-01T18:03:22.000Z")
+    para epoch em milissegundos.
+    """
+    instantes = np.array([t.rstrip("Z") for t in timestamps], dtype="datetime64[ms]")
+    return instantes.astype(np.int64)
+
+
+def epoch_ms_para_iso(epoch_ms):
+    """
+    Formato original da API, com milissegundos e sufixo Z.
+    """
+    textos = np.datetime_as_string(np.asarray(epoch_ms, dtype="datetime64[ms]"), unit="ms")
+    return [texto + "Z" for texto in textos.tolist()]
+
+
+class TabelaTweets:
+    """
+    Tweets em colunas. Todas as colunas têm o mesmo comprimento.
+
+    Args:
+        id_tweet, retweets, likes, timestamp_ms: Arrays (ou listas) de inteiros
+        texto, texto_limpo (ColunaTexto): Textos empacotados
+        janela (datetime): Início da coleta, comum a todas as linhas
+        emocao (np.ndarray): Códigos de EMOCAO_TO_ID (int8). Se None, todas SEM_EMOCAO
+        confianca (np.ndarray): Confianças (float32). Se None, zeros
+        duplicata (np.ndarray): Ordem de cada cópia no seu grupo (src/deduplicacao.py). Se None, zeros
+    """
+
+    def __init__(
+            self,
+            id_tweet,
+            texto,
+            retweets,
+            likes,
+            texto_limpo,
+            timestamp_ms,
+            janela=None,
+            emocao=None,
+            confianca=None,
+            duplicata=None
+    ):
+        n = len(texto)
+
+        self.id_tweet = np.asarray(id_tweet, dtype=np.int64)
+        self.texto = texto
+        self.retweets = np.asarray(retweets, dtype=np.int32)
+        self.likes = np.asarray(likes, dtype=np.int32)
+        self.texto_limpo = texto_limpo
+        self.timestamp_ms = np.asarray(timestamp_ms, dtype=np.int64)
+        self.janela = janela
+        self.emocao = (
+            np.full(n, SEM_EMOCAO, dtype=np.int8) if emocao is None
+            else np.asarray(emocao, dtype=np.int8)
+        )
+        self.confianca = (
+            np.zeros(n, dtype=np.float32) if confianca is None
+            else np.asarray(confianca, dtype=np.float32)
+        )
+        self.duplicata = (
+            np.zeros(n, dtype=np.int32) if duplicata is None
+            else np.asarray(duplicata, dtype=np.int32)
+        )
+
+    @classmethod
+    def de_dicts(cls, tweets, janela=None):
+        """
+        Monta a tabela a partir dos dicionários produzidos pela coleta
+        (ou lidos do checkpoint). 'emocao' e 'confianca' são opcionais.
+        """
+        tweets = list(tweets)
+
+        if tweets and "emocao" in tweets[0]:
+            emocao = [EMOCAO_TO_ID[t["emocao"]] for t in tweets]
+            confianca = [t["confianca"] for t in tweets]
+        else:
+            emocao = confianca = None
+
+        return cls(
+            id_tweet=[int(t["id_tweet"]) for t in tweets],
+            texto=ColunaTexto.de_lista(t["texto"] for t in tweets),
+            retweets=[t["retweets"] for t in tweets],
+            likes=[t["likes"] for t in tweets],
+            texto_limpo=ColunaTexto.de_lista(t["texto_limpo"] for t in tweets),
+            timestamp_ms=iso_para_epoch_ms([t["timestamp"] for t in tweets]),
+            janela=janela,
+            emocao=emocao,
+            confianca=confianca
+        )
+
+    @classmethod
+    def vazia(cls, janela=None):
+        return cls([], ColunaTexto(), [], [], ColunaTexto(), [], janela=janela)
+
+    def __len__(self):
+        return len(self.id_tweet)
+
+    def tomar(self, indices):
+        """
+        Nova tabela com as linhas nas posições informadas (na ordem dada).
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+
+        return TabelaTweets(
+            self.id_tweet[indices],
+            self.texto.tomar(indices.tolist()),
+            self.retweets[indices],
+            self.likes[indices],
+            self.texto_limpo.tomar(indices.tolist()),
+            self.timestamp_ms[indices],
+            janela=self.janela,
+            emocao=self.emocao[indices],
+            confianca=self.confianca[indices],
+            duplicata=self.duplicata[indices]
+        )
+
+    @staticmethod
+    def concatenar(tabelas, janela=None):
+        tabelas = [t for t in tabelas if len(t)]
+        if not tabelas:
+            return TabelaTweets.vazia(janela)
+
+        return TabelaTweets(
+            np.concatenate([t.id_tweet for t in tabelas]),
+            ColunaTexto.concatenar([t.texto for t in tabelas]),
+            np.concatenate([t.retweets for t in tabelas]),
+            np.concatenate([t.likes for t in tabelas]),
+            ColunaTexto.concatenar([t.texto_limpo for t in tabelas]),
+            np.concatenate([t.timestamp_ms for t in tabelas]),
+            janela=tabelas[0].janela if janela is None else janela,
+            emocao=np.concatenate([t.emocao for t in tabelas]),
+            confianca=np.concatenate([t.confianca for t in tabelas]),
+            duplicata=np.concatenate([t.duplicata for t in tabelas])
+        )
+
+    def classificada(self):
+        """
+        True se alguma linha já passou pela classificação.
+        """
+        return bool((self.emocao != SEM_EMOCAO).any())
+
+    def emocoes(self):
+        """
+        Nomes das emoções de cada linha (None para linhas não classificadas).
+        """
+        return [ID_TO_EMOCAO.get(codigo) for codigo in self.emocao.tolist()]
+
+    def contagem_emocoes(self):
+        """
+        Returns:
+            dict: {emocao: quantidade} das linhas classificadas
+        """
+        codigos = self.emocao[self.emocao != SEM_EMOCAO]
+        contagem = np.bincount(codigos, minlength=len(ID_TO_EMOCAO))
+        return {ID_TO_EMOCAO[i]: int(n) for i, n in enumerate(contagem) if n}
+
+    def linhas_csv(self):
+        """
+        Linhas no formato dos CSVs das janelas (COLUNAS_CSV), geradas
+        coluna a coluna, sem montar dicionários. As colunas de emoção só
+        entram se a tabela já foi classificada.
+
+        Yields:
+            list: Valores de uma linha
+        """
+        colunas = [
+            self.id_tweet.tolist(),
+            self.texto,
+            self.retweets.tolist(),
+            self.likes.tolist(),
+            self.texto_limpo,
+            epoch_ms_para_iso(self.timestamp_ms),
+            [self.janela] * len(self)
+        ]
+
+        if self.classificada():
+            # float() do valor float32 reproduz a confiança gravada antes da tabela
+            colunas += [self.emocoes(), [float(c) for c in self.confianca.tolist()]]
+
+        yield from zip(*colunas)
+
+    def colunas_csv(self):
+        return COLUNAS_CSV if self.classificada() else COLUNAS_CSV[:-2]
+
+    @property
+    def nbytes(self):
+        return (
+            self.id_tweet.nbytes + self.retweets.nbytes + self.likes.nbytes
+            + self.timestamp_ms.nbytes + self.emocao.nbytes + self.confianca.nbytes
+            + self.duplicata.nbytes
+            + self.texto.nbytes + self.texto_limpo.nbytes
+        )
@@ -1,7 +1,11 @@
 # /src/utils.py
 
+import csv
 import os
-import pandas as pd
+from itertools import islice
+from .config import FORMATO_SAIDA
+from .metricas import medir
+from .tabela import TabelaTweets
 
 
 def criar_pasta_resultados(adversario, data_hora):
@@ -29,13 +33,71 @@ def criar_pasta_resultados(adversario, data_hora):
 
 
 def salvar_tweets_csv(tweets, pasta_data, etapa, janela_inicio):
-    if not tweets:
+    if not len(tweets):
         return
 
     filename = f"{etapa}_{janela_inicio.strftime('%Y%m%d_%H%M')}.csv"
     path = os.path.join(pasta_data, filename)
 
-    df = pd.DataFrame(tweets)
-    df.to_csv(path, index=False, encoding="utf-8")
+    if isinstance(tweets, TabelaTweets):
+        # Escrita direto das colunas, sem montar um dicionário por tweet
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            escrever_tabela_csv(f, tweets, cabecalho=True)
+    else:
+        import pandas as pd  # importado sob demanda para não pesar na inicialização
 
-    print(f"[INFO] Janela salva em CSV: {path}")
\ No newline at end of file
+        with medir("saida.csv", itens=len(tweets)):
+            df = pd.DataFrame(tweets)
+            df.to_csv(path, index=False, encoding="utf-8")
+
+    print(f"[INFO] Janela salva em CSV: {path}")
+
+
+def salvar_serie_emocoes(matriz, pasta_resultados, identificador_jogo):
+    """
+    Grava a série por janela da MatrizEmocoes (percentuais, média móvel e
+    ponderados por engajamento) em serie_emocoes_<identificador>.csv.
+    """
+    path = os.path.join(pasta_resultados, f"serie_emocoes_{identificador_jogo}.csv")
+    matriz.serie_temporal().to_csv(path, index=False, encoding="utf-8")
+
+    print(f"[INFO] Série por janela salva em: {path}")
+    return path
+
+
+def salvar_janela(tweets, pasta_data, etapa, janela_inicio, formato=FORMATO_SAIDA):
+    """
+    Grava os tweets de uma janela no(s) formato(s) configurado(s):
+    "csv" (salvar_tweets_csv), "parquet" (partição no dataset da partida,
+    src/parquet.py) ou "ambos".
+    """
+    if formato in ("csv", "ambos"):
+        salvar_tweets_csv(tweets, pasta_data, etapa, janela_inicio)
+
+    if formato in ("parquet", "ambos") and len(tweets):
+        from .parquet import salvar_tabela_parquet
+
+        if not isinstance(tweets, TabelaTweets):
+            tweets = TabelaTweets.de_dicts(tweets, janela=tweets[0]["janela"])
+        salvar_tabela_parquet(tweets, pasta_data, etapa, janela_inicio)
+
+
+def escrever_tabela_csv(arquivo, tabela, cabecalho=False):
+    """
+    Escreve as linhas de uma TabelaTweets em um arquivo CSV já aberto
+    (mesmo formato do DataFrame.to_csv dos dicionários).
+    """
+    with medir("saida.csv", itens=len(tabela)):
+        writer = csv.writer(arquivo, lineterminator="\n")
+        if cabecalho:
+            writer.writerow(tabela.colunas_csv())
+        writer.writerows(tabela.linhas_csv())
+
+
+def em_lotes(iteravel, tamanho):
+    """
+    Agrupa um iterável em listas de até `tamanho` itens.
+    """
+    iterador = iter(iteravel)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
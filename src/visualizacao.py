@@ -1,8 +1,34 @@
 # /src/visualizacao.py
 
+"""
+Gráficos e tabelas dos resultados.
+
+Os gráficos usam o matplotlib orientado a objetos com o canvas Agg (sem
+pyplot, sem janela e sem depender do backend padrão da máquina), importado
+só na primeira figura. Cada tipo de gráfico tem uma figura por thread,
+criada uma vez e limpa a cada uso: gerar os gráficos de muitas partidas
+não paga de novo a criação da figura, dos eixos e do layout.
+
+Por partida (renderizar_partida):
+    grafico_emocoes_<id>.png      distribuição na partida inteira
+    grafico_etapas_<id>.png       distribuição em cada etapa
+    linha_tempo_<id>.png          volume e média móvel das emoções por janela
+    tabela_resumo_<id>.txt        percentuais e emoção predominante por etapa
+
+No lote e na reanálise, o RenderizadorGraficos envia os gráficos e a
+tabela de cada partida concluída para um pool de VISUALIZACAO_PROCESSOS
+processos, e a execução segue para a próxima partida sem esperar o
+matplotlib nem a escrita da tabela.
+"""
+
+import csv
+import multiprocessing
 import os
-import matplotlib.pyplot as plt
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from tabulate import tabulate
+from .config import AGREGACAO_JANELAS_MOVEIS, VISUALIZACAO_DPI, VISUALIZACAO_PROCESSOS
+from .metricas import cronometrado, medir
 
 # Cores das 5 emoções do TCC
 CORES_EMOCOES = {
@@ -13,7 +39,63 @@ CORES_EMOCOES = {
     "neutro": "#95a5a6"  # cinza
 }
 
+EMOCOES_ORDENADAS = ["raiva", "alegria", "frustracao", "ironia", "neutro"]
+NOMES_ETAPAS = {
+    "pre_jogo": "Pré-jogo",
+    "durante_jogo": "Durante o jogo",
+    "pos_jogo": "Pós-jogo"
+}
+
+_local = threading.local()
+
+
+# ==================================================
+# FIGURAS (canvas Agg, reaproveitadas)
+# ==================================================
+def _figura(nome, tamanho, linhas=1, alturas=None):
+    """
+    Figura `nome` deste thread, criada na primeira chamada e com os eixos
+    limpos nas seguintes.
+
+    Args:
+        nome (str): Tipo de gráfico
+        tamanho (tuple): Largura e altura em polegadas
+        linhas (int): Eixos empilhados (compartilhando o eixo x)
+        alturas (list): Proporção da altura de cada eixo
+
+    Returns:
+        tuple: (figura, lista de eixos)
+    """
+    figuras = getattr(_local, "figuras", None)
+    if figuras is None:
+        figuras = _local.figuras = {}
+
+    if nome not in figuras:
+        # importados sob demanda: o matplotlib só é carregado quando há gráfico
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
 
+        figura = Figure(figsize=tamanho, dpi=VISUALIZACAO_DPI)
+        FigureCanvasAgg(figura)
+        eixos = figura.subplots(linhas, 1, sharex=True, squeeze=False,
+                                gridspec_kw={"height_ratios": alturas} if alturas else None)[:, 0]
+        figuras[nome] = (figura, list(eixos))
+
+    figura, eixos = figuras[nome]
+    for eixo in eixos:
+        eixo.clear()
+    return figura, eixos
+
+
+def _salvar(figura, caminho):
+    figura.savefig(caminho)
+    return caminho
+
+
+# ==================================================
+# GRÁFICOS
+# ==================================================
+@cronometrado("visualizacao.grafico")
 def gerar_grafico_barras(percentuais, pasta_resultados, identificador_jogo, titulo="Distribuição de Emoções"):
     """
     Gera e salva um gráfico de barras com a distribuição percentual das emoções.
@@ -23,30 +105,211 @@ def gerar_grafico_barras(percentuais, pasta_resultados, identificador_jogo, titu
         pasta_resultados (str): Pasta onde salvar o gráfico
         identificador_jogo (str): Identificador único do jogo (data_hora)
         titulo (str): Título do gráfico
+
+    Returns:
+        str: Caminho do gráfico
     """
-    # Ordena as emoções para consistência
-    emocoes = ["raiva", "alegria", "frustracao", "ironia", "neutro"]
-    valores = [percentuais.get(e, 0) for e in emocoes]
-    cores = [CORES_EMOCOES.get(e, "#95a5a6") for e in emocoes]
+    valores = [percentuais.get(e, 0) for e in EMOCOES_ORDENADAS]
+    cores = [CORES_EMOCOES.get(e, "#95a5a6") for e in EMOCOES_ORDENADAS]
+
+    figura, (eixo,) = _figura("barras", (8, 6))
+    figura.subplots_adjust(left=0.1, right=0.97, top=0.92, bottom=0.08)
 
-    plt.figure(figsize=(8, 6))
-    plt.bar(emocoes, valores, color=cores)
-    plt.ylabel("% de tweets")
-    plt.title(titulo)
+    eixo.bar(EMOCOES_ORDENADAS, valores, color=cores)
+    eixo.set_ylabel("% de tweets")
+    eixo.set_title(titulo)
 
     # Adiciona os valores sobre as barras
     for i, v in enumerate(valores):
-        plt.text(i, v + 1, f"{v:.1f}%", ha="center")
-
-    plt.tight_layout()
+        eixo.text(i, v + 1, f"{v:.1f}%", ha="center")
 
     # Salva o gráfico com identificador do jogo
-    caminho = os.path.join(pasta_resultados, f"grafico_emocoes_{identificador_jogo}.png")
-    plt.savefig(caminho)
-    plt.close()
+    return _salvar(figura, os.path.join(pasta_resultados, f"grafico_emocoes_{identificador_jogo}.png"))
+
+
+@cronometrado("visualizacao.grafico_etapas")
+def gerar_grafico_etapas(percentuais_etapas, pasta_resultados, identificador_jogo, titulo="Emoções por Etapa"):
+    """
+    Barras agrupadas: a distribuição das emoções em cada etapa do jogo.
+
+    Args:
+        percentuais_etapas (dict): {etapa: {emocao: percentual}}
+        pasta_resultados (str): Pasta onde salvar o gráfico
+        identificador_jogo (str): Identificador único do jogo (data_hora)
+        titulo (str): Título do gráfico
+
+    Returns:
+        str: Caminho do gráfico
+    """
+    etapas = list(NOMES_ETAPAS)
+    largura = 0.8 / len(EMOCOES_ORDENADAS)
+
+    figura, (eixo,) = _figura("etapas", (9, 5))
+    figura.subplots_adjust(left=0.08, right=0.97, top=0.9, bottom=0.1)
+
+    for j, emocao in enumerate(EMOCOES_ORDENADAS):
+        valores = [percentuais_etapas.get(etapa, {}).get(emocao, 0) for etapa in etapas]
+        posicoes = [i + (j - (len(EMOCOES_ORDENADAS) - 1) / 2) * largura for i in range(len(etapas))]
+        eixo.bar(posicoes, valores, width=largura, color=CORES_EMOCOES[emocao], label=emocao)
 
+    eixo.set_xticks(range(len(etapas)), [NOMES_ETAPAS[etapa] for etapa in etapas])
+    eixo.set_ylabel("% de tweets")
+    eixo.set_title(titulo)
+    eixo.legend(ncols=len(EMOCOES_ORDENADAS), loc="upper center", fontsize="small", frameon=False)
+    eixo.set_ylim(0, 110)
 
-def gerar_tabela_resumo(percentuais_etapas, pasta_resultados, identificador_jogo):
+    return _salvar(figura, os.path.join(pasta_resultados, f"grafico_etapas_{identificador_jogo}.png"))
+
+
+@cronometrado("visualizacao.linha_tempo")
+def gerar_linha_tempo(serie, pasta_resultados, identificador_jogo, titulo="Emoções por Janela",
+                      largura=AGREGACAO_JANELAS_MOVEIS):
+    """
+    Linha do tempo da partida: tweets por janela de 15 minutos (em cima) e
+    a média móvel do percentual de cada emoção (embaixo), com as etapas
+    separadas por linhas verticais.
+
+    Args:
+        serie (pd.DataFrame): MatrizEmocoes.serie_temporal (colunas inicio, etapa,
+                              tweets e <emocao>_movel<largura>)
+        pasta_resultados (str): Pasta onde salvar o gráfico
+        identificador_jogo (str): Identificador único do jogo (data_hora)
+        titulo (str): Título do gráfico
+        largura (int): Janelas da média móvel usada na série
+
+    Returns:
+        str: Caminho do gráfico
+    """
+    posicoes = list(range(len(serie)))
+    etapas = serie["etapa"].tolist()
+
+    figura, (volume, emocoes) = _figura("linha_tempo", (11, 6), linhas=2, alturas=[1, 3])
+    figura.subplots_adjust(left=0.07, right=0.85, top=0.93, bottom=0.09, hspace=0.08)
+
+    volume.bar(posicoes, serie["tweets"], color="#34495e")
+    volume.set_ylabel("tweets")
+    volume.set_title(titulo)
+
+    for emocao in EMOCOES_ORDENADAS:
+        emocoes.plot(posicoes, serie[f"{emocao}_movel{largura}"], color=CORES_EMOCOES[emocao], label=emocao)
+    emocoes.set_ylabel(f"% (média de {largura} janelas)")
+    # Margem para as linhas em 0% e 100% não ficarem sob as bordas
+    emocoes.set_ylim(-3, 103)
+    emocoes.legend(loc="upper left", bbox_to_anchor=(1.01, 1), fontsize="small", frameon=False)
+
+    # Início de cada etapa
+    for i in range(1, len(etapas)):
+        if etapas[i] != etapas[i - 1]:
+            for eixo in (volume, emocoes):
+                eixo.axvline(i - 0.5, color="#7f8c8d", linestyle="--", linewidth=0.8)
+
+    passo = max(1, -(-len(posicoes) // 10))
+    emocoes.set_xticks(posicoes[::passo], [inicio.strftime("%H:%M") for inicio in serie["inicio"].iloc[::passo]])
+
+    return _salvar(figura, os.path.join(pasta_resultados, f"linha_tempo_{identificador_jogo}.png"))
+
+
+def renderizar_partida(dados):
+    """
+    Todos os gráficos e a tabela resumo de uma partida. Recebe só dados
+    simples (dicts e a série) para poder rodar em um processo do
+    RenderizadorGraficos.
+
+    Args:
+        dados (dict): "pasta_resultados", "identificador_jogo", "titulo" (sufixo dos
+                      títulos), "percentuais", "percentuais_etapas" e, opcionais,
+                      "serie" (MatrizEmocoes.serie_temporal) e "exibir_tabela"
+                      (imprime a tabela resumo no console; no pool, os processos
+                      só gravam o arquivo)
+
+    Returns:
+        list: Caminhos dos gráficos e da tabela
+    """
+    pasta = dados["pasta_resultados"]
+    identificador = dados["identificador_jogo"]
+    sufixo = dados.get("titulo", "")
+
+    caminhos = [
+        gerar_grafico_barras(dados["percentuais"], pasta, identificador,
+                             titulo=f"Distribuição de Emoções dos Torcedores{sufixo}"),
+        gerar_grafico_etapas(dados["percentuais_etapas"], pasta, identificador,
+                             titulo=f"Emoções por Etapa{sufixo}")
+    ]
+    if dados.get("serie") is not None and len(dados["serie"]):
+        caminhos.append(gerar_linha_tempo(dados["serie"], pasta, identificador,
+                                          titulo=f"Emoções por Janela{sufixo}"))
+
+    caminhos.append(gerar_tabela_resumo(dados["percentuais_etapas"], pasta, identificador,
+                                        exibir=dados.get("exibir_tabela", False)))
+
+    return caminhos
+
+
+class RenderizadorGraficos:
+    """
+    Gráficos das partidas em segundo plano: cada partida enviada vira uma
+    tarefa em um pool de processos ("spawn", como o pool de inferência),
+    e quem envia não espera o matplotlib. Cada processo reaproveita as
+    suas figuras entre as partidas que renderiza.
+
+    Com processos = 0, enviar renderiza na hora, no thread que chamou.
+
+        with RenderizadorGraficos() as renderizador:
+            renderizador.enviar(dados)   # renderizar_partida(dados)
+        # ao sair, espera os gráficos pendentes
+
+    Args:
+        processos (int): Processos do pool
+    """
+
+    def __init__(self, processos=VISUALIZACAO_PROCESSOS):
+        self.pool = None
+        if processos > 0:
+            self.pool = ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context("spawn"))
+        self.pendentes = []
+
+    def enviar(self, dados):
+        if self.pool is None:
+            renderizar_partida(dados)
+            return
+
+        self.pendentes.append((dados["identificador_jogo"], self.pool.submit(renderizar_partida, dados)))
+
+    def aguardar(self):
+        """
+        Espera os gráficos enviados. Uma partida com erro é relatada e não
+        interrompe as demais.
+
+        Returns:
+            int: Partidas com os gráficos gerados
+        """
+        concluidas = 0
+        with medir("visualizacao.espera", itens=len(self.pendentes)):
+            for identificador, futuro in self.pendentes:
+                try:
+                    futuro.result()
+                    concluidas += 1
+                except Exception as e:
+                    print(f"[ERRO] Gráficos da partida {identificador} falharam: {e}")
+
+        self.pendentes = []
+        return concluidas
+
+    def fechar(self):
+        self.aguardar()
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+        return False
+
+
+@cronometrado("visualizacao.tabela_resumo")
+def gerar_tabela_resumo(percentuais_etapas, pasta_resultados, identificador_jogo, exibir=True):
     """
     Gera e salva uma tabela resumo com os percentuais por etapa e a emoção predominante.
 
@@ -54,6 +317,10 @@ def gerar_tabela_resumo(percentuais_etapas, pasta_resultados, identificador_jogo
         percentuais_etapas (dict): Dicionário com etapas e seus percentuais
         pasta_resultados (str): Pasta onde salvar a tabela
         identificador_jogo (str): Identificador único do jogo (data_hora)
+        exibir (bool): Se True, imprime a tabela no console
+
+    Returns:
+        str: Caminho da tabela
     """
     tabela = []
 
@@ -92,15 +359,79 @@ def gerar_tabela_resumo(percentuais_etapas, pasta_resultados, identificador_jogo
     tabela_formatada = tabulate(tabela, headers=headers, tablefmt="grid")
 
     # Exibe no console
+    if exibir:
+        print("\n" + "=" * 60)
+        print("TABELA RESUMO DAS EMOÇÕES POR ETAPA")
+        print("=" * 60)
+        print(tabela_formatada)
+        print("=" * 60 + "\n")
+
+    # Salva a tabela em arquivo
+    caminho = os.path.join(pasta_resultados, f"tabela_resumo_{identificador_jogo}.txt")
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(tabela_formatada)
+
+    if exibir:
+        print(f"[INFO] Tabela salva em: {caminho}")
+
+    return caminho
+
+
+@cronometrado("visualizacao.tabela_temporada")
+def gerar_tabela_temporada(partidas, pasta_resultados):
+    """
+    Gera e salva a tabela comparativa de várias partidas (execução em lote):
+    total de tweets, percentuais de cada emoção na partida inteira e a
+    emoção predominante em cada etapa.
+
+    Args:
+        partidas (list): Dicionários com "adversario", "data_hora", "total",
+                         "percentuais" (partida inteira) e "percentuais_etapas"
+        pasta_resultados (str): Pasta onde salvar a tabela (.txt e .csv)
+    """
+    emocoes_ordenadas = ["raiva", "alegria", "frustracao", "ironia", "neutro"]
+    etapas_ordenadas = ["pre_jogo", "durante_jogo", "pos_jogo"]
+
+    tabela = []
+    for partida in partidas:
+        linha = [partida["adversario"], partida["data_hora"], partida["total"]]
+        linha += [f"{partida['percentuais'].get(emocao, 0):.1f}%" for emocao in emocoes_ordenadas]
+
+        for etapa in etapas_ordenadas:
+            perc = partida["percentuais_etapas"].get(etapa, {})
+            linha.append(max(perc, key=perc.get) if perc else "-")
+
+        tabela.append(linha)
+
+    headers = [
+        "Adversário", "Data", "Tweets",
+        "Raiva", "Alegria", "Frustração", "Ironia", "Neutro",
+        "Pré-jogo", "Durante", "Pós-jogo"
+    ]
+
+    tabela_formatada = tabulate(tabela, headers=headers, tablefmt="grid")
+
     print("\n" + "=" * 60)
-    print("TABELA RESUMO DAS EMOÇÕES POR ETAPA")
+    print("COMPARATIVO DAS PARTIDAS")
     print("=" * 60)
     print(tabela_formatada)
     print("=" * 60 + "\n")
 
-    # Salva a tabela em arquivo
-    caminho = os.path.join(pasta_resultados, f"tabela_resumo_{identificador_jogo}.txt")
+    caminho = os.path.join(pasta_resultados, "comparativo_partidas.txt")
     with open(caminho, "w", encoding="utf-8") as f:
         f.write(tabela_formatada)
 
-    print(f"[INFO] Tabela salva em: {caminho}")
\ No newline at end of file
+    # Versão em CSV (percentuais numéricos) para análises posteriores
+    caminho_csv = os.path.join(pasta_resultados, "comparativo_partidas.csv")
+    with open(caminho_csv, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["adversario", "data_hora", "total"] + emocoes_ordenadas
+                        + [f"predominante_{etapa}" for etapa in etapas_ordenadas])
+        for partida, linha in zip(partidas, tabela):
+            writer.writerow(
+                linha[:3]
+                + [round(partida["percentuais"].get(emocao, 0), 2) for emocao in emocoes_ordenadas]
+                + linha[8:]
+            )
+
+    print(f"[INFO] Comparativo salvo em: {caminho} e {caminho_csv}")
@@ -0,0 +1,180 @@
+# /tests/test_agregacao.py
+
+"""
+Agregação por janela (MatrizEmocoes, src/agregacao.py) sobre uma
+TabelaTweets montada à mão: atribuição das janelas, percentuais iguais
+aos de percentual_emocoes, pesos, filtro por confiança e média móvel
+conferidos contra valores calculados à mão.
+
+Jogo às 16:00 de Brasília (19:00 UTC): janelas 0-3 no pré-jogo
+(18:00-19:00 UTC), 4-11 durante o jogo e 12-19 no pós-jogo.
+
+Uso:
+    python -m pytest tests
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pytest
+
+from src.agregacao import MatrizEmocoes, percentual_emocoes
+from src.config import EMOCOES
+from src.janelas import agrupar_por_janela, calcular_janelas
+from src.tabela import SEM_EMOCAO, TabelaTweets
+
+INICIO_JOGO = datetime(2024, 5, 1, 16, 0, tzinfo=ZoneInfo("America/Sao_Paulo"))
+
+# (etapa esperada, timestamp, emocao, confianca, likes, retweets, duplicata)
+TWEETS = [
+    ("pre_jogo", "2024-05-01T18:05:00.000Z", "raiva", 0.95, 10, 0, 0),
+    ("pre_jogo", "2024-05-01T18:14:59.999Z", "alegria", 0.7, 0, 2, 0),
+    ("pre_jogo", "2024-05-01T18:10:00.000Z", "neutro", 0.3, 0, 0, 0),
+    ("pre_jogo", "2024-05-01T18:20:00.000Z", "alegria", 0.9, 1, 1, 0),
+    ("pre_jogo", "2024-05-01T18:29:00.000Z", "alegria", 0.55, 0, 0, 0),
+    ("durante_jogo", "2024-05-01T19:00:00.000Z", "frustracao", 0.8, 3, 1, 0),
+    ("durante_jogo", "2024-05-01T19:10:00.000Z", "ironia", 0.65, 0, 0, 0),
+    ("pos_jogo", "2024-05-01T21:10:00.000Z", "alegria", 0.99, 5, 5, 0),
+    ("pos_jogo", "2024-05-01T21:11:00.000Z", "alegria", 0.99, 0, 0, 1),
+    ("pos_jogo", "2024-05-01T21:12:00.000Z", "alegria", 0.99, 0, 0, 2),
+    ("pos_jogo", "2024-05-01T21:13:00.000Z", "alegria", 0.99, 0, 0, 3),
+    ("pos_jogo", "2024-05-01T22:59:59.000Z", "raiva", 0.4, 0, 0, 0),
+    # Fora das janelas
+    (None, "2024-05-01T17:59:59.999Z", "raiva", 0.9, 100, 100, 0),
+    (None, "2024-05-01T23:00:00.000Z", "alegria", 0.9, 100, 100, 0),
+]
+
+
+def dicts(linhas):
+    return [
+        {
+            "id_tweet": str(i), "texto": f"tweet {i}", "texto_limpo": f"tweet {i}",
+            "timestamp": timestamp, "retweets": retweets, "likes": likes,
+            "emocao": emocao, "confianca": confianca, "duplicata": duplicata
+        }
+        for i, (_, timestamp, emocao, confianca, likes, retweets, duplicata) in enumerate(linhas)
+    ]
+
+
+def montar_tabela(linhas):
+    tabela = TabelaTweets.de_dicts(dicts(linhas))
+    tabela.duplicata[:] = [linha[-1] for linha in linhas]
+    return tabela
+
+
+@pytest.fixture
+def matriz():
+    matriz = MatrizEmocoes(calcular_janelas(INICIO_JOGO))
+    matriz.adicionar_tabela(montar_tabela(TWEETS))
+    return matriz
+
+
+def test_atribuicao_das_janelas(matriz):
+    por_janela = matriz.linhas().sum(axis=1)
+    esperado = np.zeros(len(matriz.lista_janelas), dtype=np.int64)
+    # 18:14:59.999 ainda é da janela 0; 19:00 abre a primeira janela do jogo;
+    # 22:59:59 fecha o pós-jogo e 23:00 já fica de fora
+    esperado[[0, 1, 4, 12, 19]] = [3, 2, 2, 4, 1]
+
+    assert por_janela.tolist() == esperado.tolist()
+    assert matriz.total() == 12
+
+
+def test_linhas_sem_emocao_sao_ignoradas():
+    tabela = montar_tabela(TWEETS[:2])
+    tabela.emocao[0] = SEM_EMOCAO
+
+    matriz = MatrizEmocoes(calcular_janelas(INICIO_JOGO))
+    matriz.adicionar_tabela(tabela)
+
+    assert matriz.contagem() == {"raiva": 0, "alegria": 1, "frustracao": 0, "ironia": 0, "neutro": 0}
+
+
+def test_percentuais_iguais_a_percentual_emocoes(matriz):
+    dentro = [linha for linha in TWEETS if linha[0] is not None]
+
+    assert matriz.percentuais() == pytest.approx(percentual_emocoes(dicts(dentro)))
+    for etapa in ("pre_jogo", "durante_jogo", "pos_jogo"):
+        da_etapa = dicts([linha for linha in dentro if linha[0] == etapa])
+        assert matriz.percentuais_etapas()[etapa] == pytest.approx(percentual_emocoes(da_etapa))
+
+
+def test_adicionar_janela_e_somar_iguais_a_adicionar_tabela(matriz):
+    janelas = calcular_janelas(INICIO_JOGO)
+    por_janela = MatrizEmocoes(janelas)
+    for etapa, grupos in agrupar_por_janela(montar_tabela(TWEETS), janelas).items():
+        for intervalo, tabela in grupos:
+            parcial = MatrizEmocoes(janelas)
+            parcial.adicionar_janela(etapa, intervalo, tabela)
+            por_janela.somar(parcial)
+
+    for nome in ("contagens", "likes", "retweets", "excedentes"):
+        assert (getattr(por_janela, nome) == getattr(matriz, nome)).all()
+
+
+def test_pesos(matriz):
+    assert matriz.contagem(peso="likes") == {"raiva": 10, "alegria": 6, "frustracao": 3, "ironia": 0, "neutro": 0}
+    assert matriz.contagem(peso="retweets") == {"raiva": 0, "alegria": 8, "frustracao": 1, "ironia": 0, "neutro": 0}
+    # 1 + likes + retweets por tweet
+    assert matriz.contagem(peso="engajamento") == {
+        "raiva": 12, "alegria": 21, "frustracao": 5, "ironia": 1, "neutro": 1
+    }
+    # A quarta cópia do grupo (ordem 3) passa de DEDUP_MAXIMO_POR_GRUPO
+    assert matriz.contagem(peso="sem_spam")["alegria"] == 6
+    assert matriz.percentuais(peso="sem_spam") == pytest.approx(
+        percentual_emocoes(dicts([linha for linha in TWEETS if linha[0] is not None]), sem_spam=True)
+    )
+
+    with pytest.raises(ValueError):
+        matriz.linhas(peso="views")
+
+
+def test_filtro_por_confianca(matriz):
+    # 0.7 em float32 (0.69999...) continua contando em confianca_minima=0.7
+    assert matriz.contagem(confianca_minima=0.7) == {
+        "raiva": 1, "alegria": 6, "frustracao": 1, "ironia": 0, "neutro": 0
+    }
+    assert matriz.contagem(confianca_minima=0.6) == {
+        "raiva": 1, "alegria": 6, "frustracao": 1, "ironia": 1, "neutro": 0
+    }
+    assert matriz.percentuais("pre_jogo", confianca_minima=0.9) == pytest.approx(
+        {"raiva": 50.0, "alegria": 50.0, "frustracao": 0.0, "ironia": 0.0, "neutro": 0.0}
+    )
+    assert matriz.total(confianca_minima=1.0) == 0
+    assert matriz.percentuais(confianca_minima=1.0) == {}
+
+
+def test_media_movel(matriz):
+    coluna = {emo: j for j, emo in enumerate(EMOCOES)}
+    simples = matriz.percentuais_janelas()
+    movel = matriz.percentuais_janelas(largura=2)
+
+    # Janela 1: só ela (alegria 2) / com a janela 0 (raiva 1, alegria 3, neutro 1)
+    assert simples[1, coluna["alegria"]] == pytest.approx(100.0)
+    assert movel[1].tolist() == pytest.approx([20.0, 60.0, 0.0, 0.0, 20.0])
+    # Janela 2 vazia: a média ainda enxerga a janela 1
+    assert np.isnan(simples[2]).all()
+    assert movel[2, coluna["alegria"]] == pytest.approx(100.0)
+    # Janela 3 e a anterior vazias
+    assert np.isnan(movel[3]).all()
+    # Janela 0 não tem anteriores: igual à simples
+    assert movel[0].tolist() == pytest.approx(simples[0].tolist())
+    # Média atravessa as etapas: janela 4 (jogo) com a 3 (pré-jogo, vazia)
+    assert movel[4].tolist() == pytest.approx([0.0, 0.0, 50.0, 50.0, 0.0])
+
+    # Largura maior que a série: média acumulada desde a primeira janela
+    acumulada = matriz.percentuais_janelas(largura=100)
+    assert acumulada[-1].tolist() == pytest.approx(
+        [matriz.percentuais()[emo] for emo in EMOCOES]
+    )
+
+
+def test_serie_temporal(matriz):
+    serie = matriz.serie_temporal(largura=2)
+
+    assert len(serie) == 20
+    assert serie["tweets"].sum() == 12
+    assert serie.loc[1, "alegria_movel2"] == pytest.approx(60.0)
+    assert serie.loc[0, "raiva_engajamento"] == pytest.approx(11 / 15 * 100, abs=0.01)
+    assert list(serie["etapa"].unique()) == ["pre_jogo", "durante_jogo", "pos_jogo"]
@@ -0,0 +1,56 @@
+# /tests/test_cache.py
+
+"""
+Cache de classificações (src/cache.py): backends diferentes convivem no
+mesmo arquivo e só um re-treino dos pesos descarta entradas.
+
+Uso:
+    python -m pytest tests
+"""
+
+import sqlite3
+
+from src.cache import CacheClassificacao
+
+RESULTADO = ("alegria", 0.9, [0.025, 0.9, 0.025, 0.025, 0.025])
+
+
+def abrir(caminho, impressao, backend, pesos="final"):
+    return CacheClassificacao(str(caminho), impressao, backend, pesos, max_memoria=0)
+
+
+def test_trocar_de_backend_nao_apaga_entradas(tmp_path):
+    caminho = tmp_path / "cache.sqlite"
+    abrir(caminho, "v1", "pytorch").guardar(["vamos"], [RESULTADO])
+    abrir(caminho, "v1", "int8").guardar(["vamos"], [("raiva", 0.5, [0.5, 0.2, 0.1, 0.1, 0.1])])
+
+    assert abrir(caminho, "v1", "pytorch").buscar(["vamos"])[0][0] == "alegria"
+    assert abrir(caminho, "v1", "int8").buscar(["vamos"])[0][0] == "raiva"
+    assert abrir(caminho, "v1", "onnx").buscar(["vamos"]) == {}
+
+
+def test_retreino_descarta_so_os_pesos_antigos(tmp_path):
+    caminho = tmp_path / "cache.sqlite"
+    abrir(caminho, "v1", "pytorch").guardar(["vamos"], [RESULTADO])
+    abrir(caminho, "v1", "onnx").guardar(["vamos"], [RESULTADO])
+    abrir(caminho, "a1", "aluno", pesos="aluno").guardar(["vamos"], [RESULTADO])
+
+    assert abrir(caminho, "v2", "int8").buscar(["vamos"]) == {}
+    assert abrir(caminho, "v1", "pytorch").buscar(["vamos"]) == {}
+    assert abrir(caminho, "a1", "aluno", pesos="aluno").buscar(["vamos"])[0][0] == "alegria"
+
+
+def test_arquivo_do_formato_anterior_e_recriado(tmp_path):
+    caminho = tmp_path / "cache.sqlite"
+    conexao = sqlite3.connect(caminho)
+    conexao.execute(
+        "CREATE TABLE classificacoes (chave TEXT PRIMARY KEY, modelo TEXT, emocao TEXT, "
+        "confianca REAL, probabilidades BLOB, acesso REAL)"
+    )
+    conexao.execute("INSERT INTO classificacoes VALUES ('x', 'v1:pytorch', 'raiva', 1.0, x'', 0)")
+    conexao.commit()
+    conexao.close()
+
+    cache = abrir(caminho, "v1", "pytorch")
+    cache.guardar(["vamos"], [RESULTADO])
+    assert cache.buscar(["vamos"])[0][0] == "alegria"
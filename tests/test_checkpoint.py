@@ -0,0 +1,111 @@
+# /tests/test_checkpoint.py
+
+"""
+Retomada da coleta pelo checkpoint (src/checkpoint.py): linhas gravadas
+depois do último estado confirmado são descartadas, os ids já aceitos e
+os cursores de paginação (next_token / since_id) voltam do disco, e um
+checkpoint de outra janela é recusado.
+
+Uso:
+    python -m pytest tests
+"""
+
+import json
+import os
+
+import pytest
+
+from src.checkpoint import ARQUIVO_RESPOSTAS, CheckpointColeta
+
+JANELA = ("2024-05-01T18:00:00Z", "2024-05-01T23:00:00Z")
+
+
+def resposta(id_tweet):
+    return {"id_tweet": id_tweet, "texto_bruto": f"resposta {id_tweet}"}
+
+
+def pagina(*ids):
+    return [{"id": i, "created_at": f"2024-05-01T19:{i[-2:]}:00Z"} for i in ids]
+
+
+def coletar_paginas(pasta):
+    """
+    Clube com duas conversas: "100" concluída e "200" parada na segunda página.
+    """
+    checkpoint = CheckpointColeta(str(pasta), JANELA)
+    checkpoint.iniciar_passada_clube()
+    checkpoint.registrar_pagina_clube(
+        [{"id": "100", "conversation_id": "100"}, {"id": "200", "conversation_id": "200"}], "clube_2"
+    )
+
+    checkpoint.iniciar_passada_conversa("100")
+    checkpoint.registrar_pagina_respostas("100", pagina("1010", "1012"), [resposta("1010"), resposta("1012")], None)
+
+    checkpoint.iniciar_passada_conversa("200")
+    checkpoint.registrar_pagina_respostas("200", pagina("2030"), [resposta("2030"), resposta("1010")], "pagina_2")
+    return checkpoint
+
+
+def test_linhas_depois_do_ultimo_estado_sao_truncadas(tmp_path):
+    checkpoint = coletar_paginas(tmp_path)
+    checkpoint.fechar()
+
+    caminho = os.path.join(tmp_path, ARQUIVO_RESPOSTAS)
+    tamanho_confirmado = os.path.getsize(caminho)
+
+    # Queda no meio da próxima página: uma linha inteira e outra pela metade
+    with open(caminho, "ab") as f:
+        f.write((json.dumps({"conversation_id": "200", "tweet": resposta("2040")}) + "\n").encode("utf-8"))
+        f.write(b'{"conversation_id": "200", "tweet": {"id_tw')
+
+    retomado = CheckpointColeta(str(tmp_path), JANELA)
+
+    assert os.path.getsize(caminho) == tamanho_confirmado
+    assert retomado.total_respostas() == 3
+    assert retomado.ids_unicos == {"1010", "1012", "2030"}
+    assert [t["id_tweet"] for t in retomado.respostas_ordenadas()] == ["1010", "1012", "2030"]
+
+    # A página perdida é registrada de novo; ids já aceitos continuam de fora
+    retomado.registrar_pagina_respostas("200", pagina("2040"), [resposta("2040"), resposta("1012")], None)
+    assert retomado.respostas_desde(3) == ([resposta("2040")], 4)
+    retomado.fechar()
+
+
+def test_retomada_dos_cursores(tmp_path):
+    coletar_paginas(tmp_path).fechar()
+    retomado = CheckpointColeta(str(tmp_path), JANELA)
+
+    # Passadas incompletas continuam do next_token com o mesmo since_id
+    assert retomado.iniciar_passada_clube() == (None, "clube_2")
+    assert retomado.iniciar_passada_conversa("200") == (None, "pagina_2")
+    # Passada concluída: nova passada só com respostas mais novas
+    assert retomado.iniciar_passada_conversa("100") == ("1012", None)
+    assert [t["id"] for t in retomado.tweets_clube()] == ["100", "200"]
+    retomado.fechar()
+
+
+def test_clube_concluido_retoma_com_since_id(tmp_path):
+    checkpoint = CheckpointColeta(str(tmp_path), JANELA)
+    checkpoint.registrar_pagina_clube([{"id": "300", "conversation_id": "300"}], None)
+    checkpoint.fechar()
+
+    retomado = CheckpointColeta(str(tmp_path), JANELA)
+    assert retomado.iniciar_passada_clube() == ("300", None)
+    retomado.fechar()
+
+
+def test_checkpoint_de_outra_janela(tmp_path):
+    coletar_paginas(tmp_path).fechar()
+
+    with pytest.raises(RuntimeError, match="outra janela"):
+        CheckpointColeta(str(tmp_path), ("2024-05-08T18:00:00Z", "2024-05-08T23:00:00Z"))
+
+
+def test_sem_pasta_fica_em_memoria():
+    checkpoint = CheckpointColeta(None, JANELA)
+    checkpoint.iniciar_passada_conversa("100")
+    checkpoint.registrar_pagina_respostas("100", pagina("1010"), [resposta("1010")], None)
+    checkpoint.registrar_pagina_respostas("100", pagina("1010"), [resposta("1010")], None)
+
+    assert checkpoint.respostas_desde(0) == ([resposta("1010")], 1)
+    checkpoint.fechar()
@@ -0,0 +1,65 @@
+# /tests/test_deduplicacao.py
+
+"""
+Agrupamento de duplicatas (src/deduplicacao.py): no padrão só cópias
+exatas dividem o rótulo; textos quase iguais com sentido oposto ficam em
+grupos separados. O MinHash/LSH só agrupa quase-duplicatas quando pedido.
+
+Uso:
+    python -m pytest tests
+"""
+
+import pytest
+
+from src.deduplicacao import Deduplicador, criar_deduplicador
+from src.normalizacao import normalizar_textos
+
+# Pares quase idênticos com sentido oposto
+PARES_OPOSTOS = [
+    ("o sao paulo jogou muito bem hoje, parabens ao time todo",
+     "o sao paulo jogou muito mal hoje, parabens ao time todo"),
+    ("que jogo incrivel do tricolor hoje no morumbi",
+     "que jogo horrivel do tricolor hoje no morumbi"),
+    ("vamos sao paulo, o time vai ganhar esse jogo",
+     "nao vamos sao paulo, o time vai ganhar esse jogo"),
+]
+
+
+@pytest.mark.parametrize("positivo, negativo", PARES_OPOSTOS)
+def test_padrao_separa_textos_com_sentido_oposto(positivo, negativo):
+    deduplicador = criar_deduplicador()
+    representantes, ordens = deduplicador.agrupar(normalizar_textos([positivo, negativo]))
+
+    assert representantes == [positivo, negativo]
+    assert ordens.tolist() == [0, 0]
+
+
+def test_padrao_agrupa_copias_exatas_entre_lotes():
+    deduplicador = criar_deduplicador()
+    deduplicador.agrupar(["vamos sao paulo", "juiz ladrao"])
+    representantes, ordens = deduplicador.agrupar(["juiz ladrao", "vamos sao paulo", "vamos sao paulo!"])
+
+    assert representantes == ["juiz ladrao", "vamos sao paulo", "vamos sao paulo!"]
+    assert ordens.tolist() == [1, 1, 0]
+    assert deduplicador.tamanhos == [2, 2, 1]
+
+
+def test_quase_duplicatas_so_com_opt_in():
+    texto = "o sao paulo jogou muito bem hoje, parabens ao time todo"
+    copia = texto + "!!"
+
+    representantes, _ = Deduplicador().agrupar([texto, copia])
+    assert representantes == [texto, copia]
+
+    representantes, ordens = Deduplicador(quase_duplicatas=True).agrupar([texto, copia])
+    assert representantes == [texto, texto]
+    assert ordens.tolist() == [0, 1]
+
+
+def test_limite_de_grupos():
+    deduplicador = Deduplicador(maximo_grupos=2)
+    representantes, ordens = deduplicador.agrupar(["a", "b", "c", "c"])
+
+    assert representantes == ["a", "b", "c", "c"]
+    assert ordens.tolist() == [0, 0, 0, 0]
+    assert len(deduplicador.representantes) == 2
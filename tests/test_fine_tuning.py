@@ -0,0 +1,41 @@
+# /tests/test_fine_tuning.py
+
+"""
+Cache da tokenização do fine-tuning (tokenizar_textos): um tokenizer
+refeito no mesmo caminho, com o vocabulário do mesmo tamanho, não pode
+reaproveitar os ids do .npz anterior.
+
+Uso:
+    python -m pytest tests
+"""
+
+from transformers import BertTokenizerFast
+
+from src.fine_tuning import tokenizar_textos
+
+ESPECIAIS = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+
+
+def criar_tokenizer(pasta, palavras):
+    pasta.mkdir(exist_ok=True)
+    (pasta / "vocab.txt").write_text("\n".join(ESPECIAIS + palavras) + "\n", encoding="utf-8")
+    return BertTokenizerFast.from_pretrained(str(pasta))
+
+
+def test_cache_reaproveita_o_mesmo_tokenizer(tmp_path):
+    tokenizer = criar_tokenizer(tmp_path / "tok", ["vamos", "sao", "paulo"])
+    primeira = tokenizar_textos(["vamos sao paulo"], tokenizer, 16, tmp_path / "cache")
+    segunda = tokenizar_textos(["vamos sao paulo"], tokenizer, 16, tmp_path / "cache")
+
+    assert primeira == segunda == [[2, 5, 6, 7, 3]]
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_vocabulario_trocado_com_mesmo_tamanho_nao_usa_o_cache(tmp_path):
+    antigo = criar_tokenizer(tmp_path / "tok", ["vamos", "sao", "paulo"])
+    tokenizar_textos(["vamos sao paulo"], antigo, 16, tmp_path / "cache")
+
+    novo = criar_tokenizer(tmp_path / "tok", ["paulo", "sao", "vamos"])
+    assert len(novo) == len(antigo) and novo.name_or_path == antigo.name_or_path
+
+    assert tokenizar_textos(["vamos sao paulo"], novo, 16, tmp_path / "cache") == [[2, 7, 6, 5, 3]]
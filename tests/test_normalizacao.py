@@ -0,0 +1,124 @@
+# /tests/test_normalizacao.py
+
+"""
+Equivalência de src/normalizacao.py com as versões anteriores de
+limpar_texto (coleta.py: quatro re.sub + emoji.demojize) e
+remover_acentos (analise_emocoes.py: NFD + unicodedata.category),
+reproduzidas abaixo como referência.
+
+A expressão regular única depende da ordem das remoções antigas (links,
+depois menções, depois hashtags) e o demojize por trecho depende de os
+trechos não ASCII não cortarem sequências de emoji (keycaps, ZWJ,
+bandeiras, modificadores de pele), então esses casos são conferidos um
+a um e combinados entre si.
+
+Uso:
+    python -m pytest tests
+"""
+
+import itertools
+import re
+import unicodedata
+
+import emoji
+import pytest
+
+from src.normalizacao import (
+    limpar_texto,
+    limpar_textos,
+    normalizar_texto,
+    normalizar_textos,
+    remover_acentos
+)
+
+TEXTOS_PADRAO = [
+    "VAMOS SÃO PAULO!!! 🔥🔥 @SaoPauloFC #VamosSaoPaulo",
+    "que fase... esse time não joga nada https://t.co/abc",
+    "GOOOOOL 😍😍 que golaço",
+    "juiz ladrão, roubado de novo 😡",
+    "tô com medo desse segundo tempo",
+]
+
+# Casos de borda: ordem das remoções antigas, keycaps, ZWJ, bandeiras, acentos
+CASOS_BORDA = [
+    # menções, hashtags e links colados
+    "@http://x.co y", "@https://t.co/abc", "@http", "#@x", "#@a b", "#@http://x", "#http://x",
+    "a@b#c", "x#ahttp://b", "@ # http", "fim com http", "@@dupla ##dupla",
+    "HTTPS://CAIXA.ALTA Vamos", "e-mail: a@b.com", "#tag🔥", "🔥@user", "@user🔥 ok",
+    # keycaps (o caractere base é ASCII)
+    "1️⃣", "1️⃣ 2️⃣ #️⃣ *️⃣ 10️⃣", "a1️⃣", "#️⃣#tag", "*️⃣@x", "1⃣ sem seletor", "9️⃣é",
+    # ZWJ, bandeiras e modificadores de pele
+    "👨‍👩‍👧", "👨‍💻", "🏳️‍🌈", "🇧🇷", "🇧🇷🇧🇷", "🇧🇷🇦🇷 clássico", "👍🏽", "👍🏽👍🏿", "🏴‍☠️",
+    # emojis colados em letras acentuadas
+    "é😀", "😀ã", "ação🔥ção", "tô😡com🔥raiva", "São Paulo🇧🇷é", "çã👨‍👩‍👧õ",
+    # acentos e Unicode sem emoji
+    "São Paulo é tricolor ÇÃÕ", "ﬁm ½ Å Ω ς Σ", "é́ combinantes", "ÀÉÎÕÜ",
+    # espaços e vazios
+    "   espaços   ", "", " ", "😀😀😀😀", "\t🔥\n",
+]
+
+# Pedaços combinados dois a dois (com e sem espaço), para as interações
+# entre remoção, demojize por trecho e acentos
+FRAGMENTOS = ["@x", "#y", "http://z", "1️⃣", "🇧🇷", "👨‍💻", "👍🏽", "é", "ã", "🔥", "a", "#️⃣"]
+
+
+# ==================================================
+# VERSÕES ANTERIORES (referência)
+# ==================================================
+def limpar_texto_anterior(texto):
+    texto = texto.lower()
+    texto = re.sub(r"http\S+", "", texto)
+    texto = re.sub(r"@\S+", "", texto)
+    texto = re.sub(r"#\S+", "", texto)
+    texto = emoji.demojize(texto)
+    texto = texto.strip()
+    return texto
+
+
+def remover_acentos_anterior(texto):
+    return "".join(
+        c for c in unicodedata.normalize("NFD", texto)
+        if unicodedata.category(c) != "Mn"
+    )
+
+
+def combinacoes():
+    return [
+        separador.join(par)
+        for par in itertools.product(FRAGMENTOS, repeat=2)
+        for separador in ("", " ")
+    ]
+
+
+CORPUS = TEXTOS_PADRAO + CASOS_BORDA + combinacoes()
+
+
+# ==================================================
+# TESTES
+# ==================================================
+@pytest.mark.parametrize("texto", CORPUS)
+def test_limpar_texto_igual_a_versao_anterior(texto):
+    assert limpar_texto(texto) == limpar_texto_anterior(texto)
+
+
+@pytest.mark.parametrize("texto", CORPUS)
+def test_normalizar_texto_igual_a_versao_anterior(texto):
+    limpo = limpar_texto_anterior(texto)
+    assert normalizar_texto(limpo) == remover_acentos_anterior(limpo.lower())
+    assert normalizar_texto(texto) == remover_acentos_anterior(texto.lower())
+
+
+@pytest.mark.parametrize("texto", CORPUS)
+def test_remover_acentos_igual_a_versao_anterior(texto):
+    assert remover_acentos(texto) == remover_acentos_anterior(texto)
+
+
+def test_versoes_em_lote_iguais_as_por_texto():
+    assert limpar_textos(CORPUS) == [limpar_texto(t) for t in CORPUS]
+    assert normalizar_textos(CORPUS) == [normalizar_texto(t) for t in CORPUS]
+
+
+def test_memoizacao_nao_altera_resultado():
+    # Segunda passada com as tabelas e o cache do demojize já preenchidos
+    primeira = limpar_textos(CORPUS)
+    assert limpar_textos(CORPUS) == primeira